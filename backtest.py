@@ -0,0 +1,383 @@
+"""Offline backtesting of strategies against recorded prices.
+
+The engine replays bars (or ticks) through the same decision path as
+``main.trade`` for a single symbol — the strategy, :func:`calculate_position_size`,
+the trailing-stop / break-even logic and the fee adjusted take profit — without
+touching the network, Telegram or the live databases.
+
+Usage::
+
+    python backtest.py --csv btc.csv --symbol BTCUSDT --strategy ma
+    python backtest.py --prices-db prices.db --symbol ETHUSDT
+    python backtest.py --klines btc_klines.json --strategy rsi
+    python backtest.py --store klines --symbol BTCUSDT --interval 1m
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import datetime
+import json
+import logging
+import math
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+from klines import KlineStore
+from risk import (
+    calculate_fee_adjusted_take_profit,
+    calculate_position_size,
+    update_trailing_stop,
+)
+from strategies import registry as strategy_registry
+from strategies.base import Strategy
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class BacktestConfig:
+    """Risk and execution settings; defaults mirror the constants in main.py."""
+
+    start_balance: float = 100.32
+    daily_max_invest: float = 100.32 * 0.25
+    min_trade_usdt: float = 1.0
+    max_trade_usdt: float = 20.0
+    risk_per_trade: float = 0.02
+    risk_reward: float = 2.0
+    fee_rate: float = 0.001
+    min_exit_pnl_pct: float = 1.0
+    stop_atr_period: int = 14
+    stop_atr_mult: float = 2.0
+    fallback_stop_pct: float = 0.02
+
+
+@dataclass
+class BacktestResult:
+    """Trades, per-bar equity and summary statistics of one replay."""
+
+    symbol: str
+    trades: List[Dict[str, Any]]
+    equity: np.ndarray
+    stats: Dict[str, float] = field(default_factory=dict)
+
+
+# -- data loading ------------------------------------------------------------
+def _as_arrays(rows: Sequence[Sequence[float]]) -> Dict[str, np.ndarray]:
+    data = np.asarray(rows, dtype=float).reshape(-1, 4)
+    return {
+        "timestamps": data[:, 0],
+        "highs": data[:, 1],
+        "lows": data[:, 2],
+        "closes": data[:, 3],
+    }
+
+
+def load_csv(path: str) -> Dict[str, np.ndarray]:
+    """Load bars from a CSV file with a header row.
+
+    A ``close`` (or ``price``) column is required; ``high``/``low`` and a
+    ``timestamp``/``open_time`` column are used when present.
+    """
+
+    rows = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for record in csv.DictReader(f):
+            record = {k.strip().lower(): v for k, v in record.items() if k}
+            close = float(record.get("close") or record["price"])
+            ts = record.get("timestamp") or record.get("open_time") or len(rows)
+            try:
+                ts = float(ts)
+            except ValueError:
+                ts = _parse_timestamp(ts)
+            rows.append(
+                (
+                    ts,
+                    float(record.get("high") or close),
+                    float(record.get("low") or close),
+                    close,
+                )
+            )
+    return _as_arrays(rows)
+
+
+def load_kline_file(path: str) -> Dict[str, np.ndarray]:
+    """Load a JSON file holding raw Binance kline arrays."""
+
+    with open(path, "r", encoding="utf-8") as f:
+        klines = json.load(f)
+    return _as_arrays(
+        [(float(k[0]), float(k[2]), float(k[3]), float(k[4])) for k in klines]
+    )
+
+
+def load_prices_db(path: str, symbol: str) -> Dict[str, np.ndarray]:
+    """Load the recorded ticks for ``symbol`` from a ``prices.db`` file."""
+
+    with sqlite3.connect(path) as conn:
+        cur = conn.execute(
+            "SELECT timestamp, price FROM prices WHERE symbol = ? ORDER BY timestamp, rowid",
+            (symbol,),
+        )
+        rows = [(_parse_timestamp(ts), p, p, p) for ts, p in cur.fetchall()]
+    return _as_arrays(rows)
+
+
+def load_store(root: str, symbol: str, interval: str = "1m") -> Dict[str, np.ndarray]:
+    """Load candles downloaded into a :class:`klines.KlineStore` directory."""
+
+    data = KlineStore(root).load(symbol, interval)
+    return {
+        "timestamps": data["open_time"].astype(float),
+        "highs": np.asarray(data["high"]),
+        "lows": np.asarray(data["low"]),
+        "closes": np.asarray(data["close"]),
+    }
+
+
+def _parse_timestamp(value: str) -> float:
+    dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return dt.timestamp() * 1000
+
+
+# -- engine ------------------------------------------------------------------
+def run_backtest(
+    strategy: Strategy,
+    closes: Sequence[float],
+    highs: Sequence[float] | None = None,
+    lows: Sequence[float] | None = None,
+    timestamps: Sequence[float] | None = None,
+    symbol: str = "BTCUSDT",
+    config: BacktestConfig | None = None,
+) -> BacktestResult:
+    """Replay ``closes`` through ``strategy`` and the bot's risk rules.
+
+    Stops are sized from an ATR over ``config.stop_atr_period`` of the replayed
+    bars (true range falls back to close-to-close moves for tick data).  Exits
+    that the live bot would ask the operator to confirm are executed directly.
+    """
+
+    cfg = config or BacktestConfig()
+    closes = np.asarray(closes, dtype=float).tolist()
+    n = len(closes)
+    highs = closes if highs is None else np.asarray(highs, dtype=float).tolist()
+    lows = closes if lows is None else np.asarray(lows, dtype=float).tolist()
+    stamps = list(range(n)) if timestamps is None else np.asarray(timestamps).tolist()
+
+    fee = cfg.fee_rate
+    period = max(1, cfg.stop_atr_period)
+    should_buy = strategy.should_buy
+    should_sell = strategy.should_sell
+    no_news: tuple = ()
+
+    balance = cfg.start_balance
+    position: Dict[str, Any] | None = None
+    trades: List[Dict[str, Any]] = []
+    equity: List[float] = []
+    append_equity = equity.append
+
+    true_ranges: List[float] = []
+    tr_sum = 0.0
+    prev_close = None
+    started = time.perf_counter()
+
+    for i in range(n):
+        price = closes[i]
+        if prev_close is not None:
+            high = highs[i]
+            low = lows[i]
+            tr = (high if high > prev_close else prev_close) - (
+                low if low < prev_close else prev_close
+            )
+            true_ranges.append(tr)
+            tr_sum += tr
+            if len(true_ranges) > period:
+                tr_sum -= true_ranges[-period - 1]
+        prev_close = price
+
+        if price <= 0:
+            append_equity(balance)
+            continue
+
+        if position is not None:
+            entry = position["entry"]
+            qty = position["qty"]
+            stop, _ = update_trailing_stop(
+                position,
+                price,
+                position["stop_distance"],
+                fee,
+                cfg.risk_reward,
+                cfg.min_exit_pnl_pct,
+            )
+            reason = None
+            if stop is not None and price <= stop:
+                reason = "stop_loss"
+            else:
+                take_profit = position.get("take_profit")
+                if take_profit and price >= take_profit:
+                    reason = "take_profit"
+                elif should_sell(symbol, position, price, no_news):
+                    reason = "strategy_exit"
+
+            if reason is None:
+                append_equity(balance + qty * price * (1 - fee))
+                continue
+
+            entry_cost = entry * qty * (1 + fee)
+            sell_value = qty * price * (1 - fee)
+            profit = sell_value - entry_cost
+            balance += sell_value
+            trades.append(
+                {
+                    "symbol": symbol,
+                    "entry_time": position["entry_time"],
+                    "exit_time": stamps[i],
+                    "entry": entry,
+                    "exit": price,
+                    "qty": qty,
+                    "profit": profit,
+                    "pnl_pct": profit / entry_cost * 100 if entry_cost else 0.0,
+                    "reason": reason,
+                }
+            )
+            position = None
+            append_equity(balance)
+            continue
+
+        if not should_buy(symbol, price, no_news):
+            append_equity(balance)
+            continue
+
+        if len(true_ranges) >= period:
+            stop_distance = tr_sum / period * cfg.stop_atr_mult
+        else:
+            stop_distance = price * cfg.fallback_stop_pct
+        max_trade = min(cfg.daily_max_invest, cfg.max_trade_usdt)
+        qty, stop_loss, _ = calculate_position_size(
+            balance,
+            price,
+            cfg.risk_per_trade,
+            stop_distance,
+            cfg.min_trade_usdt,
+            max_trade,
+            fee_rate=fee,
+        )
+        actual_cost = qty * price * (1 + fee)
+        if qty <= 0 or actual_cost < cfg.min_trade_usdt or actual_cost > balance:
+            append_equity(balance)
+            continue
+
+        balance -= actual_cost
+        position = {
+            "qty": qty,
+            "entry": price,
+            "stop_loss": stop_loss,
+            "take_profit": calculate_fee_adjusted_take_profit(
+                price, stop_loss, price, fee, cfg.risk_reward, cfg.min_exit_pnl_pct
+            ),
+            "trail_price": price,
+            "stop_distance": price - stop_loss if stop_loss is not None else stop_distance,
+            "entry_time": stamps[i],
+        }
+        append_equity(balance + qty * price * (1 - fee))
+
+    elapsed = time.perf_counter() - started
+    equity_arr = np.asarray(equity, dtype=float)
+    stats = summarize(trades, equity_arr, cfg.start_balance)
+    stats["bars"] = n
+    stats["open_position"] = position is not None
+    stats["bars_per_second"] = n / elapsed if elapsed > 0 else float("inf")
+    return BacktestResult(symbol=symbol, trades=trades, equity=equity_arr, stats=stats)
+
+
+def summarize(
+    trades: Sequence[Dict[str, Any]], equity: np.ndarray, start_balance: float
+) -> Dict[str, float]:
+    """Return summary statistics for a set of closed trades and equity curve."""
+
+    profits = np.asarray([t["profit"] for t in trades], dtype=float)
+    wins = profits[profits > 0]
+    losses = profits[profits <= 0]
+    end_balance = float(equity[-1]) if equity.size else start_balance
+
+    if equity.size:
+        peaks = np.maximum.accumulate(np.concatenate(([start_balance], equity)))
+        drawdowns = 1 - np.concatenate(([start_balance], equity)) / peaks
+        max_drawdown = float(drawdowns.max()) * 100
+    else:
+        max_drawdown = 0.0
+
+    gross_loss = float(-losses.sum())
+    return {
+        "start_balance": start_balance,
+        "end_balance": end_balance,
+        "total_return_pct": (end_balance / start_balance - 1) * 100 if start_balance else 0.0,
+        "trades": int(profits.size),
+        "win_rate_pct": float(wins.size / profits.size * 100) if profits.size else 0.0,
+        "avg_pnl_pct": float(np.mean([t["pnl_pct"] for t in trades])) if trades else 0.0,
+        "profit_factor": float(wins.sum() / gross_loss) if gross_loss > 0 else math.inf,
+        "max_drawdown_pct": max_drawdown,
+    }
+
+
+def _load_bars(args: argparse.Namespace) -> Dict[str, np.ndarray]:
+    if args.csv:
+        return load_csv(args.csv)
+    if args.klines:
+        return load_kline_file(args.klines)
+    if args.store:
+        return load_store(args.store, args.symbol, args.interval)
+    return load_prices_db(args.prices_db, args.symbol)
+
+
+def add_source_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the price source options shared with ``sweep.py``."""
+
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--csv", help="CSV file with close/high/low columns")
+    source.add_argument("--klines", help="JSON file with Binance kline arrays")
+    source.add_argument("--store", help="kline store directory (klines.py)")
+    source.add_argument("--prices-db", help="prices.db recorded by the bot")
+    parser.add_argument("--symbol", default="BTCUSDT")
+    parser.add_argument("--interval", default="1m", help="interval for --store")
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Offline strategy backtest")
+    add_source_arguments(parser)
+    parser.add_argument("--strategy", default="ma", help="registered strategy name")
+    parser.add_argument("--trades", action="store_true", help="include the trade list")
+    args = parser.parse_args(argv)
+
+    bars = _load_bars(args)
+    strategy = strategy_registry.create(
+        args.strategy,
+        fee_rate=BacktestConfig.fee_rate,
+        min_pnl_pct=BacktestConfig.min_exit_pnl_pct,
+    )
+    result = run_backtest(
+        strategy,
+        bars["closes"],
+        bars["highs"],
+        bars["lows"],
+        bars["timestamps"],
+        symbol=args.symbol,
+    )
+    output: Dict[str, Any] = {"symbol": result.symbol, "stats": result.stats}
+    if args.trades:
+        output["trades"] = result.trades
+    print(json.dumps(output, indent=2, default=float))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,464 @@
+"""Micro-benchmarks of the bot's hot paths.
+
+Each benchmark builds its inputs from a fixed seed, is calibrated to run for
+at least ``--min-time`` seconds per batch and reports the best and median time
+per call over ``--repeat`` batches.  Results are printed (or written with
+``--json``) as stable, key-sorted JSON so they can be committed as a baseline
+and compared on later runs; ``--compare`` exits with status 1 when any
+benchmark is more than ``--threshold`` percent slower than the baseline.
+
+The SQLite benchmarks run against throw-away databases in a temporary
+directory, never the bot's own ``prices.db``/``trading.db``.
+
+Usage::
+
+    python bench.py --json bench_baseline.json
+    python bench.py --compare bench_baseline.json --threshold 25
+    python bench.py --only ma_should_buy,rsi_should_buy
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+DEFAULT_SEED = 1234
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_TIME = 0.1
+DEFAULT_THRESHOLD = 20.0
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT", "DOGEUSDT",
+           "ADAUSDT", "TRXUSDT", "ENAUSDT", "PEPEUSDT", "PENGUUSDT"]
+HISTORY_LENGTH = 500
+
+# name -> factory(rng) returning the zero-argument callable to time
+BENCHMARKS: Dict[str, Callable[[random.Random], Callable[[], Any]]] = {}
+
+
+def benchmark(name: str):
+    def register(factory):
+        BENCHMARKS[name] = factory
+        return factory
+
+    return register
+
+
+def _random_walk(rng: random.Random, n: int, start: float = 100.0) -> List[float]:
+    prices = [start]
+    for _ in range(n - 1):
+        prices.append(max(0.01, prices[-1] * (1 + rng.gauss(0, 0.002))))
+    return prices
+
+
+def _main_module():
+    import main
+
+    return main
+
+
+@benchmark("save_price")
+def _bench_save_price(rng):
+    main = _main_module()
+    prices = _random_walk(rng, 256)
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        main.save_price(SYMBOLS[i % len(SYMBOLS)], prices[i % len(prices)])
+
+    return run
+
+
+@benchmark("load_prices")
+def _bench_load_prices(rng):
+    main = _main_module()
+    for sym in SYMBOLS:
+        main.save_prices(sym, [(None, p) for p in _random_walk(rng, 100)])
+
+    return lambda: main.load_prices("BTCUSDT", 50)
+
+
+@benchmark("db_upsert_position")
+def _bench_upsert_position(rng):
+    import db
+
+    prices = _random_walk(rng, 256)
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        price = prices[i % len(prices)]
+        db.upsert_position(
+            SYMBOLS[i % len(SYMBOLS)], 0.5, price, price * 0.98, price * 1.04,
+            None, price, price * 0.02,
+        )
+
+    return run
+
+
+@benchmark("db_get_open_positions")
+def _bench_get_open_positions(rng):
+    import db
+
+    for sym, price in zip(SYMBOLS, _random_walk(rng, len(SYMBOLS))):
+        db.upsert_position(sym, 0.5, price, price * 0.98, price * 1.04, None, price, price * 0.02)
+    return db.get_open_positions
+
+
+def _signal_bench(strategy, rng, sell: bool):
+    history = _random_walk(rng, HISTORY_LENGTH)
+    series = strategy.history["BTCUSDT"] = list(history)
+    ticks = _random_walk(rng, 256, history[-1])
+    position = {"entry": history[-1], "qty": 1.0, "take_profit": None}
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        price = ticks[i % len(ticks)]
+        if sell:
+            strategy.should_sell("BTCUSDT", position, price, [])
+        else:
+            strategy.should_buy("BTCUSDT", price, [])
+        # keep the history length constant between calls
+        del series[-1]
+
+    return run
+
+
+@benchmark("ma_should_buy")
+def _bench_ma_buy(rng):
+    from strategies.ma import MovingAverageCrossStrategy
+
+    return _signal_bench(MovingAverageCrossStrategy(short_window=20, long_window=50), rng, False)
+
+
+@benchmark("ma_should_sell")
+def _bench_ma_sell(rng):
+    from strategies.ma import MovingAverageCrossStrategy
+
+    return _signal_bench(MovingAverageCrossStrategy(short_window=20, long_window=50), rng, True)
+
+
+@benchmark("rsi_should_buy")
+def _bench_rsi_buy(rng):
+    from strategies.rsi import RSIStrategy
+
+    return _signal_bench(RSIStrategy(period=14), rng, False)
+
+
+@benchmark("rsi_should_sell")
+def _bench_rsi_sell(rng):
+    from strategies.rsi import RSIStrategy
+
+    return _signal_bench(RSIStrategy(period=14), rng, True)
+
+
+def _ensemble():
+    from strategies.ensemble import EnsembleStrategy
+    from strategies.ma import MovingAverageCrossStrategy
+    from strategies.rsi import RSIStrategy
+
+    return EnsembleStrategy(
+        [MovingAverageCrossStrategy(short_window=20, long_window=50), RSIStrategy(period=14)]
+    )
+
+
+def _watchlist_bench(strategy, rng, batch: bool):
+    """Evaluate one buy tick for every symbol, per symbol or in one batch."""
+
+    series = {}
+    ticks = {}
+    for sym in SYMBOLS:
+        history = _random_walk(rng, HISTORY_LENGTH)
+        series[sym] = strategy.history[sym] = list(history)
+        ticks[sym] = _random_walk(rng, 256, history[-1])
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        prices = {sym: ticks[sym][i % len(ticks[sym])] for sym in SYMBOLS}
+        if batch:
+            strategy.evaluate_batch(prices)
+        else:
+            for sym, price in prices.items():
+                strategy.should_buy(sym, price, [])
+        for prices_of in series.values():
+            del prices_of[-1]
+
+    return run
+
+
+@benchmark("ensemble_should_buy_watchlist")
+def _bench_ensemble_per_symbol(rng):
+    return _watchlist_bench(_ensemble(), rng, False)
+
+
+@benchmark("ensemble_evaluate_batch_watchlist")
+def _bench_ensemble_batch(rng):
+    return _watchlist_bench(_ensemble(), rng, True)
+
+
+@benchmark("calculate_position_size")
+def _bench_position_size(rng):
+    from risk import calculate_position_size
+
+    cases = [
+        (rng.uniform(50, 5000), rng.uniform(0.01, 60000), rng.uniform(0.001, 0.05))
+        for _ in range(256)
+    ]
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        balance, price, stop_pct = cases[i % len(cases)]
+        calculate_position_size(balance, price, 0.02, price * stop_pct, 5.0, 20.0, fee_rate=0.001)
+
+    return run
+
+
+@benchmark("calculate_fee_adjusted_take_profit")
+def _bench_take_profit(rng):
+    from risk import calculate_fee_adjusted_take_profit
+
+    cases = []
+    for _ in range(256):
+        price = rng.uniform(0.01, 60000)
+        cases.append((price, price * (1 - rng.uniform(0.001, 0.05))))
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        price, stop = cases[i % len(cases)]
+        calculate_fee_adjusted_take_profit(price, stop, price, 0.001, 2.0, 1.0)
+
+    return run
+
+
+@benchmark("normalize_command_token")
+def _bench_normalize_command_token(rng):
+    main = _main_module()
+    tokens = ["/balance", "/status@TradeBot", "  summary!  ", "MC", "/montecarlo@bot 500",
+              "yes", "(no)", "/", "", "/mc@TradeBot_bot", "SELL-BTC", "ping?"]
+    rng.shuffle(tokens)
+    state = {"i": 0}
+
+    def run():
+        i = state["i"] = state["i"] + 1
+        main.normalize_command_token(tokens[i % len(tokens)])
+
+    return run
+
+
+_HTTP_SERVER = {}
+
+
+def _local_http_url() -> str:
+    """Start (once) a keep-alive HTTP/1.1 server standing in for Telegram."""
+
+    if "url" not in _HTTP_SERVER:
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # avoid 40 ms delayed-ACK stalls on reused connections
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                body = b'{"ok":true}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        _HTTP_SERVER["url"] = f"http://127.0.0.1:{server.server_port}/sendMessage"
+    return _HTTP_SERVER["url"]
+
+
+@benchmark("http_post_fresh_connection")
+def _bench_http_fresh(rng):
+    import requests
+
+    url = _local_http_url()
+    return lambda: requests.post(url, data={"chat_id": "1", "text": "ping"}, timeout=5)
+
+
+@benchmark("http_post_pooled_session")
+def _bench_http_pooled(rng):
+    import requests
+
+    url = _local_http_url()
+    session = requests.Session()
+    return lambda: session.post(url, data={"chat_id": "1", "text": "ping"}, timeout=5)
+
+
+def _time_batch(fn: Callable[[], Any], number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        fn()
+    return time.perf_counter() - started
+
+
+def _calibrate(fn: Callable[[], Any], min_time: float) -> int:
+    """Return a batch size that runs for at least ``min_time`` seconds."""
+
+    number = 1
+    while number < 1_000_000 and _time_batch(fn, number) < min_time:
+        number *= 2
+    return number
+
+
+def run_benchmarks(
+    names: Iterable[str] | None = None,
+    repeat: int = DEFAULT_REPEAT,
+    min_time: float = DEFAULT_MIN_TIME,
+    seed: int = DEFAULT_SEED,
+) -> Dict[str, Any]:
+    """Run the selected benchmarks and return the JSON-ready result."""
+
+    names = list(names or BENCHMARKS)
+    unknown = [n for n in names if n not in BENCHMARKS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark(s): {', '.join(unknown)}")
+
+    import db
+
+    results: Dict[str, Dict[str, Any]] = {}
+    cwd = os.getcwd()
+    saved_db_file = db.DB_FILE
+    with tempfile.TemporaryDirectory(prefix="trade-bot-bench-") as workdir:
+        os.chdir(workdir)
+        try:
+            for name in names:
+                db.DB_FILE = os.path.join(workdir, f"{name}.db")
+                fn = BENCHMARKS[name](random.Random(seed))
+                number = _calibrate(fn, min_time)
+                per_call = [_time_batch(fn, number) / number for _ in range(max(1, repeat))]
+                results[name] = {
+                    "number": number,
+                    "repeat": len(per_call),
+                    "min_us": round(min(per_call) * 1e6, 3),
+                    "median_us": round(statistics.median(per_call) * 1e6, 3),
+                }
+                logger.debug("%s: %.3f us", name, results[name]["min_us"])
+        finally:
+            db.DB_FILE = saved_db_file
+            os.chdir(cwd)
+
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "seed": seed,
+        "benchmarks": results,
+    }
+
+
+def compare(
+    current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD
+) -> List[Dict[str, Any]]:
+    """Compare ``min_us`` of ``current`` against ``baseline``.
+
+    A benchmark is a ``regression`` when it is more than ``threshold`` percent
+    slower and ``improved`` when it is more than ``threshold`` percent faster.
+    """
+
+    rows: List[Dict[str, Any]] = []
+    old = baseline.get("benchmarks", {})
+    new = current.get("benchmarks", {})
+    for name in sorted(set(old) | set(new)):
+        if name not in new:
+            rows.append({"name": name, "status": "missing"})
+            continue
+        if name not in old:
+            rows.append({"name": name, "status": "new", "current_us": new[name]["min_us"]})
+            continue
+        before, after = old[name]["min_us"], new[name]["min_us"]
+        change = (after - before) / before * 100 if before else 0.0
+        status = "ok"
+        if change > threshold:
+            status = "regression"
+        elif change < -threshold:
+            status = "improved"
+        rows.append(
+            {
+                "name": name,
+                "status": status,
+                "baseline_us": before,
+                "current_us": after,
+                "change_pct": round(change, 1),
+            }
+        )
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    lines = [f"{'benchmark':<36} {'baseline':>12} {'current':>12} {'change':>8}  status"]
+    for row in rows:
+        if "baseline_us" in row:
+            lines.append(
+                f"{row['name']:<36} {row['baseline_us']:>10.3f}us {row['current_us']:>10.3f}us "
+                f"{row['change_pct']:>+7.1f}%  {row['status']}"
+            )
+        else:
+            current = f"{row['current_us']:>10.3f}us" if "current_us" in row else f"{'-':>12}"
+            lines.append(f"{row['name']:<36} {'-':>12} {current} {'':>8}  {row['status']}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("--only", help="comma separated benchmark names")
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    parser.add_argument("--min-time", type=float, default=DEFAULT_MIN_TIME,
+                        help="seconds per timed batch")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--json", metavar="PATH", help="write results to PATH")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a saved run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown in %% before --compare fails")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        print("\n".join(BENCHMARKS))
+        return 0
+
+    names = [n.strip() for n in args.only.split(",") if n.strip()] if args.only else None
+    result = run_benchmarks(names, args.repeat, args.min_time, args.seed)
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if not args.compare:
+        if not args.json:
+            print(text)
+        return 0
+
+    with open(args.compare, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    rows = compare(result, baseline, args.threshold)
+    print(format_comparison(rows))
+    return 1 if any(row["status"] == "regression" for row in rows) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
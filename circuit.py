@@ -0,0 +1,173 @@
+"""Per-endpoint circuit breakers and jittered backoff for external calls.
+
+A dependency that is down (NewsAPI, Telegram, a Binance endpoint) would
+otherwise cost every symbol of a cycle a full round of failed attempts and
+backoff sleeps.  :class:`CircuitBreaker` counts consecutive failures per
+endpoint; after ``failure_threshold`` of them the circuit *opens* and calls
+are rejected immediately for ``reset_timeout`` seconds.  The first call after
+that is let through as a *half-open* probe: success closes the circuit,
+failure opens it for another ``reset_timeout``.
+
+:func:`backoff_delay` spreads retries with "equal jitter" so concurrent
+callers do not retry in lock-step.
+"""
+
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from typing import Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+DEFAULT_RESET_TIMEOUT = 60.0
+DEFAULT_MAX_DELAY = 30.0
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = 1.0,
+    cap: float = DEFAULT_MAX_DELAY,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Return the sleep before retry ``attempt`` (0-based).
+
+    Half of the exponential delay is kept and the other half is random, so
+    the wait is in ``[d/2, d]`` with ``d = min(cap, base * 2**attempt)``.
+    """
+
+    delay = min(cap, base * (2 ** attempt))
+    return delay / 2 + rng() * delay / 2
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker for one endpoint."""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.rejected = 0
+        self.trips = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return whether a call may be attempted now."""
+
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self.opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == HALF_OPEN and not self._probing:
+                # exactly one probe at a time
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def release(self) -> None:
+        """Give back an allowed call that reached neither success nor failure."""
+
+        with self._lock:
+            self._probing = False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self.state != CLOSED:
+                logger.info("🔌 %s circuit closed", self.name)
+            self.state = CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or (
+                self.state == CLOSED and self.failures >= self.failure_threshold
+            ):
+                if self.state == CLOSED:
+                    logger.warning(
+                        "🔌 %s circuit open after %d failures; retrying in %.0fs",
+                        self.name, self.failures, self.reset_timeout,
+                    )
+                self.state = OPEN
+                self.opened_at = self._clock()
+                self.trips += 1
+                self._probing = False
+
+    def remaining(self) -> float:
+        """Seconds until an open circuit lets a probe through."""
+
+        with self._lock:
+            if self.state != OPEN:
+                return 0.0
+            return max(0.0, self.opened_at + self.reset_timeout - self._clock())
+
+
+class BreakerRegistry:
+    """Create breakers on first use and export their state."""
+
+    def __init__(
+        self,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name, self.failure_threshold, self.reset_timeout
+                )
+            return breaker
+
+    def reset(self) -> None:
+        with self._lock:
+            self._breakers.clear()
+
+    def states(self) -> Dict[str, str]:
+        with self._lock:
+            return {name: b.state for name, b in sorted(self._breakers.items())}
+
+    def prometheus_lines(self) -> List[str]:
+        with self._lock:
+            breakers = sorted(self._breakers.items())
+        if not breakers:
+            return []
+        lines = [
+            "# HELP trade_bot_circuit_open Whether the endpoint's circuit is open (1) or half-open (0.5).",
+            "# TYPE trade_bot_circuit_open gauge",
+        ]
+        value = {CLOSED: 0, HALF_OPEN: 0.5, OPEN: 1}
+        lines += [f'trade_bot_circuit_open{{endpoint="{n}"}} {value[b.state]}' for n, b in breakers]
+        lines += [
+            "# HELP trade_bot_circuit_rejected_total Calls skipped by an open circuit.",
+            "# TYPE trade_bot_circuit_rejected_total counter",
+        ]
+        lines += [f'trade_bot_circuit_rejected_total{{endpoint="{n}"}} {b.rejected}' for n, b in breakers]
+        return lines
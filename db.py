@@ -5,8 +5,14 @@ from typing import Dict, List, Any, Optional
 
 DB_FILE = os.getenv("TRADE_DB_FILE", "trading.db")
 
+# Database files whose tables have been created in this process
+_initialized: set = set()
+
+
 @contextmanager
 def get_conn():
+    if os.path.abspath(DB_FILE) not in _initialized:
+        init_db()
     conn = sqlite3.connect(DB_FILE)
     try:
         yield conn
@@ -15,6 +21,21 @@ def get_conn():
         conn.close()
 
 def init_db():
+    """Create or migrate the tables.
+
+    Runs automatically on the first query against ``DB_FILE``; calling it
+    directly is only needed to fail fast at start-up.
+    """
+    path = os.path.abspath(DB_FILE)
+    _initialized.add(path)
+    try:
+        _create_tables()
+    except Exception:
+        _initialized.discard(path)
+        raise
+
+
+def _create_tables():
     with get_conn() as conn:
         cur = conn.cursor()
         cur.execute(
@@ -181,3 +202,26 @@ def average_profit_last_n_trades(n: int) -> float:
         )
         result = cur.fetchone()[0]
         return result or 0.0
+
+
+def get_closed_trade_profits(limit: Optional[int] = None) -> List[float]:
+    """Return realised USDT profits of closed trades, oldest first.
+
+    ``limit`` keeps only the most recent ``limit`` trades.
+    """
+
+    with get_conn() as conn:
+        cur = conn.cursor()
+        cur.execute(
+            """
+            SELECT COALESCE(pnl_usdt, profit) FROM (
+                SELECT pnl_usdt, profit, timestamp, id FROM trades
+                WHERE COALESCE(pnl_usdt, profit) IS NOT NULL
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            )
+            ORDER BY timestamp, id
+            """,
+            (-1 if limit is None else limit,),
+        )
+        return [row[0] for row in cur.fetchall()]
@@ -0,0 +1,312 @@
+"""Request-weight aware gateway in front of the Binance client.
+
+Binance meters REST usage per IP in "request weight" per minute and answers
+with 429 (and eventually 418 bans) once the budget is spent.  Every call the
+bot makes goes through :class:`ExchangeGateway`, which charges the endpoint's
+weight against a shared :class:`WeightBudget` before forwarding it:
+
+* the budget follows a local model of endpoint weights and is corrected by
+  the ``X-MBX-USED-WEIGHT-1M`` header of every response;
+* each call has a priority.  Orders (and anything run under
+  ``gateway.priority("high")``, such as stop checks of open positions) may use
+  the whole budget, account reads are throttled once 90% is used, and
+  low-priority market data — klines and tickers — is deferred with
+  :class:`RequestDeferred` once 75% is used instead of waiting;
+* ``Retry-After`` on 429/418 pauses all calls for the requested time.
+
+Usage counters are exported in the Prometheus text format through
+:meth:`WeightBudget.prometheus_lines`.
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+# Binance spot REST limit per IP and minute
+BINANCE_WEIGHT_LIMIT = 6000
+
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+# Share of the budget each priority may fill
+PRIORITY_CEILINGS = {PRIORITY_HIGH: 1.0, PRIORITY_NORMAL: 0.9, PRIORITY_LOW: 0.75}
+
+# Local model of endpoint weights (python-binance method -> weight)
+ENDPOINT_WEIGHTS = {
+    "get_klines": 2,
+    "get_symbol_ticker": 2,
+    "get_asset_balance": 20,
+    "get_account": 20,
+    "get_margin_account": 10,
+    "create_order": 1,
+    "create_margin_order": 6,
+}
+ENDPOINT_PRIORITIES = {
+    "create_order": PRIORITY_HIGH,
+    "create_margin_order": PRIORITY_HIGH,
+    "get_klines": PRIORITY_LOW,
+    "get_symbol_ticker": PRIORITY_LOW,
+}
+
+
+class RequestDeferred(Exception):
+    """A low-priority request was skipped to protect the weight budget."""
+
+
+class WeightLimiter:
+    """Keep request weight within a rolling one-minute budget.
+
+    ``acquire`` blocks until ``weight`` fits in the budget.  The
+    ``X-MBX-USED-WEIGHT-1M`` value reported by Binance is fed back through
+    :meth:`observe`, and ``Retry-After`` responses through :meth:`backoff`.
+    ``limit`` caps a single call below ``max_weight`` so callers can keep
+    headroom for more important requests.
+    """
+
+    def __init__(
+        self,
+        max_weight: int = BINANCE_WEIGHT_LIMIT,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.max_weight = max_weight
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._events: collections.deque[tuple[float, int]] = collections.deque()
+        self._used = 0
+        self._server_used = 0
+        self._server_seen = float("-inf")
+        self._blocked_until = float("-inf")
+
+    def _current(self, now: float) -> int:
+        while self._events and now - self._events[0][0] >= 60:
+            self._used -= self._events.popleft()[1]
+        if now - self._server_seen < 60:
+            return max(self._used, self._server_used)
+        return self._used
+
+    def _wait_time(self, weight: int, now: float, limit: int) -> float:
+        used = self._current(now)
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if used + weight <= limit or not self._events:
+            return 0.0
+        return max(self._events[0][0] + 60 - now, 0.05)
+
+    def acquire(self, weight: int = 1, limit: int | None = None) -> float:
+        """Wait until ``weight`` fits under ``limit``; return the seconds waited."""
+
+        limit = self.max_weight if limit is None else limit
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                wait = self._wait_time(weight, now, limit)
+                if wait <= 0:
+                    self._events.append((now, weight))
+                    self._used += weight
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def try_acquire(self, weight: int = 1, limit: int | None = None) -> bool:
+        """Charge ``weight`` only if it fits right now."""
+
+        limit = self.max_weight if limit is None else limit
+        with self._lock:
+            now = self._clock()
+            if self._wait_time(weight, now, limit) > 0:
+                return False
+            self._events.append((now, weight))
+            self._used += weight
+            return True
+
+    def used(self) -> int:
+        """Weight used in the last minute (local or server view, whichever is higher)."""
+
+        with self._lock:
+            return self._current(self._clock())
+
+    def observe(self, used_weight: int) -> None:
+        with self._lock:
+            self._server_used = used_weight
+            self._server_seen = self._clock()
+
+    def backoff(self, seconds: float) -> None:
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+
+def _header(headers, name: str):
+    if not headers:
+        return None
+    value = headers.get(name)
+    if value is None:
+        value = headers.get(name.lower())
+    return value
+
+
+class WeightBudget:
+    """Shared request-weight ledger with per-priority ceilings and counters."""
+
+    def __init__(
+        self,
+        max_weight: int = BINANCE_WEIGHT_LIMIT,
+        ceilings: Dict[str, float] | None = None,
+        limiter: WeightLimiter | None = None,
+    ) -> None:
+        self.limiter = limiter or WeightLimiter(max_weight)
+        self.ceilings = dict(PRIORITY_CEILINGS, **(ceilings or {}))
+        self.requests: collections.Counter = collections.Counter()
+        self.weight: collections.Counter = collections.Counter()
+        self.deferred: collections.Counter = collections.Counter()
+        self.throttled_seconds = 0.0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    @property
+    def max_weight(self) -> int:
+        return self.limiter.max_weight
+
+    @max_weight.setter
+    def max_weight(self, value: int) -> None:
+        self.limiter.max_weight = value
+
+    def admit(self, endpoint: str, priority: str) -> None:
+        """Charge ``endpoint`` or raise :class:`RequestDeferred`."""
+
+        weight = ENDPOINT_WEIGHTS.get(endpoint, 1)
+        limit = int(self.limiter.max_weight * self.ceilings.get(priority, 1.0))
+        if priority == PRIORITY_LOW:
+            if not self.limiter.try_acquire(weight, limit):
+                with self._lock:
+                    self.deferred[endpoint] += 1
+                raise RequestDeferred(
+                    f"{endpoint} deferred: {self.limiter.used()}/{self.limiter.max_weight} "
+                    "request weight used"
+                )
+            waited = 0.0
+        else:
+            waited = self.limiter.acquire(weight, limit)
+        with self._lock:
+            self.requests[endpoint] += 1
+            self.weight[endpoint] += weight
+            self.throttled_seconds += waited
+
+    def observe_headers(self, headers) -> None:
+        used = _header(headers, "X-MBX-USED-WEIGHT-1M")
+        if used is not None:
+            try:
+                self.limiter.observe(int(used))
+            except (TypeError, ValueError):
+                pass
+
+    def observe_error(self, exc: Exception) -> None:
+        """Pause all requests when Binance answers 429/418."""
+
+        status = getattr(exc, "status_code", None)
+        if status not in (418, 429):
+            return
+        response = getattr(exc, "response", None)
+        retry_after = _header(getattr(response, "headers", None), "Retry-After")
+        try:
+            seconds = float(retry_after)
+        except (TypeError, ValueError):
+            seconds = 120.0 if status == 418 else 60.0
+        self.limiter.backoff(seconds)
+        with self._lock:
+            self.rate_limited += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "used_weight": self.limiter.used(),
+                "max_weight": self.limiter.max_weight,
+                "requests": dict(self.requests),
+                "weight": dict(self.weight),
+                "deferred": dict(self.deferred),
+                "throttled_seconds": self.throttled_seconds,
+                "rate_limited": self.rate_limited,
+            }
+
+    def prometheus_lines(self) -> List[str]:
+        stats = self.stats()
+        lines = [
+            "# HELP trade_bot_exchange_weight_used Binance request weight used in the last minute.",
+            "# TYPE trade_bot_exchange_weight_used gauge",
+            f"trade_bot_exchange_weight_used {stats['used_weight']}",
+            "# HELP trade_bot_exchange_weight_limit Request weight budget per minute.",
+            "# TYPE trade_bot_exchange_weight_limit gauge",
+            f"trade_bot_exchange_weight_limit {stats['max_weight']}",
+            "# HELP trade_bot_exchange_throttled_seconds_total Time spent waiting for weight.",
+            "# TYPE trade_bot_exchange_throttled_seconds_total counter",
+            f"trade_bot_exchange_throttled_seconds_total {stats['throttled_seconds']:.3f}",
+            "# HELP trade_bot_exchange_rate_limited_total 429/418 responses received.",
+            "# TYPE trade_bot_exchange_rate_limited_total counter",
+            f"trade_bot_exchange_rate_limited_total {stats['rate_limited']}",
+        ]
+        for key, metric, help_text in (
+            ("requests", "trade_bot_exchange_requests_total", "Requests sent per endpoint."),
+            ("weight", "trade_bot_exchange_weight_total", "Request weight charged per endpoint."),
+            ("deferred", "trade_bot_exchange_deferred_total", "Low-priority requests deferred."),
+        ):
+            if not stats[key]:
+                continue
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} counter"]
+            lines += [
+                f'{metric}{{endpoint="{endpoint}"}} {value}'
+                for endpoint, value in sorted(stats[key].items())
+            ]
+        return lines
+
+
+class ExchangeGateway:
+    """Forward calls to ``client`` after charging them against ``budget``.
+
+    Non-callable attributes and private methods are passed through untouched,
+    so the gateway can stand in for the client everywhere.
+    """
+
+    def __init__(self, client, budget: WeightBudget | None = None) -> None:
+        self.client = client
+        self.budget = budget or WeightBudget()
+        self._local = threading.local()
+
+    @contextlib.contextmanager
+    def priority(self, level: str):
+        """Run the calls of the enclosed block at ``level``."""
+
+        previous = getattr(self._local, "priority", None)
+        self._local.priority = level
+        try:
+            yield self
+        finally:
+            self._local.priority = previous
+
+    def call(self, endpoint: str, *args, **kwargs):
+        priority = getattr(self._local, "priority", None) or ENDPOINT_PRIORITIES.get(
+            endpoint, PRIORITY_NORMAL
+        )
+        self.budget.admit(endpoint, priority)
+        try:
+            result = getattr(self.client, endpoint)(*args, **kwargs)
+        except Exception as exc:
+            self.budget.observe_error(exc)
+            raise
+        self.budget.observe_headers(getattr(getattr(self.client, "response", None), "headers", None))
+        return result
+
+    def __getattr__(self, name):
+        attr = getattr(self.client, name)
+        if name.startswith("_") or not callable(attr):
+            return attr
+
+        def forward(*args, **kwargs):
+            return self.call(name, *args, **kwargs)
+
+        return forward
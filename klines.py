@@ -0,0 +1,333 @@
+"""Bulk download of historical Binance klines into a compact local store.
+
+Candles are kept in one append-only binary file per symbol and interval
+(``<store>/<SYMBOL>-<interval>.bin``) holding fixed size records of
+:data:`KLINE_DTYPE`.  The files can be memory mapped by :mod:`backtest` and
+read by ``main.preload_history`` without parsing, and a download resumes
+from the last stored candle after an interruption.
+
+Requests go straight to the public REST endpoint with bounded concurrency
+(one symbol per worker) and a shared :class:`WeightLimiter` that keeps the
+request weight under the per-minute budget and honours ``Retry-After``.
+
+Usage::
+
+    python klines.py --symbols BTCUSDT,ETHUSDT --days 90
+    python main.py download-klines --days 30 --interval 5m
+"""
+
+from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import logging
+import os
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Sequence
+
+import numpy as np
+
+from gateway import WeightLimiter
+
+logger = logging.getLogger(__name__)
+
+KLINE_STORE_DIR = os.getenv("KLINE_STORE_DIR", "klines")
+BINANCE_API_URL = os.getenv("BINANCE_API_URL", "https://api.binance.com")
+KLINES_PATH = "/api/v3/klines"
+# Binance caps one klines request at 1000 candles; each such request costs 2
+KLINES_PER_REQUEST = 1000
+KLINE_REQUEST_WEIGHT = 2
+# Leave most of the 6000/min IP budget to the live bot
+DEFAULT_MAX_WEIGHT = 1200
+
+KLINE_DTYPE = np.dtype(
+    [
+        ("open_time", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8"),
+    ]
+)
+
+_INTERVAL_UNITS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000, "w": 604_800_000}
+
+
+def interval_ms(interval: str) -> int:
+    """Return the length of a Binance interval such as ``1m`` or ``4h`` in ms."""
+
+    try:
+        return int(interval[:-1]) * _INTERVAL_UNITS[interval[-1]]
+    except (KeyError, ValueError):
+        raise ValueError(f"Unsupported kline interval {interval!r}") from None
+
+
+# -- store -------------------------------------------------------------------
+class KlineStore:
+    """Append-only per symbol/interval files of :data:`KLINE_DTYPE` records."""
+
+    def __init__(self, root: str = KLINE_STORE_DIR) -> None:
+        self.root = root
+
+    def path(self, symbol: str, interval: str) -> str:
+        return os.path.join(self.root, f"{symbol.upper()}-{interval}.bin")
+
+    def _valid_size(self, path: str) -> int:
+        try:
+            size = os.path.getsize(path)
+        except OSError:
+            return 0
+        # A write cut short leaves a partial record at the end; ignore it
+        return size - size % KLINE_DTYPE.itemsize
+
+    def count(self, symbol: str, interval: str) -> int:
+        return self._valid_size(self.path(symbol, interval)) // KLINE_DTYPE.itemsize
+
+    def last_open_time(self, symbol: str, interval: str) -> int | None:
+        """Return the open time (ms) of the newest stored candle, if any."""
+
+        path = self.path(symbol, interval)
+        size = self._valid_size(path)
+        if not size:
+            return None
+        with open(path, "rb") as f:
+            f.seek(size - KLINE_DTYPE.itemsize)
+            record = np.frombuffer(f.read(KLINE_DTYPE.itemsize), dtype=KLINE_DTYPE)
+        return int(record["open_time"][0])
+
+    def append(self, symbol: str, interval: str, rows: np.ndarray) -> int:
+        """Append candles newer than the last stored one; return how many were written."""
+
+        if not len(rows):
+            return 0
+        last = self.last_open_time(symbol, interval)
+        if last is not None:
+            rows = rows[rows["open_time"] > last]
+            if not len(rows):
+                return 0
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(symbol, interval)
+        size = self._valid_size(path)
+        with open(path, "ab") as f:
+            if f.tell() != size:
+                f.truncate(size)
+            f.write(np.ascontiguousarray(rows, dtype=KLINE_DTYPE).tobytes())
+        return len(rows)
+
+    def load(self, symbol: str, interval: str, limit: int | None = None) -> np.ndarray:
+        """Return the stored candles (oldest first) as a read-only memory map.
+
+        ``limit`` restricts the result to the newest ``limit`` candles.  An
+        empty array is returned when nothing is stored.
+        """
+
+        path = self.path(symbol, interval)
+        count = self._valid_size(path) // KLINE_DTYPE.itemsize
+        if not count:
+            return np.empty(0, dtype=KLINE_DTYPE)
+        data = np.memmap(path, dtype=KLINE_DTYPE, mode="r", shape=(count,))
+        return data[-limit:] if limit else data
+
+    def closes(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        limit: int | None = None,
+        max_age: float | None = None,
+    ) -> List[float]:
+        """Return stored closing prices, or ``[]`` if older than ``max_age`` seconds."""
+
+        data = self.load(symbol, interval, limit)
+        if not len(data):
+            return []
+        if max_age is not None:
+            newest_close = (int(data["open_time"][-1]) + interval_ms(interval)) / 1000
+            if time.time() - newest_close > max_age:
+                return []
+        return data["close"].tolist()
+
+
+# -- download ----------------------------------------------------------------
+def _parse_klines(klines: Sequence[Sequence], closed_before: int) -> np.ndarray:
+    rows = [
+        (int(k[0]), float(k[1]), float(k[2]), float(k[3]), float(k[4]), float(k[5]))
+        for k in klines
+        if int(k[6]) < closed_before
+    ]
+    return np.array(rows, dtype=KLINE_DTYPE)
+
+
+def fetch_klines(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    limiter: WeightLimiter,
+    base_url: str = BINANCE_API_URL,
+    attempts: int = 5,
+    timeout: float = 10.0,
+) -> list:
+    """Request one page of raw klines, waiting on ``limiter`` before each attempt."""
+
+    query = urllib.parse.urlencode(
+        {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_ms,
+            "endTime": end_ms,
+            "limit": KLINES_PER_REQUEST,
+        }
+    )
+    url = f"{base_url.rstrip('/')}{KLINES_PATH}?{query}"
+    for attempt in range(1, attempts + 1):
+        limiter.acquire(KLINE_REQUEST_WEIGHT)
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as resp:
+                used = resp.headers.get("X-MBX-USED-WEIGHT-1M")
+                if used is not None:
+                    limiter.observe(int(used))
+                return json.loads(resp.read().decode("utf-8"))
+        except urllib.error.HTTPError as exc:
+            if exc.code in (418, 429):
+                retry_after = float(exc.headers.get("Retry-After") or 60)
+                logger.warning(
+                    "Kline download for %s rate limited, waiting %.0fs", symbol, retry_after
+                )
+                limiter.backoff(retry_after)
+                continue
+            if attempt == attempts or exc.code < 500:
+                raise
+        except (urllib.error.URLError, OSError):
+            if attempt == attempts:
+                raise
+        time.sleep(min(2 ** (attempt - 1), 30))
+    raise RuntimeError(f"Kline download for {symbol} kept hitting the rate limit")
+
+
+def download_symbol(
+    symbol: str,
+    interval: str,
+    start_ms: int,
+    end_ms: int,
+    store: KlineStore,
+    limiter: WeightLimiter,
+    base_url: str = BINANCE_API_URL,
+) -> int:
+    """Download ``symbol`` candles in ``[start_ms, end_ms)`` resuming from the store.
+
+    Every page is appended as soon as it arrives, so an interrupted download
+    only repeats the page in flight.  Returns the number of new candles.
+    """
+
+    step = interval_ms(interval)
+    last = store.last_open_time(symbol, interval)
+    cursor = max(start_ms, last + step) if last is not None else start_ms
+    now_ms = int(time.time() * 1000)
+    closed_before = min(end_ms, now_ms)
+    written = 0
+    while cursor < closed_before:
+        klines = fetch_klines(symbol, interval, cursor, closed_before - 1, limiter, base_url)
+        if not klines:
+            break
+        written += store.append(symbol, interval, _parse_klines(klines, closed_before))
+        next_cursor = int(klines[-1][0]) + step
+        if next_cursor <= cursor:
+            break
+        cursor = next_cursor
+    return written
+
+
+def download(
+    symbols: Iterable[str],
+    interval: str = "1m",
+    start: datetime.datetime | int | None = None,
+    end: datetime.datetime | int | None = None,
+    store: KlineStore | None = None,
+    workers: int = 4,
+    max_weight: int = DEFAULT_MAX_WEIGHT,
+    base_url: str = BINANCE_API_URL,
+    limiter: WeightLimiter | None = None,
+) -> Dict[str, int]:
+    """Download klines for ``symbols`` concurrently; return new candles per symbol.
+
+    ``start``/``end`` are datetimes or epoch milliseconds; ``start`` defaults
+    to 30 days ago and ``end`` to now.  Symbols that fail are logged and
+    reported with ``-1`` so the others still complete.
+    """
+
+    store = store or KlineStore()
+    limiter = limiter or WeightLimiter(max_weight)
+    end_ms = _to_ms(end) if end is not None else int(time.time() * 1000)
+    start_ms = _to_ms(start) if start is not None else end_ms - 30 * 86_400_000
+    symbols = list(dict.fromkeys(s.upper() for s in symbols))
+
+    def _run(symbol: str) -> int:
+        try:
+            count = download_symbol(
+                symbol, interval, start_ms, end_ms, store, limiter, base_url
+            )
+        except Exception as exc:
+            logger.error("Kline download for %s failed: %s", symbol, exc)
+            return -1
+        logger.info("Downloaded %d %s candles for %s", count, interval, symbol)
+        return count
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        return dict(zip(symbols, pool.map(_run, symbols)))
+
+
+def _to_ms(value: datetime.datetime | int) -> int:
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return int(value.timestamp() * 1000)
+    return int(value)
+
+
+# -- CLI ---------------------------------------------------------------------
+def add_download_arguments(parser: argparse.ArgumentParser) -> None:
+    """Register the download options on ``parser`` (shared with ``main.py``)."""
+
+    parser.add_argument("--symbols", help="comma separated symbols (default: watchlist)")
+    parser.add_argument("--interval", default="1m")
+    parser.add_argument("--days", type=float, default=30.0, help="history to fetch")
+    parser.add_argument("--store", default=KLINE_STORE_DIR, help="kline store directory")
+    parser.add_argument("--workers", type=int, default=4, help="symbols fetched at once")
+    parser.add_argument("--max-weight", type=int, default=DEFAULT_MAX_WEIGHT)
+    parser.add_argument("--base-url", default=BINANCE_API_URL)
+
+
+def run_download(args: argparse.Namespace, default_symbols: Sequence[str] = ()) -> Dict[str, int]:
+    symbols = args.symbols.split(",") if args.symbols else list(default_symbols)
+    if not symbols:
+        raise SystemExit("No symbols given; use --symbols")
+    end_ms = int(time.time() * 1000)
+    return download(
+        [s.strip() for s in symbols if s.strip()],
+        interval=args.interval,
+        start=end_ms - int(args.days * 86_400_000),
+        end=end_ms,
+        store=KlineStore(args.store),
+        workers=args.workers,
+        max_weight=args.max_weight,
+        base_url=args.base_url,
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Download historical klines")
+    add_download_arguments(parser)
+    results = run_download(parser.parse_args(argv))
+    print(json.dumps(results, indent=2))
+    return 0 if all(v >= 0 for v in results.values()) else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,478 @@
+"""End-to-end load test of ``main.trade()`` against a synthetic exchange.
+
+The bot is wired to an in-process :class:`SyntheticExchange` (tickers,
+klines, balances and market orders) and a :class:`StubHTTP` stand-in for the
+``requests`` module that answers Telegram and NewsAPI calls.  Full trade
+cycles are then run for watchlists of increasing size, optionally with
+injected latency on every exchange or HTTP call, and the harness reports:
+
+* cycle wall time — the first (cold) cycle, which also preloads history,
+  separately from the mean/p95/max of the following cycles;
+* the steady-state cost per symbol;
+* SQLite write statements per cycle, counted on every connection opened
+  during the run;
+* exchange and HTTP calls per endpoint;
+* resident memory growth, and Python heap growth with ``--trace-memory``.
+
+Everything runs in a temporary directory, so the bot's own databases and
+JSON files are never touched.
+
+Usage::
+
+    python loadtest.py --symbols 10,100,1000 --cycles 5
+    python loadtest.py --symbols 100 --latency-ms 20 --jitter-ms 10 --spans --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import contextlib
+import json
+import logging
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIZES = (10, 100, 1000)
+DEFAULT_CYCLES = 3
+_INTERVAL_MS = {"s": 1_000, "m": 60_000, "h": 3_600_000, "d": 86_400_000}
+_WRITE_PREFIXES = ("INSERT", "UPDATE", "DELETE", "REPLACE")
+
+
+def synthetic_symbols(count: int) -> List[str]:
+    """Return ``count`` distinct ``...USDT`` pair names."""
+
+    return [f"SYN{i:04d}USDT" for i in range(count)]
+
+
+class _Latency:
+    def __init__(self, latency_ms: float, jitter_ms: float, seed: int) -> None:
+        self.base = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.base and not self.jitter:
+            return
+        with self._lock:
+            extra = self._rng.uniform(0, self.jitter) if self.jitter else 0.0
+        time.sleep(self.base + extra)
+
+
+class SyntheticExchange:
+    """In-process stand-in for ``binance.client.Client``.
+
+    Prices follow a seeded random walk that advances one step per
+    :meth:`tick`; klines are generated backwards from the current price.
+    Market orders fill immediately at the current price and update the
+    balances returned by the account endpoints.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        seed: int = 0,
+        usdt: float = 10_000.0,
+        volatility: float = 0.004,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+    ) -> None:
+        self.seed = seed
+        self.volatility = volatility
+        self._rng = random.Random(seed)
+        self.prices = {sym: self._rng.uniform(0.05, 500.0) for sym in symbols}
+        self.balances: Dict[str, float] = {"USDT": usdt}
+        self.calls: collections.Counter = collections.Counter()
+        self.orders: List[Dict[str, Any]] = []
+        self.step = 0
+        self._latency = _Latency(latency_ms, jitter_ms, seed + 1)
+        self._lock = threading.Lock()
+
+    def _call(self, endpoint: str) -> None:
+        with self._lock:
+            self.calls[endpoint] += 1
+        self._latency.wait()
+
+    def tick(self) -> None:
+        """Advance every price by one random-walk step."""
+
+        self.step += 1
+        for sym, price in self.prices.items():
+            self.prices[sym] = max(1e-6, price * (1 + self._rng.gauss(0, self.volatility)))
+
+    # -- market data -------------------------------------------------------
+    def get_symbol_ticker(self, symbol: str, **kwargs) -> Dict[str, str]:
+        self._call("get_symbol_ticker")
+        return {"symbol": symbol, "price": repr(self.prices[symbol])}
+
+    def get_klines(self, symbol: str, interval: str = "1m", limit: int = 500, **kwargs):
+        self._call("get_klines")
+        step_ms = int(interval[:-1] or 1) * _INTERVAL_MS[interval[-1]]
+        rng = random.Random(f"{self.seed}:{symbol}:{interval}:{self.step}")
+        end = 1_700_000_000_000 + self.step * 300_000
+        close = self.prices[symbol]
+        rows = []
+        for i in range(limit):
+            open_ = close / (1 + rng.gauss(0, self.volatility))
+            high = max(open_, close) * (1 + abs(rng.gauss(0, self.volatility / 2)))
+            low = min(open_, close) * (1 - abs(rng.gauss(0, self.volatility / 2)))
+            open_time = end - (i + 1) * step_ms
+            rows.append(
+                [open_time, repr(open_), repr(high), repr(low), repr(close), "1000.0",
+                 open_time + step_ms - 1, "0", 10, "0", "0", "0"]
+            )
+            close = open_
+        rows.reverse()
+        return rows
+
+    # -- account -----------------------------------------------------------
+    def _balance_rows(self) -> List[Dict[str, str]]:
+        return [
+            {"asset": asset, "free": repr(qty), "locked": "0"}
+            for asset, qty in self.balances.items()
+        ]
+
+    def get_asset_balance(self, asset: str = "USDT", **kwargs) -> Dict[str, str]:
+        self._call("get_asset_balance")
+        return {"asset": asset, "free": repr(self.balances.get(asset, 0.0)), "locked": "0"}
+
+    def get_account(self, **kwargs) -> Dict[str, Any]:
+        self._call("get_account")
+        return {"balances": self._balance_rows()}
+
+    def get_margin_account(self, **kwargs) -> Dict[str, Any]:
+        self._call("get_margin_account")
+        return {"userAssets": self._balance_rows()}
+
+    def create_order(self, symbol: str, side: str, quantity: float, **kwargs) -> Dict[str, Any]:
+        self._call("create_order")
+        price = self.prices[symbol]
+        qty = float(quantity)
+        asset = symbol[: -len("USDT")]
+        sign = 1 if side.upper() == "BUY" else -1
+        with self._lock:
+            self.balances["USDT"] = self.balances.get("USDT", 0.0) - sign * qty * price
+            self.balances[asset] = self.balances.get(asset, 0.0) + sign * qty
+            order = {"symbol": symbol, "side": side.upper(), "executedQty": repr(qty),
+                     "price": repr(price), "status": "FILLED", "orderId": len(self.orders) + 1}
+            self.orders.append(order)
+        return order
+
+    create_margin_order = create_order
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._data = data
+
+    def json(self) -> Dict[str, Any]:
+        return self._data
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class StubHTTP:
+    """Replacement for the ``requests`` module used by ``main``.
+
+    NewsAPI queries return ``headlines`` neutral articles; Telegram methods
+    return minimal successful payloads.
+    """
+
+    def __init__(
+        self,
+        news_latency_ms: float = 0.0,
+        telegram_latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        headlines: int = 3,
+        seed: int = 0,
+    ) -> None:
+        self.headlines = headlines
+        self.calls: collections.Counter = collections.Counter()
+        self._latency = {
+            "newsapi": _Latency(news_latency_ms, jitter_ms, seed + 2),
+            "telegram": _Latency(telegram_latency_ms, jitter_ms, seed + 3),
+        }
+        self._lock = threading.Lock()
+
+    def _endpoint(self, url: str) -> str:
+        if "newsapi.org" in url:
+            return "newsapi"
+        if "api.telegram.org" in url:
+            return "telegram." + url.rsplit("/", 1)[-1]
+        return url
+
+    def _call(self, url: str) -> str:
+        endpoint = self._endpoint(url)
+        with self._lock:
+            self.calls[endpoint] += 1
+        latency = self._latency.get(endpoint.split(".", 1)[0])
+        if latency is not None:
+            latency.wait()
+        return endpoint
+
+    def get(self, url: str, params=None, **kwargs) -> _Response:
+        endpoint = self._call(url)
+        if endpoint == "newsapi":
+            query = (params or {}).get("q", "")
+            articles = [{"title": f"{query} market update {i}"} for i in range(self.headlines)]
+            return _Response({"status": "ok", "articles": articles})
+        return _Response({"ok": True, "result": []})
+
+    def post(self, url: str, data=None, **kwargs) -> _Response:
+        self._call(url)
+        return _Response({"ok": True, "result": {"message_id": 1, "poll": {"id": "load"}}})
+
+
+class _WriteCounter:
+    """Count SQLite write statements on every connection opened meanwhile."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def _trace(self, statement: str) -> None:
+        if statement.lstrip().upper().startswith(_WRITE_PREFIXES):
+            with self._lock:
+                self.count += 1
+
+    @contextlib.contextmanager
+    def installed(self):
+        connect = sqlite3.connect
+
+        def counting_connect(*args, **kwargs):
+            conn = connect(*args, **kwargs)
+            conn.set_trace_callback(self._trace)
+            return conn
+
+        sqlite3.connect = counting_connect
+        try:
+            yield self
+        finally:
+            sqlite3.connect = connect
+
+
+def _rss_mb() -> float:
+    """Current resident set size in MiB (peak RSS where /proc is unavailable)."""
+
+    try:
+        with open("/proc/self/statm", "r", encoding="ascii") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, IndexError, AttributeError):
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+@contextlib.contextmanager
+def _patched(target, **values):
+    saved = {name: target.__dict__.get(name) for name in values}
+    for name, value in values.items():
+        setattr(target, name, value)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            setattr(target, name, value)
+
+
+def run_load(
+    symbol_count: int,
+    cycles: int = DEFAULT_CYCLES,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    news_latency_ms: float = 0.0,
+    telegram_latency_ms: float = 0.0,
+    seed: int = 0,
+    spans: bool = False,
+    trace_memory: bool = False,
+    max_orders: int | None = None,
+) -> Dict[str, Any]:
+    """Run ``cycles`` full trade cycles over ``symbol_count`` synthetic pairs.
+
+    ``max_orders`` overrides ``MAX_ORDERS_PER_CYCLE``; with the bot's default
+    of one, symbols without a position are skipped after the first buy of a
+    cycle, so ``priced_per_cycle`` reports how many symbols were evaluated.
+    Exchange calls go through a fresh :class:`gateway.WeightBudget`, so large
+    watchlists also show how many tickers the weight budget deferred.
+    """
+
+    import db
+    import gateway
+    import main
+    import notifier
+
+    symbols = synthetic_symbols(symbol_count)
+    exchange = SyntheticExchange(symbols, seed=seed, latency_ms=latency_ms, jitter_ms=jitter_ms)
+    budget = gateway.WeightBudget()
+    http = StubHTTP(news_latency_ms, telegram_latency_ms, jitter_ms, seed=seed)
+    writes = _WriteCounter()
+    metrics_enabled = main.METRICS.enabled
+
+    cwd = os.getcwd()
+    durations: List[float] = []
+    writes_per_cycle: List[int] = []
+    priced_per_cycle: List[int] = []
+    phases: Dict[str, List[float]] = collections.defaultdict(list)
+    with tempfile.TemporaryDirectory(prefix="trade-bot-load-") as workdir:
+        os.chdir(workdir)
+        try:
+            with contextlib.ExitStack() as stack:
+                stack.enter_context(
+                    _patched(
+                        main,
+                        client=gateway.ExchangeGateway(exchange, budget),
+                        requests=http,
+                        # measure the bot, not Telegram's per-chat rate limit
+                        TELEGRAM_BUCKET=notifier.TokenBucket(rate=0),
+                        strategy=main._init_strategy(main.STRATEGY_NAME),
+                        WATCHLIST=list(symbols),
+                        LIVE_MODE=True,
+                        ATR_CACHE={},
+                        PRICE_BASELINE={},
+                        PENDING_DECISIONS={},
+                        DECISION_IDS={},
+                        MAX_ORDERS_PER_CYCLE=(
+                            main.MAX_ORDERS_PER_CYCLE if max_orders is None else max_orders
+                        ),
+                    )
+                )
+                stack.enter_context(_patched(db, DB_FILE=os.path.join(workdir, "trading.db")))
+                stack.enter_context(writes.installed())
+                main.METRICS.enabled = spans
+                if trace_memory:
+                    tracemalloc.start()
+                    heap_start = tracemalloc.get_traced_memory()[0]
+                rss_start = _rss_mb()
+                main.METRICS.end_cycle()
+                for _ in range(max(1, cycles)):
+                    before = writes.count
+                    tickers = exchange.calls["get_symbol_ticker"]
+                    started = time.perf_counter()
+                    main.trade()
+                    durations.append(time.perf_counter() - started)
+                    writes_per_cycle.append(writes.count - before)
+                    priced_per_cycle.append(exchange.calls["get_symbol_ticker"] - tickers)
+                    for name, seconds in main.METRICS.end_cycle().items():
+                        phases[name].append(seconds)
+                    exchange.tick()
+                rss_end = _rss_mb()
+                if trace_memory:
+                    heap_end, heap_peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+        finally:
+            main.METRICS.enabled = metrics_enabled
+            os.chdir(cwd)
+
+    steady = durations[1:] or durations
+    result: Dict[str, Any] = {
+        "symbols": symbol_count,
+        "cycles": len(durations),
+        "latency_ms": latency_ms,
+        "first_cycle_s": round(durations[0], 4),
+        "cycle_s": {
+            "mean": round(statistics.fmean(steady), 4),
+            "p95": round(sorted(steady)[max(0, -(-len(steady) * 95 // 100) - 1)], 4),
+            "max": round(max(steady), 4),
+        },
+        "per_symbol_ms": round(statistics.fmean(steady) / symbol_count * 1000, 4),
+        "priced_per_cycle": priced_per_cycle,
+        "db_writes_per_cycle": writes_per_cycle,
+        "exchange_calls": dict(sorted(exchange.calls.items())),
+        "http_calls": dict(sorted(http.calls.items())),
+        "orders": len(exchange.orders),
+        "exchange_weight": {
+            key: value
+            for key, value in budget.stats().items()
+            if key in ("used_weight", "deferred", "throttled_seconds")
+        },
+        "rss_mb": {"start": round(rss_start, 1), "end": round(rss_end, 1),
+                   "growth": round(rss_end - rss_start, 1)},
+    }
+    if trace_memory:
+        result["heap_kb"] = {"growth": round((heap_end - heap_start) / 1024, 1),
+                             "peak": round(heap_peak / 1024, 1)}
+    if spans:
+        result["phases_ms"] = {
+            name: round(statistics.fmean(values[1:] or values) * 1000, 3)
+            for name, values in sorted(phases.items())
+            if name.startswith("phase:")
+        }
+    return result
+
+
+def format_results(results: Sequence[Dict[str, Any]]) -> str:
+    lines = [
+        f"{'symbols':>8} {'first s':>9} {'mean s':>9} {'p95 s':>9} {'ms/sym':>8} "
+        f"{'priced':>7} {'writes/cyc':>10} {'rss +MiB':>9}"
+    ]
+    for r in results:
+        writes = r["db_writes_per_cycle"][1:] or r["db_writes_per_cycle"]
+        priced = r["priced_per_cycle"][1:] or r["priced_per_cycle"]
+        lines.append(
+            f"{r['symbols']:>8} {r['first_cycle_s']:>9.3f} {r['cycle_s']['mean']:>9.3f} "
+            f"{r['cycle_s']['p95']:>9.3f} {r['per_symbol_ms']:>8.3f} "
+            f"{statistics.fmean(priced):>7.0f} {statistics.fmean(writes):>10.0f} {r['rss_mb']['growth']:>9.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Trade cycle load test")
+    parser.add_argument("--symbols", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma separated watchlist sizes")
+    parser.add_argument("--cycles", type=int, default=DEFAULT_CYCLES)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="per exchange call")
+    parser.add_argument("--news-latency-ms", type=float, default=0.0)
+    parser.add_argument("--telegram-latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-orders", type=int, default=None,
+                        help="override MAX_ORDERS_PER_CYCLE")
+    parser.add_argument("--spans", action="store_true", help="include per-phase times")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="measure Python heap growth (slower)")
+    parser.add_argument("--json", action="store_true", help="print raw JSON")
+    parser.add_argument("--verbose", action="store_true", help="keep the bot's INFO logs")
+    args = parser.parse_args(argv)
+
+    if not args.verbose:
+        logging.getLogger("main").setLevel(logging.WARNING)
+        logging.getLogger().setLevel(logging.WARNING)
+
+    results = []
+    for size in (int(s) for s in args.symbols.split(",") if s.strip()):
+        results.append(
+            run_load(
+                size,
+                cycles=args.cycles,
+                latency_ms=args.latency_ms,
+                jitter_ms=args.jitter_ms,
+                news_latency_ms=args.news_latency_ms,
+                telegram_latency_ms=args.telegram_latency_ms,
+                seed=args.seed,
+                spans=args.spans,
+                trace_memory=args.trace_memory,
+                max_orders=args.max_orders,
+            )
+        )
+    print(json.dumps(results, indent=2) if args.json else format_results(results))
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
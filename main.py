@@ -4,18 +4,33 @@ import datetime
 import json
 import sqlite3
 import argparse
+import gzip
 import logging
+import secrets
 import string
+import contextlib
+import circuit
 import db
+import gateway
+import metrics
+import notifier
+import profiling
+import scheduler
+import webhook
 import requests
 import threading #Telegram two-way communication
+from concurrent.futures import ThreadPoolExecutor
+from collections.abc import Sequence
 # import math
 from dotenv import load_dotenv
-from binance.client import Client
+from strategies import registry as strategy_registry
 from strategies.base import Strategy
-from strategies.ma import MovingAverageCrossStrategy
-from strategies.rsi import RSIStrategy
-from risk import calculate_position_size
+from strategies.sentiment import SentimentScorer
+from risk import (
+    calculate_fee_adjusted_take_profit,
+    calculate_position_size,
+    update_trailing_stop,
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -45,6 +60,13 @@ def _getenv_float(name: str, default: float) -> float:
         )
         return default
 
+
+def _getenv_bool(name: str, default: bool) -> bool:
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
 def _require_env_vars(names):
     """Ensure required environment variables are present."""
     missing = [name for name in names if not os.getenv(name)]
@@ -53,36 +75,70 @@ def _require_env_vars(names):
             f"Missing required environment variables: {', '.join(missing)}"
         )
 
-# === Load environment ===
-load_dotenv()
-os.environ.setdefault("NEWSAPI_KEY", "dummy")
-_require_env_vars(
-    [
-        "TELEGRAM_TOKEN",
-        "TELEGRAM_CHAT_ID",
-        "BINANCE_API_KEY",
-        "BINANCE_SECRET_KEY",
-        "NEWSAPI_KEY",
-    ]
-)
+class _LazyProxy:
+    """Stand-in that builds its target on first attribute access.
+
+    Attribute reads and writes are forwarded, so module level objects such as
+    ``client`` and ``strategy`` can be patched and used as before while
+    importing this module stays free of network calls.
+    """
+
+    def __init__(self, factory):
+        object.__setattr__(self, "_lazy_factory", factory)
+        object.__setattr__(self, "_lazy_instance", None)
+
+    def _lazy_target(self):
+        instance = self._lazy_instance
+        if instance is None:
+            instance = self._lazy_factory()
+            object.__setattr__(self, "_lazy_instance", instance)
+        return instance
+
+    def _lazy_reset(self) -> None:
+        object.__setattr__(self, "_lazy_instance", None)
+
+    def __getattr__(self, name):
+        return getattr(self._lazy_target(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._lazy_target(), name, value)
+
+    def __delattr__(self, name):
+        delattr(self._lazy_target(), name)
 
-TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-BINANCE_KEY = os.getenv("BINANCE_API_KEY")
-BINANCE_SECRET = os.getenv("BINANCE_SECRET_KEY")
-NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 
-TRADING_MODE = os.getenv("TRADING_MODE", "spot").strip().lower()
+# === Environment ===
+# Settings read from the environment are assigned by _load_settings() on
+# import; bootstrap() loads ``.env``, re-reads and validates them.
+REQUIRED_ENV_VARS = [
+    "TELEGRAM_TOKEN",
+    "TELEGRAM_CHAT_ID",
+    "BINANCE_API_KEY",
+    "BINANCE_SECRET_KEY",
+    "NEWSAPI_KEY",
+]
 SUPPORTED_TRADING_MODES = {"spot", "margin"}
-if TRADING_MODE not in SUPPORTED_TRADING_MODES:
-    raise SystemExit(
-        "TRADING_MODE must be one of 'spot' or 'margin' (case-insensitive), "
-        f"got: {TRADING_MODE!r}"
-    )
 
-MARGIN_SIDE_EFFECT_TYPE = os.getenv("MARGIN_SIDE_EFFECT_TYPE", "").strip().upper()
 
-client = Client(BINANCE_KEY, BINANCE_SECRET)
+# Request weight ledger shared by every exchange call (see gateway.py)
+EXCHANGE_BUDGET = gateway.WeightBudget()
+
+
+def _create_client():
+    from binance.client import Client
+
+    return gateway.ExchangeGateway(Client(BINANCE_KEY, BINANCE_SECRET), EXCHANGE_BUDGET)
+
+
+client = _LazyProxy(_create_client)
+
+
+def _exchange_priority(level: str):
+    """Run the enclosed exchange calls at ``level`` when the client supports it."""
+
+    set_priority = getattr(client, "priority", None)
+    return set_priority(level) if callable(set_priority) else contextlib.nullcontext()
+
 
 LIVE_MODE = False
 START_BALANCE = 100.32  # Example starting balance
@@ -100,26 +156,33 @@ RISK_REWARD = 2.0
 FEE_RATE = 0.001
 MIN_EXIT_PNL_PCT =1.0
 MAX_ORDERS_PER_CYCLE = 1
-
-BALANCE_REMINDER_INTERVAL_SECONDS = _getenv_int(
-    "BALANCE_REMINDER_INTERVAL_SECONDS", 3 * 60 * 60
-)
-BALANCE_PRICE_SHIFT_THRESHOLD = _getenv_float(
-    "BALANCE_PRICE_SHIFT_THRESHOLD", 0.05
-)
-BALANCE_REMINDER_INTERVAL = datetime.timedelta(
-    seconds=BALANCE_REMINDER_INTERVAL_SECONDS
-)
+# Seconds between trading cycles
+CYCLE_SECONDS = 300
 
 QUIET_HOURS_START = 20  # 20:00
 QUIET_HOURS_END = 9  # 09:00
 
 LAST_BALANCE_REMINDER: datetime.datetime | None = None
 PRICE_BASELINE: dict[str, float] = {}
+# "SYMBOL:period" -> (atr, fetched_at epoch seconds)
+ATR_CACHE: dict[str, tuple[float, float]] = {}
+# Latency spans of the trade cycle; enabled via METRICS_ENABLED
+METRICS = metrics.Metrics()
+METRICS.add_collector(EXCHANGE_BUDGET.prometheus_lines)
+# Circuit breakers per external endpoint, shared by call_with_retries
+BREAKERS = circuit.BreakerRegistry()
+METRICS.add_collector(BREAKERS.prometheus_lines)
+# Thread-local absolute deadline (time.monotonic) set by call_deadline()
+_CALL_DEADLINE = threading.local()
+# On-demand cProfile of trade cycles and background stack sampling
+PROFILER = profiling.CycleProfiler()
+SAMPLER: profiling.StackSampler | None = None
+LAST_SNAPSHOT_AT = 0.0
 
 # In-memory record of trade actions awaiting manual confirmation via Telegram
 PENDING_DECISIONS: dict[str, dict] = {}
-PENDING_POLLS: dict[str, str] = {}
+# Compact decision id carried in the inline button callback data -> symbol
+DECISION_IDS: dict[str, str] = {}
 
 def is_within_quiet_hours(dt: datetime.datetime) -> bool:
     """Return True when the provided datetime falls within quiet hours."""
@@ -134,50 +197,6 @@ def is_within_quiet_hours(dt: datetime.datetime) -> bool:
 
     return current_minutes >= start_minutes or current_minutes < end_minutes
 
-def calculate_fee_adjusted_take_profit(
-    entry: float,
-    stop: float | None,
-    trail: float | None,
-    fee_rate: float,
-    risk_reward: float,
-    min_exit_pnl_pct: float,
-) -> float:
-    """Return a take-profit price that stays profitable after fees.
-
-    The helper keeps the original risk-reward target anchored at the entry
-    price, but adjusts it whenever the exchange fees would otherwise erase the
-    profit. The new stop price is used to measure the actual downside if the
-    stop were triggered after fees, ensuring the adjusted target still respects
-    the configured risk-reward multiple while guaranteeing that the realized
-    profit clears the configured ``min_exit_pnl_pct`` threshold on execution.
-    """
-
-    if stop is None:
-        stop = entry
-    if trail is None:
-        trail = stop
-
-    entry_cost = entry * (1 + fee_rate)
-    stop_value = stop * (1 - fee_rate)
-    risk_after_fees = max(entry_cost - stop_value, 0.0)
-    risk_distance = max(trail - stop, 0.0)
-
-    base_target = entry + risk_distance * risk_reward
-    required_profit = max(
-        risk_after_fees * risk_reward,
-        entry_cost * (min_exit_pnl_pct / 100.0),
-    )
-
-    net_profit = base_target * (1 - fee_rate) - entry_cost
-    if net_profit < required_profit:
-        base_target = (entry_cost + required_profit) / (1 - fee_rate)
-
-    return base_target
-
-# Volatility-based stop configuration
-STOP_ATR_PERIOD = int(os.getenv("STOP_ATR_PERIOD", "14"))
-STOP_ATR_MULT = float(os.getenv("STOP_ATR_MULT", "2.0"))
-
 # Default trading pairs used when no configuration is supplied
 DEFAULT_TRADING_PAIRS = [
     "BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT", "DOGEUSDT", "ENAUSDT",
@@ -225,58 +244,331 @@ def load_trading_pairs() -> list[str]:
     return DEFAULT_TRADING_PAIRS.copy()
 
 
-# Static list of symbols to monitor for trading opportunities
-WATCHLIST = load_trading_pairs()
+def _create_kline_store():
+    import klines
+
+    return klines.KlineStore(klines.KLINE_STORE_DIR)
+
+
+# Local kline store filled by ``python main.py download-klines``.  Stored 1m
+# closes seed the history on start-up when the newest candle is recent enough.
+KLINE_STORE = _LazyProxy(_create_kline_store)
 
 bad_words = ["lawsuit", "ban", "hack", "crash", "regulation", "investigation"]
  # good_words = ["surge", "rally", "gain", "partnership", "bullish", "upgrade", "adoption"] - relaxing the news filter so trades proceed unless negative words are detected
-# Strategy selection via environment variable
-STRATEGY_NAME = os.getenv("STRATEGY_NAME", "ma").lower()
+
+
+def _parse_strategy_weights(raw: str | None) -> dict[str, float]:
+    """Parse ``STRATEGY_WEIGHTS`` given as JSON or ``name=weight`` pairs."""
+
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        data = {}
+        for item in raw.split(","):
+            name, sep, value = item.partition("=")
+            if not sep:
+                continue
+            try:
+                data[name.strip()] = float(value)
+            except ValueError:
+                logger.warning("Invalid strategy weight %r ignored", item)
+    if not isinstance(data, dict):
+        return {}
+    return {str(k).strip().lower(): float(v) for k, v in data.items()}
+
+
+def _init_sentiment() -> SentimentScorer | None:
+    if not SENTIMENT_ENABLED:
+        return None
+    return SentimentScorer(
+        cache_size=SENTIMENT_CACHE_SIZE, max_workers=SENTIMENT_WORKERS
+    )
+
 
 def _init_strategy(name: str) -> Strategy:
-    if name == "ma":
-        return MovingAverageCrossStrategy(
-            bad_words=bad_words,
-            fee_rate=FEE_RATE,
-            min_pnl_pct=MIN_EXIT_PNL_PCT,
+    options = {
+        "bad_words": bad_words,
+        "fee_rate": FEE_RATE,
+        "min_pnl_pct": MIN_EXIT_PNL_PCT,
+    }
+    sentiment = _init_sentiment()
+    if sentiment is not None:
+        options.update(sentiment=sentiment, min_sentiment=SENTIMENT_MIN)
+    names = [n.strip() for n in name.split(",") if n.strip()]
+    if len(names) > 1:
+        return strategy_registry.create_ensemble(
+            names,
+            mode=STRATEGY_ENSEMBLE_MODE,
+            weights=_parse_strategy_weights(os.getenv("STRATEGY_WEIGHTS")),
+            threshold=STRATEGY_ENSEMBLE_THRESHOLD,
+            **options,
         )
-    if name == "rsi":
-        return RSIStrategy(
-            bad_words=bad_words,
-            fee_rate=FEE_RATE,
-            min_pnl_pct=MIN_EXIT_PNL_PCT,
+    return strategy_registry.create(name, **options)
+
+
+def _load_settings() -> None:
+    """Assign the environment driven settings to module globals."""
+
+    global TELEGRAM_TOKEN, TELEGRAM_CHAT_ID, BINANCE_KEY, BINANCE_SECRET, NEWSAPI_KEY
+    global TRADING_MODE, MARGIN_SIDE_EFFECT_TYPE
+    global BALANCE_REMINDER_INTERVAL_SECONDS, BALANCE_PRICE_SHIFT_THRESHOLD
+    global BALANCE_REMINDER_INTERVAL, MONTE_CARLO_SIMULATIONS, MONTE_CARLO_RUIN_PCT
+    global MONTE_CARLO_MAX_SIMULATIONS
+    global STOP_ATR_PERIOD, STOP_ATR_MULT, ATR_CACHE_TTL_SECONDS
+    global SNAPSHOT_FILE, SNAPSHOT_INTERVAL_SECONDS, SNAPSHOT_MAX_AGE_SECONDS
+    global WATCHLIST, KLINE_STORE_MAX_AGE, PRELOAD_WORKERS
+    global METRICS_FILE, METRICS_PORT, BINANCE_MAX_WEIGHT
+    global BREAKER_FAILURE_THRESHOLD, BREAKER_RESET_SECONDS, RETRY_MAX_DELAY
+    global CYCLE_BUDGET_SECONDS, NOTIFY_QUEUE_SIZE, NOTIFY_FLUSH_SECONDS
+    global NOTIFY_DIGEST_SECONDS, TELEGRAM_MESSAGES_PER_SECOND, TELEGRAM_BURST
+    global TELEGRAM_WEBHOOK_URL, TELEGRAM_WEBHOOK_HOST, TELEGRAM_WEBHOOK_PORT, TELEGRAM_WEBHOOK_SECRET
+    global PROFILE_DIR, PROFILE_CYCLES, PROFILE_SAMPLE_SECONDS, PROFILE_SAMPLE_INTERVAL_MS
+    global STRATEGY_NAME, STRATEGY_ENSEMBLE_MODE, STRATEGY_ENSEMBLE_THRESHOLD
+    global SENTIMENT_ENABLED, SENTIMENT_MIN, SENTIMENT_WORKERS, SENTIMENT_CACHE_SIZE
+
+    TELEGRAM_TOKEN = os.getenv("TELEGRAM_TOKEN")
+    TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+    BINANCE_KEY = os.getenv("BINANCE_API_KEY")
+    BINANCE_SECRET = os.getenv("BINANCE_SECRET_KEY")
+    NEWSAPI_KEY = os.getenv("NEWSAPI_KEY", "dummy")
+
+    TRADING_MODE = os.getenv("TRADING_MODE", "spot").strip().lower()
+    MARGIN_SIDE_EFFECT_TYPE = os.getenv("MARGIN_SIDE_EFFECT_TYPE", "").strip().upper()
+
+    BALANCE_REMINDER_INTERVAL_SECONDS = _getenv_int(
+        "BALANCE_REMINDER_INTERVAL_SECONDS", 3 * 60 * 60
+    )
+    BALANCE_PRICE_SHIFT_THRESHOLD = _getenv_float(
+        "BALANCE_PRICE_SHIFT_THRESHOLD", 0.05
+    )
+    BALANCE_REMINDER_INTERVAL = datetime.timedelta(
+        seconds=BALANCE_REMINDER_INTERVAL_SECONDS
+    )
+
+    # Monte Carlo bootstrap served by the MONTECARLO Telegram command
+    MONTE_CARLO_SIMULATIONS = _getenv_int("MONTE_CARLO_SIMULATIONS", 5000)
+    MONTE_CARLO_RUIN_PCT = _getenv_float("MONTE_CARLO_RUIN_PCT", 50.0)
+    # Upper bound for 'MC <n>' from Telegram; the run blocks command handling
+    MONTE_CARLO_MAX_SIMULATIONS = _getenv_int("MONTE_CARLO_MAX_SIMULATIONS", 50000)
+
+    # Volatility-based stop configuration
+    STOP_ATR_PERIOD = int(os.getenv("STOP_ATR_PERIOD", "14"))
+    STOP_ATR_MULT = float(os.getenv("STOP_ATR_MULT", "2.0"))
+    # ATR comes from 1h candles, so a fetched value stays usable for a while
+    ATR_CACHE_TTL_SECONDS = _getenv_int("ATR_CACHE_TTL_SECONDS", 1800)
+
+    # Warm-start snapshot of in-memory state (see save_snapshot)
+    SNAPSHOT_FILE = os.getenv("SNAPSHOT_FILE", "state_snapshot.json.gz")
+    SNAPSHOT_INTERVAL_SECONDS = _getenv_int("SNAPSHOT_INTERVAL_SECONDS", 900)
+    SNAPSHOT_MAX_AGE_SECONDS = _getenv_int("SNAPSHOT_MAX_AGE_SECONDS", 6 * 60 * 60)
+
+    # Static list of symbols to monitor for trading opportunities
+    WATCHLIST = load_trading_pairs()
+    KLINE_STORE_MAX_AGE = _getenv_int("KLINE_STORE_MAX_AGE", 600)
+    # Concurrent kline requests while preloading history on start-up
+    PRELOAD_WORKERS = _getenv_int("PRELOAD_WORKERS", 4)
+
+    # Cycle latency spans (see metrics.py); off by default
+    METRICS.enabled = _getenv_bool("METRICS_ENABLED", False)
+    METRICS_FILE = os.getenv("METRICS_FILE", "metrics.prom" if METRICS.enabled else "")
+    METRICS_PORT = _getenv_int("METRICS_PORT", 0)
+
+    # Binance request weight budget per minute shared by all exchange calls
+    BINANCE_MAX_WEIGHT = _getenv_int("BINANCE_MAX_WEIGHT", gateway.BINANCE_WEIGHT_LIMIT)
+    EXCHANGE_BUDGET.max_weight = BINANCE_MAX_WEIGHT
+
+    # Consecutive failures before an endpoint's circuit opens, the time it
+    # stays open before a probe, and the cap on a single retry sleep
+    BREAKER_FAILURE_THRESHOLD = _getenv_int(
+        "BREAKER_FAILURE_THRESHOLD", circuit.DEFAULT_FAILURE_THRESHOLD
+    )
+    BREAKER_RESET_SECONDS = _getenv_float("BREAKER_RESET_SECONDS", circuit.DEFAULT_RESET_TIMEOUT)
+    RETRY_MAX_DELAY = _getenv_float("RETRY_MAX_DELAY", circuit.DEFAULT_MAX_DELAY)
+    BREAKERS.failure_threshold = BREAKER_FAILURE_THRESHOLD
+    BREAKERS.reset_timeout = BREAKER_RESET_SECONDS
+
+    # Outbound Telegram queue: messages kept before merging/dropping and the
+    # time allowed to flush it at shutdown
+    NOTIFY_QUEUE_SIZE = _getenv_int("NOTIFY_QUEUE_SIZE", notifier.DEFAULT_QUEUE_SIZE)
+    NOTIFY_FLUSH_SECONDS = _getenv_float("NOTIFY_FLUSH_SECONDS", 10.0)
+    # Non-urgent messages within this window go out as one digest (0 = off);
+    # Telegram allows about one message per second per chat
+    NOTIFY_DIGEST_SECONDS = _getenv_float("NOTIFY_DIGEST_SECONDS", notifier.DEFAULT_DIGEST_WINDOW)
+    TELEGRAM_MESSAGES_PER_SECOND = _getenv_float(
+        "TELEGRAM_MESSAGES_PER_SECOND", notifier.DEFAULT_RATE
+    )
+    TELEGRAM_BURST = _getenv_int("TELEGRAM_BURST", notifier.DEFAULT_BURST)
+    # Webhook mode: Telegram posts updates to TELEGRAM_WEBHOOK_URL (public
+    # HTTPS, e.g. a reverse proxy) which forwards them to the local receiver;
+    # without a URL the bot long-polls getUpdates
+    TELEGRAM_WEBHOOK_URL = os.getenv("TELEGRAM_WEBHOOK_URL", "").strip()
+    TELEGRAM_WEBHOOK_HOST = os.getenv("TELEGRAM_WEBHOOK_HOST", "127.0.0.1")
+    TELEGRAM_WEBHOOK_PORT = _getenv_int("TELEGRAM_WEBHOOK_PORT", webhook.DEFAULT_PORT)
+    TELEGRAM_WEBHOOK_SECRET = os.getenv("TELEGRAM_WEBHOOK_SECRET", "")
+
+    # Time a trade cycle may spend before entry candidates are deferred
+    CYCLE_BUDGET_SECONDS = _getenv_float(
+        "CYCLE_BUDGET_SECONDS", CYCLE_SECONDS * scheduler.DEFAULT_BUDGET_FRACTION
+    )
+
+    # Profiling switches: cProfile the first N cycles and/or sample stacks
+    # for a number of seconds after start-up (see profiling.py)
+    PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+    PROFILE_CYCLES = _getenv_int("PROFILE_CYCLES", 0)
+    PROFILE_SAMPLE_SECONDS = _getenv_int("PROFILE_SAMPLE_SECONDS", 0)
+    PROFILE_SAMPLE_INTERVAL_MS = _getenv_int("PROFILE_SAMPLE_INTERVAL_MS", 10)
+    PROFILER.directory = PROFILE_DIR
+
+    # Strategy selection via environment variable.  A comma separated list (e.g.
+    # ``ma,rsi``) runs the named strategies as an ensemble.
+    STRATEGY_NAME = os.getenv("STRATEGY_NAME", "ma").lower()
+    STRATEGY_ENSEMBLE_MODE = os.getenv("STRATEGY_ENSEMBLE_MODE", "vote").strip().lower()
+    STRATEGY_ENSEMBLE_THRESHOLD = _getenv_float("STRATEGY_ENSEMBLE_THRESHOLD", 0.5)
+
+    # Optional headline sentiment stage (scores are cached across cycles/symbols)
+    SENTIMENT_ENABLED = _getenv_bool("SENTIMENT_ENABLED", False)
+    SENTIMENT_MIN = _getenv_float("SENTIMENT_MIN", 0.0)
+    SENTIMENT_WORKERS = _getenv_int("SENTIMENT_WORKERS", 4)
+    SENTIMENT_CACHE_SIZE = _getenv_int("SENTIMENT_CACHE_SIZE", 2048)
+
+
+def _validate_settings() -> None:
+    _require_env_vars(REQUIRED_ENV_VARS)
+    if TRADING_MODE not in SUPPORTED_TRADING_MODES:
+        raise SystemExit(
+            "TRADING_MODE must be one of 'spot' or 'margin' (case-insensitive), "
+            f"got: {TRADING_MODE!r}"
         )
-    raise ValueError(f"Unknown strategy '{name}'")
-    
 
 
-strategy: Strategy = _init_strategy(STRATEGY_NAME)
-# Initialise database
-db.init_db()
+_load_settings()
+strategy: Strategy = _LazyProxy(lambda: _init_strategy(STRATEGY_NAME))
 
-def call_with_retries(func, attempts=3, base_delay=1, name="request", alert=True):
-    """Call a function with retries and exponential backoff."""
-    for i in range(attempts):
-        try:
-            return func()
-        except Exception as e:
-            if i == attempts - 1:
-                msg = f"{name} failed after {attempts} attempts: {e}"
-                logger.error(msg)
-                if alert:
-                    try:
-                        send(f"⚠️ {msg}")
-                    except Exception as send_err:
-                        logger.error("Error sending alert: %s", send_err)
+
+def bootstrap(load_env: bool = True) -> None:
+    """Prepare the bot to run.
+
+    Importing this module only reads settings from the current environment;
+    the exchange client and strategy are created on first use and the
+    database tables on first query.  Entry points call ``bootstrap`` once to
+    load ``.env``, validate the configuration (exiting when required
+    variables are missing) and initialise the database up front.
+    """
+
+    if load_env:
+        load_dotenv()
+    os.environ.setdefault("NEWSAPI_KEY", "dummy")
+    _load_settings()
+    _validate_settings()
+    client._lazy_reset()
+    strategy._lazy_reset()
+    db.init_db()
+
+@contextlib.contextmanager
+def call_deadline(seconds: float | None):
+    """Bound every :func:`call_with_retries` in the enclosed block to ``seconds``.
+
+    Nested deadlines keep the earlier one.  The deadline is per thread.
+    """
+
+    previous = getattr(_CALL_DEADLINE, "at", None)
+    if seconds is not None:
+        at = time.monotonic() + seconds
+        _CALL_DEADLINE.at = at if previous is None else min(previous, at)
+    try:
+        yield
+    finally:
+        _CALL_DEADLINE.at = previous
+
+
+def call_with_retries(
+    func,
+    attempts=3,
+    base_delay=1,
+    name="request",
+    alert=True,
+    breaker: str | None = None,
+    deadline: float | None = None,
+    metric: str | None = None,
+):
+    """Call a function with retries and jittered exponential backoff.
+
+    ``breaker`` names the endpoint's circuit breaker: once it has seen
+    ``BREAKER_FAILURE_THRESHOLD`` consecutive failed attempts the call returns
+    ``None`` immediately until a probe succeeds.  ``deadline`` (seconds, or
+    the enclosing :func:`call_deadline`) bounds attempts and backoff sleeps;
+    a retry that would not fit is given up.
+
+    The whole call, retries included, is timed as a ``call`` span when
+    metrics are enabled.  It is labelled ``metric``, else the breaker name,
+    else ``name``; ``name`` may carry the symbol for log messages, but a
+    metric label per symbol would mean one series per watchlist entry.  Calls deferred by the exchange
+    gateway return ``None`` without retrying or alerting.
+    """
+    cb = BREAKERS.get(breaker) if breaker else None
+    end = getattr(_CALL_DEADLINE, "at", None)
+    if deadline is not None:
+        end = time.monotonic() + deadline if end is None else min(end, time.monotonic() + deadline)
+    def give_up(tries, error):
+        msg = f"{name} failed after {tries} attempts: {error}"
+        logger.error(msg)
+        if alert:
+            try:
+                send(f"⚠️ {msg}")
+            except Exception as send_err:
+                logger.error("Error sending alert: %s", send_err)
+
+    last_error = None
+    with METRICS.span(metric or breaker or name, kind="call"):
+        for i in range(attempts):
+            if cb is not None and not cb.allow():
+                if i == 0:
+                    logger.debug("%s skipped: %s circuit open", name, breaker)
+                else:
+                    # the circuit opened between our retries: report the
+                    # failure instead of going quiet
+                    give_up(i, last_error)
+                return None
+            try:
+                result = func()
+            except gateway.RequestDeferred as e:
+                # Retrying would only spend more of the scarce weight budget
+                if cb is not None:
+                    cb.release()
+                logger.info("%s: %s", name, e)
                 return None
-            time.sleep(base_delay * (2 ** i))
+            except Exception as e:
+                last_error = e
+                if cb is not None:
+                    cb.record_failure()
+                delay = circuit.backoff_delay(i, base_delay, RETRY_MAX_DELAY)
+                out_of_time = end is not None and time.monotonic() + delay > end
+                if i == attempts - 1 or out_of_time:
+                    give_up(i + 1, e)
+                    return None
+                time.sleep(delay)
+            else:
+                if cb is not None:
+                    cb.record_success()
+                return result
 
 def get_atr(symbol: str, period: int) -> float | None:
-    """Fetch Average True Range for ``symbol`` over ``period`` candles."""
+    """Fetch Average True Range for ``symbol`` over ``period`` candles.
+
+    Values are cached in ``ATR_CACHE`` for ``ATR_CACHE_TTL_SECONDS``.
+    """
+
+    key = f"{symbol}:{period}"
+    cached = ATR_CACHE.get(key)
+    if cached and time.time() - cached[1] < ATR_CACHE_TTL_SECONDS:
+        return cached[0]
 
     def _fetch():
         klines = client.get_klines(
-            symbol=symbol, interval=Client.KLINE_INTERVAL_1HOUR, limit=period + 1
+            symbol=symbol, interval="1h", limit=period + 1
         )
         if not klines or len(klines) < period + 1:
             return None
@@ -291,7 +583,10 @@ def get_atr(symbol: str, period: int) -> float | None:
             prev_close = close
         return sum(trs) / len(trs) if trs else None
 
-    return call_with_retries(_fetch, name=f"ATR {symbol}", alert=False)
+    atr = call_with_retries(_fetch, name=f"ATR {symbol}", alert=False, breaker="binance.klines")
+    if atr:
+        ATR_CACHE[key] = (atr, time.time())
+    return atr
 
 
 def get_stop_distance(symbol: str, price: float) -> float:
@@ -304,12 +599,111 @@ def get_stop_distance(symbol: str, price: float) -> float:
         return price * 0.02  # fallback to 2% if ATR unavailable
     return atr * mult
 
-def send(msg):
+# Keep-alive sessions per upstream host; see http_session()
+HTTP_POOL_SIZES = {"telegram": 4, "newsapi": 4}
+# (connect, read) timeouts in seconds per upstream
+HTTP_TIMEOUTS = {"telegram": (3.05, 10), "newsapi": (3.05, 10)}
+# Telegram long polling holds the request for up to 30 s
+TELEGRAM_POLL_TIMEOUT = (3.05, 35)
+# Updates the bot acts on, for getUpdates and setWebhook alike
+TELEGRAM_UPDATE_TYPES = ["message", "callback_query"]
+_HTTP_SESSIONS: dict[str, tuple[object, object]] = {}
+_HTTP_LOCK = threading.Lock()
+
+
+def http_session(upstream: str):
+    """Return the shared keep-alive session for ``upstream``.
+
+    Sessions are created on first use with a connection pool sized by
+    ``HTTP_POOL_SIZES`` so TCP and TLS handshakes are paid once per
+    connection instead of once per message.  A new session is built when
+    ``requests`` has been replaced (as the tests and load test do); stubs
+    without ``Session`` are used as is.
+    """
+
+    cached = _HTTP_SESSIONS.get(upstream)
+    if cached is not None and cached[0] is requests:
+        return cached[1]
+    with _HTTP_LOCK:
+        cached = _HTTP_SESSIONS.get(upstream)
+        if cached is not None and cached[0] is requests:
+            return cached[1]
+        factory = getattr(requests, "Session", None)
+        if factory is None:
+            session = requests
+        else:
+            session = factory()
+            size = HTTP_POOL_SIZES.get(upstream, 2)
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=size)
+            session.mount("https://", adapter)
+        _HTTP_SESSIONS[upstream] = (requests, session)
+        return session
+
+
+def close_http_sessions() -> None:
+    """Close the pooled sessions; the next request opens new ones."""
+
+    with _HTTP_LOCK:
+        sessions = list(_HTTP_SESSIONS.values())
+        _HTTP_SESSIONS.clear()
+    for module, session in sessions:
+        if session is not module:
+            try:
+                session.close()
+            except Exception as exc:
+                logger.debug("Closing HTTP session failed: %s", exc)
+
+
+# Per-chat Telegram rate limit shared by messages and polls
+TELEGRAM_BUCKET = notifier.TokenBucket(TELEGRAM_MESSAGES_PER_SECOND, TELEGRAM_BURST)
+
+
+def _telegram_post(method: str, data: dict, limited: bool = True):
+    """POST ``data`` to the Bot API ``method`` within the chat's rate limit.
+
+    A 429 answer pauses the bucket for its ``retry_after`` and raises so that
+    :func:`call_with_retries` tries again.  ``limited=False`` skips the bucket
+    for calls that post nothing to the chat (``answerCallbackQuery``).
+    """
+
+    if limited:
+        TELEGRAM_BUCKET.acquire()
+    url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/{method}"
+    resp = http_session("telegram").post(url, data=data, timeout=HTTP_TIMEOUTS["telegram"])
+    if getattr(resp, "status_code", None) == 429:
+        try:
+            retry_after = float(resp.json()["parameters"]["retry_after"])
+        except Exception:
+            retry_after = 1.0
+        TELEGRAM_BUCKET.pause(retry_after)
+        raise RuntimeError(f"Telegram rate limited; retry after {retry_after:.0f}s")
+    return resp
+
+
+def _deliver_message(msg) -> bool:
+    """Post ``msg`` to the Telegram chat; return whether it was delivered."""
+
     def _send():
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendMessage"
-        requests.post(url, data={"chat_id": TELEGRAM_CHAT_ID, "text": msg}, timeout=10)
+        _telegram_post("sendMessage", {"chat_id": TELEGRAM_CHAT_ID, "text": msg})
+        return True
+
+    return call_with_retries(_send, name="Telegram", alert=False, breaker="telegram") is not None
+
+
+# Outbound messages; main() starts the background sender, until then (and in
+# one-shot commands) send() delivers synchronously
+NOTIFIER = notifier.Notifier(_deliver_message, digest_window=NOTIFY_DIGEST_SECONDS)
+METRICS.add_collector(NOTIFIER.prometheus_lines)
+
 
-    call_with_retries(_send, name="Telegram", alert=False)
+def send(msg, urgent: bool = False):
+    """Send ``msg`` to Telegram without waiting once the notifier is running.
+
+    Non-urgent messages are combined into a digest every
+    ``NOTIFY_DIGEST_SECONDS``; ``urgent`` ones go out first and on their own.
+    """
+
+    NOTIFIER.submit(msg, urgent=urgent)
 
 def send_poll(question, options, **kwargs):
     """Send a poll message to the configured Telegram chat.
@@ -323,14 +717,13 @@ def send_poll(question, options, **kwargs):
     """
 
     def _send():
-        url = f"https://api.telegram.org/bot{TELEGRAM_TOKEN}/sendPoll"
         data = {
             "chat_id": TELEGRAM_CHAT_ID,
             "question": question,
             "options": json.dumps(options),
         }
         data.update(kwargs)
-        resp = requests.post(url, data=data, timeout=10)
+        resp = _telegram_post("sendPoll", data)
         try:
             resp.raise_for_status()
         except AttributeError:
@@ -344,7 +737,7 @@ def send_poll(question, options, **kwargs):
         except Exception:
             return None
 
-    result = call_with_retries(_send, name="Telegram", alert=False)
+    result = call_with_retries(_send, name="Telegram", alert=False, breaker="telegram")
     if isinstance(result, dict):
         poll = result.get("result", {}).get("poll") or result.get("poll")
         if isinstance(poll, dict):
@@ -352,35 +745,103 @@ def send_poll(question, options, **kwargs):
     return None
 
 
+def _telegram_call(method: str, data: dict, limited: bool = True):
+    """Call the Bot API ``method`` with retries; return the decoded answer."""
+
+    def _call():
+        resp = _telegram_post(method, data, limited=limited)
+        try:
+            resp.raise_for_status()
+        except AttributeError:
+            pass
+        try:
+            return resp.json()
+        except Exception:
+            return None
+
+    return call_with_retries(_call, name="Telegram", alert=False, breaker="telegram")
+
+
+def send_confirmation(text: str, decision_id: str):
+    """Send ``text`` with Confirm/Decline buttons; return the message id.
+
+    The buttons carry ``confirm:<id>`` / ``decline:<id>`` as callback data,
+    which :func:`_handle_callback_query` resolves through ``DECISION_IDS``.
+    """
+
+    keyboard = {
+        "inline_keyboard": [
+            [
+                {"text": "✅ Confirm", "callback_data": f"confirm:{decision_id}"},
+                {"text": "❌ Decline", "callback_data": f"decline:{decision_id}"},
+            ]
+        ]
+    }
+    answer = _telegram_call(
+        "sendMessage",
+        {"chat_id": TELEGRAM_CHAT_ID, "text": text, "reply_markup": json.dumps(keyboard)},
+    )
+    try:
+        return answer["result"]["message_id"]
+    except (KeyError, TypeError):
+        return None
+
+
+def edit_confirmation(decision: dict, text: str) -> bool:
+    """Replace a decision's prompt (and its buttons) with ``text``."""
+
+    message_id = decision.get("message_id")
+    if message_id is None:
+        return False
+    answer = _telegram_call(
+        "editMessageText",
+        {"chat_id": TELEGRAM_CHAT_ID, "message_id": message_id, "text": text},
+    )
+    return answer is not None
+
+
 def _store_pending_decision(decision: dict, question: str) -> None:
-    """Persist a pending trade decision and notify the operator."""
+    """Persist a pending trade decision and ask the operator to confirm it."""
 
     symbol = decision["symbol"]
     if symbol in PENDING_DECISIONS:
         logger.info("⏳ Awaiting existing decision for %s", symbol)
         return
 
-    poll_id = send_poll(
-        question,
-        ["Confirm", "Decline"],
-        is_anonymous=False,
-    )
-    if poll_id:
-        decision["poll_id"] = poll_id
-        PENDING_POLLS[poll_id] = symbol
-
+    # random rather than a counter, so buttons left over from an earlier run
+    # never match a new decision
+    decision_id = secrets.token_urlsafe(6)
+    decision["id"] = decision_id
     PENDING_DECISIONS[symbol] = decision
+    DECISION_IDS[decision_id] = symbol
     action = decision["action"].upper()
     price = decision["price"]
-    send(
+    # Sent by the notifier thread so trade() never waits on Telegram; the
+    # message id arrives with the future, before any queued edit runs
+    prompt = NOTIFIER.call(
+        send_confirmation,
         (
-            f"🤔 {action} {symbol} at ${price:.2f}? Reply 'CONFIRM {symbol}' or 'DECLINE {symbol}' or answer the poll."
+            f"🤔 {question}\n{action} {symbol} at ${price:.2f}: tap a button or reply 'CONFIRM {symbol}' or 'DECLINE {symbol}'."
             "\n💡 Reply 'BALANCE' or '/balance' any time to see the latest wallet summary."
-        )
+        ),
+        decision_id,
     )
+    prompt.add_done_callback(lambda done: _note_prompt(decision, done))
     logger.info("🤔 Pending %s decision for %s", action, symbol)
 
 
+def _note_prompt(decision: dict, done) -> None:
+    if done.exception() is None and done.result() is not None:
+        decision["message_id"] = done.result()
+
+
+def _close_prompt(decision: dict, text: str, fallback: bool = False) -> None:
+    """Edit the decision's prompt to ``text``; with ``fallback`` send it if that fails."""
+
+    if not edit_confirmation(decision, text) and fallback:
+        send(text)
+
+
 def finalize_pending_decision(symbol: str, approved: bool) -> bool:
     """Execute or clear a pending decision once the user responds.
 
@@ -392,16 +853,17 @@ def finalize_pending_decision(symbol: str, approved: bool) -> bool:
         logger.info("ℹ️ No pending decision for %s", symbol)
         return False
 
-    poll_id = decision.get("poll_id")
-    if poll_id:
-        PENDING_POLLS.pop(poll_id, None)
+    DECISION_IDS.pop(decision.get("id"), None)
+    action = decision["action"].upper()
+    price = decision["price"]
 
     if approved:
+        NOTIFIER.call(_close_prompt, decision, f"✅ Confirmed {action} {symbol} at ${price:.2f}")
         _execute_decision(decision)
     else:
-        action = decision["action"].upper()
-        price = decision["price"]
-        send(f"🚫 Declined {action} {symbol} at ${price:.2f}")
+        NOTIFIER.call(
+            _close_prompt, decision, f"🚫 Declined {action} {symbol} at ${price:.2f}", True
+        )
         logger.info("🚫 Declined %s %s", action, symbol)
     return True
 
@@ -498,7 +960,8 @@ def _execute_decision(decision: dict) -> None:
         )
     elif reason == "stop_loss":
         send(
-            f"🛑 STOP {symbol} at ${price:.2f} — PnL: ${profit:.2f} USDT ({pnl:.2f}%) | Balance: ${binance_usdt:.2f} — {now}"
+            f"🛑 STOP {symbol} at ${price:.2f} — PnL: ${profit:.2f} USDT ({pnl:.2f}%) | Balance: ${binance_usdt:.2f} — {now}",
+            urgent=True,
         )
         logger.info(
             "🛑 STOP %s at $%.2f | PnL: $%.2f USDT (%.2f%%)",
@@ -525,18 +988,34 @@ def _execute_decision(decision: dict) -> None:
     )
 
 
-def _handle_poll_answer(update: dict) -> None:
-    poll_id = update.get("poll_id")
-    if not poll_id:
-        return
-    symbol = PENDING_POLLS.get(poll_id)
-    if not symbol:
+def _answer_callback(query: dict, text: str) -> None:
+    """Acknowledge a button press so Telegram stops showing a spinner."""
+
+    if query.get("id") is None:
         return
-    option_ids = update.get("option_ids") or []
-    if not option_ids:
+    _telegram_call(
+        "answerCallbackQuery",
+        {"callback_query_id": query["id"], "text": text},
+        limited=False,
+    )
+
+
+def _handle_callback_query(query: dict) -> None:
+    """Resolve the pending decision behind a Confirm/Decline button."""
+
+    chat_id = (query.get("message") or {}).get("chat", {}).get("id")
+    action, _, decision_id = (query.get("data") or "").partition(":")
+    symbol = None
+    if str(chat_id) == str(TELEGRAM_CHAT_ID) and action in {"confirm", "decline"}:
+        symbol = DECISION_IDS.get(decision_id)
+    if symbol is None:
+        _answer_callback(query, "ℹ️ This decision is no longer pending")
         return
-    approved = option_ids[0] == 0
+    approved = action == "confirm"
+    _answer_callback(query, "✅ Confirmed" if approved else "🚫 Declined")
     finalize_pending_decision(symbol, approved)
+
+
 def normalize_command_token(token: str | None) -> str:
     """Return a normalized command keyword from a Telegram message token."""
 
@@ -575,9 +1054,193 @@ def normalize_command_token(token: str | None) -> str:
     return cleaned.upper()
 
 
-def poll_telegram_commands():
-    """Listen for manual trade commands sent via Telegram."""
+def handle_telegram_update(update: dict) -> None:
+    """Act on one Telegram update: a button press or a chat command.
+
+    Shared by the ``getUpdates`` poller and the webhook receiver.
+    """
     global SIM_USDT_BALANCE
+    if "callback_query" in update:
+        _handle_callback_query(update["callback_query"])
+        return
+    msg = update.get("message", {})
+    chat_id = msg.get("chat", {}).get("id")
+    if str(chat_id) != str(TELEGRAM_CHAT_ID):
+        return
+
+    text = (msg.get("text") or "").strip()
+    parts = text.split()
+    if not parts:
+        return
+    cmd = normalize_command_token(parts[0])
+    if not cmd:
+        return
+
+    if cmd in {"CONFIRM", "DECLINE"}:
+        if len(parts) < 2:
+            send("⚠️ Provide the symbol, e.g. 'CONFIRM BTCUSDT'.")
+            return
+        symbol = parts[1].upper()
+        approved = cmd == "CONFIRM"
+        if not finalize_pending_decision(symbol, approved):
+            send(f"ℹ️ No pending decision for {symbol}")
+        return
+
+    if cmd == "BALANCE":
+        send_balance_breakdown()
+        return
+
+    if cmd in {"MONTECARLO", "MC"}:
+        sims = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+        if sims is not None and sims > MONTE_CARLO_MAX_SIMULATIONS:
+            send(
+                f"ℹ️ {sims} simulations is above the limit; running {MONTE_CARLO_MAX_SIMULATIONS}."
+            )
+            sims = MONTE_CARLO_MAX_SIMULATIONS
+        send_monte_carlo_report(sims)
+        return
+
+    if cmd == "PROFILE":
+        send(handle_profile_command(parts[1:]))
+        return
+
+    if len(parts) < 2:
+        send_poll("Select action", ["BUY", "SELL"])
+        return
+
+    symbol = parts[1].upper()
+
+    if cmd == "BUY":
+        price = get_price(symbol)
+        if not price or price <= 0:
+            send(f"⚠️ Invalid price for {symbol}")
+            return
+
+        positions = db.get_open_positions()
+        balance = load_json(
+            BALANCE_FILE,
+            {"usdt": START_BALANCE, "total": START_BALANCE},
+        )
+        binance_usdt = get_usdt_balance()
+        if binance_usdt <= 0:
+            binance_usdt = balance.get("usdt", START_BALANCE)
+        
+        stop_distance = get_stop_distance(symbol, price)
+        qty, stop_loss, reason = calculate_position_size(
+            binance_usdt,
+            price,
+            RISK_PER_TRADE,
+            stop_distance,
+            MIN_TRADE_USDT,
+            MAX_TRADE_USDT,
+            fee_rate=FEE_RATE,
+        )
+
+        if qty <= 0:
+            send(f"⚠️ Unable to size position for {symbol}: {reason}")
+            return
+
+        actual_cost = qty * price * (1 + FEE_RATE)
+        if actual_cost > binance_usdt:
+            send(f"⚠️ Insufficient balance for {symbol}")
+            return
+        stop_distance = price - stop_loss if stop_loss is not None else stop_distance
+        take_profit = price + (
+            stop_distance
+            + price * FEE_RATE
+            + (price + stop_distance) * FEE_RATE
+        ) * RISK_REWARD
+
+        place_order(symbol, "buy", qty)
+        trade_id = db.log_trade(symbol, "BUY", qty, price)
+        db.upsert_position(
+            symbol,
+            qty,
+            price,
+            stop_loss,
+            take_profit,
+            trade_id,
+            price,
+            stop_distance,
+        )
+        
+        positions[symbol] = {
+            "qty": qty,
+            "entry": price,
+            "stop_loss": stop_loss,
+            "take_profit": take_profit,
+            "trail_price": price,
+            "trade_id": trade_id,
+            "stop_distance": stop_distance,
+        }
+        if not LIVE_MODE:
+            SIM_USDT_BALANCE -= actual_cost
+            client.get_asset_balance = lambda asset: {"free": str(SIM_USDT_BALANCE)}
+        price_cache = {symbol: price}
+        update_balance(balance, positions, price_cache)
+        binance_usdt = balance["usdt"]
+        send(
+            f"🟢 BUY {qty} {symbol} at ${price:.2f} — Cost: ${actual_cost:.2f} — Balance: ${binance_usdt:.2f}"
+        )
+
+    elif cmd == "SELL":
+        if len(parts) != 3:
+            send("❓ SELL requires quantity")
+            return
+        try:
+            qty = float(parts[2])
+        except ValueError:
+            send("❓ Quantity must be numeric")
+            return
+
+        positions = db.get_open_positions()
+        if symbol not in positions:
+            send(f"⚠️ No open position for {symbol}")
+            return
+        pos = positions[symbol]
+        if abs(pos["qty"] - qty) > 1e-6:
+            send(
+                f"⚠️ Position size {pos['qty']} {symbol}, cannot sell {qty}"
+            )
+            return
+
+        price = get_price(symbol)
+        if not price or price <= 0:
+            send(f"⚠️ Invalid price for {symbol}")
+            return
+
+        place_order(symbol, "sell", qty)
+        balance = load_json(
+            BALANCE_FILE,
+            {"usdt": START_BALANCE, "total": START_BALANCE},
+        )
+
+        entry_cost = pos["entry"] * qty * (1 + FEE_RATE)
+        sell_value = qty * price * (1 - FEE_RATE)
+        profit = sell_value - entry_cost
+        
+        pnl_pct = profit / entry_cost * 100 if entry_cost else 0
+        
+        trade_id = pos.get("trade_id")
+        db.update_trade_pnl(trade_id, profit, profit, pnl_pct)
+        db.remove_position(symbol)
+        del positions[symbol]
+        price_cache = {symbol: price}
+        if not LIVE_MODE:
+            SIM_USDT_BALANCE += sell_value
+            client.get_asset_balance = lambda asset: {"free": str(SIM_USDT_BALANCE)}
+        update_balance(balance, positions, price_cache)
+        binance_usdt = balance["usdt"]
+        send(
+            f"🔴 SELL {qty} {symbol} at ${price:.2f} — PnL: ${profit:.2f} USDT ({pnl_pct:.2f}%) — Balance: ${binance_usdt:.2f}"
+        )
+
+    else:
+        send_poll("Unknown command", ["BUY", "SELL"])
+
+
+def poll_telegram_commands():
+    """Listen for manual trade commands sent via Telegram (long polling)."""
     offset = 0
     while True:
         try:
@@ -585,193 +1248,78 @@ def poll_telegram_commands():
             params = {
                 "timeout": 30,
                 "offset": offset,
-                "allowed_updates": ["message", "poll_answer", "poll"],
+                "allowed_updates": TELEGRAM_UPDATE_TYPES,
             }
-            resp = requests.get(url, params=params, timeout=35)
+            resp = http_session("telegram").get(url, params=params, timeout=TELEGRAM_POLL_TIMEOUT)
             data = resp.json()
+            if data.get("ok") is False:
+                if data.get("error_code") == 409:
+                    # a webhook left over from webhook mode blocks getUpdates
+                    _telegram_call("deleteWebhook", {}, limited=False)
+                raise RuntimeError(data.get("description") or "getUpdates failed")
 
+            # getUpdates itself waits for news, so poll again straight away
             for update in data.get("result", []):
                 offset = update["update_id"] + 1
-                if "poll_answer" in update:
-                    _handle_poll_answer(update["poll_answer"])
-                    continue
-                poll = update.get("poll")
-                if poll:
-                    poll_id = poll.get("id")
-                    if poll_id is not None:
-                        symbol = PENDING_POLLS.get(poll_id) or PENDING_POLLS.get(
-                            str(poll_id)
-                        )
-                        if symbol:
-                            options = poll.get("options") or []
-                            if options and (options[0].get("voter_count") or 0) > 0:
-                                finalize_pending_decision(symbol, True)
-                                continue
-                msg = update.get("message", {})
-                chat_id = msg.get("chat", {}).get("id")
-                if str(chat_id) != str(TELEGRAM_CHAT_ID):
-                    continue
+                try:
+                    handle_telegram_update(update)
+                except Exception as e:
+                    logger.error("Telegram update error: %s", e)
 
-                text = (msg.get("text") or "").strip()
-                parts = text.split()
-                if not parts:
-                    continue
-                cmd = normalize_command_token(parts[0])
-                if not cmd:
-                    continue
+        except Exception as e:
+            logger.error("Telegram poll error: %s", e)
+            time.sleep(1)
 
-                if cmd in {"CONFIRM", "DECLINE"}:
-                    if len(parts) < 2:
-                        send("⚠️ Provide the symbol, e.g. 'CONFIRM BTCUSDT'.")
-                        continue
-                    symbol = parts[1].upper()
-                    approved = cmd == "CONFIRM"
-                    if not finalize_pending_decision(symbol, approved):
-                        send(f"ℹ️ No pending decision for {symbol}")
-                    continue
 
-                if cmd == "BALANCE":
-                    send_balance_breakdown()
-                    continue
+def start_webhook():
+    """Start the webhook receiver and register it with Telegram.
 
-                if len(parts) < 2:
-                    send_poll("Select action", ["BUY", "SELL"])
-                    continue
+    Returns the running :class:`webhook.WebhookServer`, or ``None`` when the
+    receiver cannot listen or Telegram refuses the URL.
+    """
 
-                symbol = parts[1].upper()
+    secret = TELEGRAM_WEBHOOK_SECRET or secrets.token_urlsafe(32)
+    receiver = webhook.WebhookServer(
+        handle_telegram_update,
+        secret=secret,
+        host=TELEGRAM_WEBHOOK_HOST,
+        port=TELEGRAM_WEBHOOK_PORT,
+    )
+    try:
+        receiver.start()
+    except OSError as exc:
+        logger.error("Webhook receiver failed to start: %s", exc)
+        return None
+    answer = _telegram_call(
+        "setWebhook",
+        {
+            "url": TELEGRAM_WEBHOOK_URL,
+            "secret_token": secret,
+            "allowed_updates": json.dumps(TELEGRAM_UPDATE_TYPES),
+        },
+        limited=False,
+    )
+    if not isinstance(answer, dict) or not answer.get("ok"):
+        logger.error("Telegram refused webhook %s: %s", TELEGRAM_WEBHOOK_URL, answer)
+        receiver.stop()
+        return None
+    return receiver
 
-                if cmd == "BUY":
-                    price = get_price(symbol)
-                    if not price or price <= 0:
-                        send(f"⚠️ Invalid price for {symbol}")
-                        continue
 
-                    positions = db.get_open_positions()
-                    balance = load_json(
-                        BALANCE_FILE,
-                        {"usdt": START_BALANCE, "total": START_BALANCE},
-                    )
-                    binance_usdt = get_usdt_balance()
-                    if binance_usdt <= 0:
-                        binance_usdt = balance.get("usdt", START_BALANCE)
-                    
-                    stop_distance = get_stop_distance(symbol, price)
-                    qty, stop_loss, reason = calculate_position_size(
-                        binance_usdt,
-                        price,
-                        RISK_PER_TRADE,
-                        stop_distance,
-                        MIN_TRADE_USDT,
-                        MAX_TRADE_USDT,
-                        fee_rate=FEE_RATE,
-                    )
-
-                    if qty <= 0:
-                        send(f"⚠️ Unable to size position for {symbol}: {reason}")
-                        continue
-
-                    actual_cost = qty * price * (1 + FEE_RATE)
-                    if actual_cost > binance_usdt:
-                        send(f"⚠️ Insufficient balance for {symbol}")
-                        continue
-                    stop_distance = price - stop_loss if stop_loss is not None else stop_distance
-                    take_profit = price + (
-                        stop_distance
-                        + price * FEE_RATE
-                        + (price + stop_distance) * FEE_RATE
-                    ) * RISK_REWARD
-
-                    place_order(symbol, "buy", qty)
-                    trade_id = db.log_trade(symbol, "BUY", qty, price)
-                    db.upsert_position(
-                        symbol,
-                        qty,
-                        price,
-                        stop_loss,
-                        take_profit,
-                        trade_id,
-                        price,
-                        stop_distance,
-                    )
-                    
-                    positions[symbol] = {
-                        "qty": qty,
-                        "entry": price,
-                        "stop_loss": stop_loss,
-                        "take_profit": take_profit,
-                        "trail_price": price,
-                        "trade_id": trade_id,
-                        "stop_distance": stop_distance,
-                    }
-                    if not LIVE_MODE:
-                        SIM_USDT_BALANCE -= actual_cost
-                        client.get_asset_balance = lambda asset: {"free": str(SIM_USDT_BALANCE)}
-                    price_cache = {symbol: price}
-                    update_balance(balance, positions, price_cache)
-                    binance_usdt = balance["usdt"]
-                    send(
-                        f"🟢 BUY {qty} {symbol} at ${price:.2f} — Cost: ${actual_cost:.2f} — Balance: ${binance_usdt:.2f}"
-                    )
+def start_telegram_listener():
+    """Receive Telegram updates via webhook if configured, else long polling.
 
-                elif cmd == "SELL":
-                    if len(parts) != 3:
-                        send("❓ SELL requires quantity")
-                        continue
-                    try:
-                        qty = float(parts[2])
-                    except ValueError:
-                        send("❓ Quantity must be numeric")
-                        continue
-
-                    positions = db.get_open_positions()
-                    if symbol not in positions:
-                        send(f"⚠️ No open position for {symbol}")
-                        continue
-                    pos = positions[symbol]
-                    if abs(pos["qty"] - qty) > 1e-6:
-                        send(
-                            f"⚠️ Position size {pos['qty']} {symbol}, cannot sell {qty}"
-                        )
-                        continue
-
-                    price = get_price(symbol)
-                    if not price or price <= 0:
-                        send(f"⚠️ Invalid price for {symbol}")
-                        continue
-
-                    place_order(symbol, "sell", qty)
-                    balance = load_json(
-                        BALANCE_FILE,
-                        {"usdt": START_BALANCE, "total": START_BALANCE},
-                    )
-
-                    entry_cost = pos["entry"] * qty * (1 + FEE_RATE)
-                    sell_value = qty * price * (1 - FEE_RATE)
-                    profit = sell_value - entry_cost
-                    
-                    pnl_pct = profit / entry_cost * 100 if entry_cost else 0
-                    
-                    trade_id = pos.get("trade_id")
-                    db.update_trade_pnl(trade_id, profit, profit, pnl_pct)
-                    db.remove_position(symbol)
-                    del positions[symbol]
-                    price_cache = {symbol: price}
-                    if not LIVE_MODE:
-                        SIM_USDT_BALANCE += sell_value
-                        client.get_asset_balance = lambda asset: {"free": str(SIM_USDT_BALANCE)}
-                    update_balance(balance, positions, price_cache)
-                    binance_usdt = balance["usdt"]
-                    send(
-                        f"🔴 SELL {qty} {symbol} at ${price:.2f} — PnL: ${profit:.2f} USDT ({pnl_pct:.2f}%) — Balance: ${binance_usdt:.2f}"
-                    )
-
-                else:
-                    send_poll("Unknown command", ["BUY", "SELL"])
+    Returns the webhook receiver when one is running, for shutdown.
+    """
 
-        except Exception as e:
-            logger.error("Telegram poll error: %s", e)
+    if TELEGRAM_WEBHOOK_URL:
+        receiver = start_webhook()
+        if receiver is not None:
+            return receiver
+        logger.warning("Falling back to getUpdates long polling")
+    threading.Thread(target=poll_telegram_commands, daemon=True).start()
+    return None
 
-        time.sleep(1)
 
 def load_json(path, default):
     try:
@@ -885,6 +1433,49 @@ def send_balance_breakdown() -> None:
     message = format_balance_breakdown(summary)
     send(message)
 
+def send_monte_carlo_report(simulations: int | None = None) -> dict:
+    """Bootstrap the closed trades and deliver the risk summary to Telegram."""
+
+    import montecarlo
+
+    balance = load_json(BALANCE_FILE, {"usdt": START_BALANCE, "total": START_BALANCE})
+    result = montecarlo.bootstrap(
+        db.get_closed_trade_profits(),
+        balance.get("total") or START_BALANCE,
+        simulations=simulations or MONTE_CARLO_SIMULATIONS,
+        ruin_pct=MONTE_CARLO_RUIN_PCT,
+    )
+    send(montecarlo.format_report(result))
+    return result
+
+def start_stack_sampler(seconds: float) -> profiling.StackSampler | None:
+    """Sample all thread stacks for ``seconds``; report the file on Telegram."""
+
+    global SAMPLER
+    if SAMPLER is not None and SAMPLER.running:
+        return None
+    SAMPLER = profiling.StackSampler(
+        seconds,
+        interval=PROFILE_SAMPLE_INTERVAL_MS / 1000,
+        directory=PROFILE_DIR,
+        on_done=lambda path: send(f"🧪 Stack samples saved to {path}"),
+    ).start()
+    return SAMPLER
+
+
+def handle_profile_command(args) -> str:
+    """Handle ``PROFILE [cycles]`` and ``PROFILE SAMPLE [seconds]``."""
+
+    if args and args[0].upper() == "SAMPLE":
+        seconds = int(args[1]) if len(args) > 1 and args[1].isdigit() else 60
+        if start_stack_sampler(seconds) is None:
+            return "ℹ️ A stack sampler is already running."
+        return f"🧪 Sampling thread stacks for {seconds}s."
+    cycles = int(args[0]) if args and args[0].isdigit() else 1
+    PROFILER.arm(cycles)
+    return f"🧪 Profiling the next {PROFILER.remaining} trade cycle(s)."
+
+
 def maybe_send_balance_reminder(
     total: float,
     binance_usdt: float,
@@ -975,7 +1566,7 @@ def get_usdt_balance():
             return _get_margin_balance()
         return _get_spot_balance()
 
-    bal = call_with_retries(_get, name="Binance USDT balance")
+    bal = call_with_retries(_get, name="Binance USDT balance", breaker="binance.account")
 
     if LIVE_MODE:
         return bal if bal is not None else 0.0
@@ -1006,7 +1597,7 @@ def get_price(symbol):
         def _fetch():
             return float(client.get_symbol_ticker(symbol=symbol)["price"])
 
-        price = call_with_retries(_fetch, name=f"Binance price {symbol}")
+        price = call_with_retries(_fetch, name=f"Binance price {symbol}", breaker="binance.ticker")
     if price is not None:
         save_price(symbol, price)
     return price
@@ -1015,7 +1606,7 @@ def fetch_historical_prices(symbol: str, limit: int) -> list[float]:
     """Fetch recent historical closing prices for ``symbol``.
 
     The Binance 1-minute klines endpoint is queried and the closing price from
-    each candle is stored in ``prices.db`` via :func:`save_price`. The returned
+    each candle is stored in ``prices.db`` via :func:`save_prices`. The returned
     list contains up to ``limit`` prices ordered oldest to newest. Network
     errors are handled via :func:`call_with_retries`.
     """
@@ -1023,20 +1614,15 @@ def fetch_historical_prices(symbol: str, limit: int) -> list[float]:
     def _fetch() -> list[tuple[int, float]]:
         klines = client.get_klines(
             symbol=symbol,
-            interval=Client.KLINE_INTERVAL_1MINUTE,
+            interval="1m",
             limit=limit,
         )
         return [(int(k[0]), float(k[4])) for k in klines]
 
-    data = call_with_retries(_fetch, name=f"Binance klines {symbol}") or []
-    prices: list[float] = []
-    for ts_ms, price in data:
-        ts = datetime.datetime.fromtimestamp(ts_ms / 1000, tz=datetime.timezone.utc).strftime(
-            "%Y-%m-%d %H:%M:%S"
-        )
-        save_price(symbol, price, ts)
-        prices.append(price)
-    return prices
+    data = call_with_retries(_fetch, name=f"Binance klines {symbol}", breaker="binance.klines") or []
+    rows = [(_utc_timestamp(ts_ms / 1000), price) for ts_ms, price in data]
+    save_prices(symbol, rows)
+    return [price for _, price in rows]
     
 def place_order(symbol, side, qty):
     def _order():
@@ -1052,7 +1638,9 @@ def place_order(symbol, side, qty):
             return client.create_margin_order(**params)
         return client.create_order(**params)
     if LIVE_MODE:
-        return call_with_retries(_order, name=f"Binance order {symbol}")
+        # No breaker: rejected orders (e.g. insufficient balance) must not
+        # block the exits of other positions
+        return call_with_retries(_order, name=f"Binance order {symbol}", metric="binance.order")
     else:
         logger.info("[SIMULATED %s] %s %s %s", TRADING_MODE.upper(), side, qty, symbol)
         return {"simulated": True}
@@ -1068,13 +1656,121 @@ def get_news_headlines(symbol, limit=5):
             "sortBy": "publishedAt",
             "pageSize": limit,
         }
-        resp = requests.get(url, params=params, timeout=10)
+        resp = http_session("newsapi").get(url, params=params, timeout=HTTP_TIMEOUTS["newsapi"])
         return resp.json()
 
-    data = call_with_retries(_get, name=f"NewsAPI {symbol}") or {}
+    data = call_with_retries(_get, name=f"NewsAPI {symbol}", breaker="newsapi") or {}
     return [a["title"] for a in data.get("articles", []) if "title" in a]
 
 
+# Symbols priced during the most recent trade cycle and how many of them had
+# their headlines fetched; symbols skipped before pricing are not counted
+NEWS_LOOKUPS = {"priced": 0, "fetched": 0}
+
+# Cycle budget bookkeeping: cycles run, cycles that ran out of time and the
+# symbols they deferred, plus overruns and skipped slots of the scheduler
+CYCLE_STATS = {
+    "cycles": 0,
+    "deferred_cycles": 0,
+    "deferred_symbols": 0,
+    "overruns": 0,
+    "skipped_slots": 0,
+}
+# Entry candidates the last cycle had no time for; they go first next cycle
+DEFERRED_SYMBOLS: list[str] = []
+
+
+def _cycle_stats_lines() -> list[str]:
+    lines = []
+    for key, metric, help_text in (
+        ("cycles", "trade_bot_cycles_started_total", "Trade cycles started."),
+        ("deferred_cycles", "trade_bot_deferred_cycles_total",
+         "Cycles that deferred entry candidates for lack of time."),
+        ("deferred_symbols", "trade_bot_deferred_symbols_total",
+         "Entry candidates deferred to the next cycle."),
+        ("overruns", "trade_bot_cycle_overruns_total",
+         "Cycles that started late because the previous one overran."),
+        ("skipped_slots", "trade_bot_skipped_slots_total",
+         "Cycle slots skipped after long overruns."),
+    ):
+        lines += [
+            f"# HELP {metric} {help_text}",
+            f"# TYPE {metric} counter",
+            f"{metric} {CYCLE_STATS[key]}",
+        ]
+    return lines
+
+
+METRICS.add_collector(_cycle_stats_lines)
+
+
+def _cycle_order(symbols, positions, deadline: float | None):
+    """Yield held symbols first, then entry candidates while time remains.
+
+    Exits are never deferred.  Candidates deferred by the previous cycle go
+    first; once ``deadline`` (``time.monotonic()``) passes, the rest are kept
+    in ``DEFERRED_SYMBOLS`` for the next cycle.  While candidates are being
+    processed, retries are bounded by the deadline as well.
+    """
+
+    global DEFERRED_SYMBOLS
+    held = [sym for sym in symbols if sym in positions]
+    yield from held
+    held_set = set(held)
+    first = [sym for sym in DEFERRED_SYMBOLS if sym in symbols and sym not in held_set]
+    candidates = first + [sym for sym in symbols if sym not in held_set and sym not in first]
+    DEFERRED_SYMBOLS = []
+    if deadline is None:
+        yield from candidates
+        return
+    with call_deadline(max(0.0, deadline - time.monotonic())):
+        for i, sym in enumerate(candidates):
+            if time.monotonic() >= deadline:
+                DEFERRED_SYMBOLS = candidates[i:]
+                CYCLE_STATS["deferred_cycles"] += 1
+                CYCLE_STATS["deferred_symbols"] += len(DEFERRED_SYMBOLS)
+                logger.warning(
+                    "⏳ Cycle budget spent; %d symbol(s) deferred to the next cycle",
+                    len(DEFERRED_SYMBOLS),
+                )
+                return
+            yield sym
+
+
+class LazyHeadlines(Sequence):
+    """Headlines for ``symbol`` that are fetched on first access.
+
+    Strategies evaluate their technical signal before the news filter, so a
+    symbol without a signal never costs a NewsAPI call.  ``gate`` is consulted
+    right before fetching; when it returns ``False`` (e.g. the daily cap rules
+    out a buy anyway) no request is made and the sequence is empty.
+    """
+
+    def __init__(self, symbol: str, gate=None):
+        self.symbol = symbol
+        self.fetched = False
+        self._gate = gate
+        self._items: list[str] | None = None
+
+    def _load(self) -> list[str]:
+        if self._items is None:
+            if self._gate is not None and not self._gate():
+                self._items = []
+            else:
+                self._items = get_news_headlines(self.symbol)
+                self.fetched = True
+        return self._items
+
+    def __getitem__(self, index):
+        return self._load()[index]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self):
+        return iter(self._load())
+
+
 def save_price(symbol, price, timestamp: str | None = None):
     """Persist price data with a timestamp into a SQLite database.
 
@@ -1109,8 +1805,7 @@ def save_price(symbol, price, timestamp: str | None = None):
                 (timestamp, symbol, price),
             )
         # keep a limited number of rows per symbol
-            max_window = getattr(strategy, "long_window", 0)
-            history_cap = max(max_window, getattr(strategy, "short_window", 0)) * 10 or 100
+            history_cap = _history_cap()
             cur.execute(
                 """
                 DELETE FROM prices
@@ -1127,6 +1822,42 @@ def save_price(symbol, price, timestamp: str | None = None):
     except sqlite3.Error as exc:
         logger.error("Price save error: %s", exc)
 
+def save_prices(symbol: str, rows) -> None:
+    """Persist many ``(timestamp, price)`` rows for ``symbol`` in one transaction.
+
+    Bulk counterpart of :func:`save_price` used when backfilling history: the
+    rows are inserted with a single ``executemany`` and the rolling window is
+    trimmed once afterwards.  A ``None`` timestamp means "now".
+    """
+
+    if not rows:
+        return
+    now = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    try:
+        with sqlite3.connect("prices.db") as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS prices (timestamp TEXT, symbol TEXT, price REAL)"
+            )
+            conn.executemany(
+                "INSERT INTO prices (timestamp, symbol, price) VALUES (?, ?, ?)",
+                [(ts or now, symbol, price) for ts, price in rows],
+            )
+            conn.execute(
+                """
+                DELETE FROM prices
+                WHERE symbol = ? AND rowid NOT IN (
+                    SELECT rowid FROM prices
+                    WHERE symbol = ?
+                    ORDER BY timestamp DESC, rowid DESC
+                    LIMIT ?
+                )
+                """,
+                (symbol, symbol, _history_cap()),
+            )
+    except sqlite3.Error as exc:
+        logger.error("Price save error: %s", exc)
+
+
 def load_prices(symbol: str, limit: int):
     """Load the most recent ``limit`` prices for ``symbol`` from ``prices.db``."""
     try:
@@ -1153,9 +1884,77 @@ def load_prices(symbol: str, limit: int):
             pass
 
 
+def load_prices_bulk(symbols, limit: int) -> dict[str, list[float]]:
+    """Load the most recent ``limit`` prices of every symbol in one query."""
+
+    symbols = list(symbols)
+    result: dict[str, list[float]] = {sym: [] for sym in symbols}
+    if not symbols or limit <= 0:
+        return result
+    placeholders = ",".join("?" for _ in symbols)
+    try:
+        conn = sqlite3.connect("prices.db")
+        rows = conn.execute(
+            f"""
+            SELECT symbol, price FROM (
+                SELECT symbol, price, timestamp, rowid AS rid, ROW_NUMBER() OVER (
+                    PARTITION BY symbol ORDER BY timestamp DESC, rowid DESC
+                ) AS rn
+                FROM prices WHERE symbol IN ({placeholders})
+            )
+            WHERE rn <= ?
+            ORDER BY symbol, timestamp, rid
+            """,
+            (*symbols, limit),
+        ).fetchall()
+    except Exception as e:
+        # A fresh install has no prices table until the first save
+        if "no such table" not in str(e):
+            logger.error("Price load error: %s", e)
+        return result
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+    for sym, price in rows:
+        result[sym].append(price)
+    return result
+
+
+def _warmup_period() -> int:
+    """Number of recent prices the active strategy needs before trading."""
+
+    warmup = getattr(strategy, "warmup_period", None)
+    if callable(warmup):
+        return int(warmup())
+    return int(Strategy.warmup_period(strategy))
+
+
+def _history_cap() -> int:
+    """Number of recent prices worth keeping per symbol."""
+
+    return _warmup_period() * 10 or 100
+
+
+def _seed_strategy(symbol: str, prices: list[float]) -> None:
+    if hasattr(strategy, "seed_history"):
+        strategy.seed_history(symbol, prices)
+    else:
+        strategy.history[symbol] = prices
+
+
 def preload_history(symbols=None):
     """Ensure strategy history and local DB contain recent prices.
 
+    Symbols whose in-memory history already holds ``strategy.warmup_period()``
+    prices are kept as they are (trimmed to :func:`_history_cap`).  For the
+    others exactly that many prices are loaded.  The
+    local ``prices.db`` is read for all symbols in one query, fresh closes from
+    the kline store fill the gaps, and only the symbols still short are
+    fetched from Binance — concurrently, on at most ``PRELOAD_WORKERS``
+    threads, each persisting its candles in a single bulk insert.
+
     Parameters
     ----------
     symbols : iterable[str] | None
@@ -1164,37 +1963,237 @@ def preload_history(symbols=None):
         can run even if a pair is later removed from the watchlist.
     """
 
-    history_limit = max(
-        getattr(strategy, "short_window", 0), getattr(strategy, "long_window", 0)
-    )
-    long_window = getattr(strategy, "long_window", 0)
-    for sym in symbols or WATCHLIST:
-        prices = load_prices(sym, history_limit)
-        fetched: list[float] = []
+    symbols = list(dict.fromkeys(symbols or WATCHLIST))
+    history_limit = _warmup_period()
+    if not symbols or history_limit <= 0:
+        return
+
+    # Histories already warm in memory (restored from a snapshot, or kept
+    # since the last cycle) are left alone rather than reloaded
+    cap = _history_cap()
+    warm = getattr(strategy, "history", None) or {}
+    pending = []
+    for sym in symbols:
+        prices = warm.get(sym)
+        if prices is not None and len(prices) >= history_limit:
+            del prices[:-cap]
+        else:
+            pending.append(sym)
+    symbols = pending
+    if not symbols:
+        return
+
+    histories = load_prices_bulk(symbols, history_limit)
+    missing: list[str] = []
+    for sym in symbols:
+        prices = histories[sym]
+        if len(prices) < history_limit:
+            stored = KLINE_STORE.closes(
+                sym, "1m", history_limit, max_age=KLINE_STORE_MAX_AGE
+            )
+            if len(stored) > len(prices):
+                histories[sym] = prices = stored
         if len(prices) < history_limit:
             logger.info(
                 "Preloading %s history: have %d, need %d", sym, len(prices), history_limit
             )
-            fetched = fetch_historical_prices(sym, history_limit)
-            prices = load_prices(sym, history_limit)
-
-        if len(prices) < history_limit and fetched:
-            # Fallback in case ``fetch_historical_prices`` didn't persist
-            for p in fetched:
-                save_price(sym, p)
-            prices = load_prices(sym, history_limit)
+            missing.append(sym)
 
-        if len(prices) < long_window:
+    if missing:
+        workers = max(1, min(PRELOAD_WORKERS, len(missing)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = dict(
+                zip(
+                    missing,
+                    pool.map(lambda sym: fetch_historical_prices(sym, history_limit), missing),
+                )
+            )
+        reloaded = load_prices_bulk(missing, history_limit)
+        for sym in missing:
+            prices = reloaded[sym]
+            if len(prices) < history_limit and fetched[sym]:
+                # Fallback in case ``fetch_historical_prices`` didn't persist
+                save_prices(sym, [(None, p) for p in fetched[sym]])
+                prices = load_prices(sym, history_limit)
+            if len(prices) > len(histories[sym]):
+                histories[sym] = prices
+
+    for sym in symbols:
+        prices = histories[sym]
+        if len(prices) < history_limit:
             logger.warning(
-                "Insufficient history for %s: have %d, need %d", sym, len(prices), long_window
+                "Insufficient history for %s: have %d, need %d", sym, len(prices), history_limit
             )
             continue
+        _seed_strategy(sym, prices)
+
+
+def build_snapshot() -> dict:
+    """Collect the in-memory state worth restoring after a restart."""
+
+    cap = _history_cap()
+    return {
+        "version": 1,
+        "saved_at": time.time(),
+        "strategy": STRATEGY_NAME,
+        "history": {sym: list(p[-cap:]) for sym, p in strategy.history.items() if p},
+        "atr": {key: list(value) for key, value in ATR_CACHE.items()},
+        "price_baseline": dict(PRICE_BASELINE),
+        "last_balance_reminder": (
+            LAST_BALANCE_REMINDER.isoformat() if LAST_BALANCE_REMINDER else None
+        ),
+    }
+
+
+def save_snapshot(path: str | None = None) -> bool:
+    """Write :func:`build_snapshot` to ``SNAPSHOT_FILE`` as gzipped JSON.
+
+    The file is replaced atomically so a crash mid-write keeps the previous
+    snapshot.
+    """
+
+    global LAST_SNAPSHOT_AT
+    path = path or SNAPSHOT_FILE
+    tmp_path = f"{path}.tmp"
+    try:
+        data = json.dumps(build_snapshot(), separators=(",", ":")).encode("utf-8")
+        with gzip.open(tmp_path, "wb", compresslevel=6) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError) as exc:
+        logger.error("Snapshot save error: %s", exc)
+        return False
+    LAST_SNAPSHOT_AT = time.time()
+    return True
+
+
+def maybe_save_snapshot() -> bool:
+    """Save a snapshot when ``SNAPSHOT_INTERVAL_SECONDS`` have passed."""
+
+    if time.time() - LAST_SNAPSHOT_AT < SNAPSHOT_INTERVAL_SECONDS:
+        return False
+    return save_snapshot()
+
+
+def load_snapshot(path: str | None = None) -> dict | None:
+    """Return a saved snapshot, or ``None`` if missing, unreadable or stale."""
+
+    path = path or SNAPSHOT_FILE
+    try:
+        with gzip.open(path, "rb") as f:
+            data = json.loads(f.read().decode("utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        logger.warning("Ignoring unreadable snapshot %s: %s", path, exc)
+        return None
+    if not isinstance(data, dict) or data.get("version") != 1:
+        return None
+    age = time.time() - float(data.get("saved_at") or 0)
+    if age > SNAPSHOT_MAX_AGE_SECONDS:
+        logger.info("Ignoring snapshot saved %.0f minutes ago", age / 60)
+        return None
+    return data
+
+
+def _utc_timestamp(seconds: float) -> str:
+    return datetime.datetime.fromtimestamp(seconds, tz=datetime.timezone.utc).strftime(
+        "%Y-%m-%d %H:%M:%S"
+    )
+
+
+def fetch_recent_closes(symbol: str, start_ms: int, limit: int) -> list[tuple[int, float]]:
+    """Fetch up to ``limit`` 1-minute ``(open_time_ms, close)`` candles from ``start_ms``.
+
+    The interval matches :func:`fetch_historical_prices` and the kline store,
+    so a topped-up history holds a single timeframe.
+    """
+
+    def _fetch() -> list[tuple[int, float]]:
+        klines = client.get_klines(
+            symbol=symbol, interval="1m", startTime=start_ms, limit=limit
+        )
+        return [(int(k[0]), float(k[4])) for k in klines]
+
+    return call_with_retries(_fetch, name=f"Binance klines {symbol}", breaker="binance.klines") or []
+
+
+def restore_snapshot(symbols, path: str | None = None) -> set[str]:
+    """Restore state from the last snapshot and top up missing history.
+
+    Histories are extended with one 1-minute candle per minute since the
+    snapshot, fetched concurrently on up to ``PRELOAD_WORKERS`` threads; those
+    candles are written to ``prices.db`` like a preload.  Returns the symbols
+    whose history is ready, so :func:`preload_history` only has to handle the
+    rest.
+    """
+
+    global LAST_BALANCE_REMINDER
+    symbols = list(symbols)
+    data = load_snapshot(path)
+    if not data:
+        return set()
+
+    now = time.time()
+    for key, (atr, fetched_at) in (data.get("atr") or {}).items():
+        if now - fetched_at < ATR_CACHE_TTL_SECONDS:
+            ATR_CACHE.setdefault(key, (atr, fetched_at))
+    for sym, price in (data.get("price_baseline") or {}).items():
+        PRICE_BASELINE.setdefault(sym, price)
+    if LAST_BALANCE_REMINDER is None and data.get("last_balance_reminder"):
+        LAST_BALANCE_REMINDER = datetime.datetime.fromisoformat(
+            data["last_balance_reminder"]
+        )
+
+    needed = _warmup_period()
+    saved_at = float(data["saved_at"])
+    missed = int((now - saved_at) // 60)
+    histories = data.get("history") or {}
+    candidates: dict[str, list[float]] = {}
+    for sym in symbols:
+        prices = [float(p) for p in histories.get(sym) or []]
+        if not prices or (needed and missed >= needed):
+            # A full preload fetches no more than a top-up would
+            continue
+        candidates[sym] = prices
+
+    fetched: dict[str, list[tuple[int, float]]] = {sym: [] for sym in candidates}
+    if missed and candidates:
+        limit = min(missed, 1000)
+        start_ms = int(saved_at * 1000) + 1
+        workers = max(1, min(PRELOAD_WORKERS, len(candidates)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            fetched = dict(
+                zip(
+                    candidates,
+                    pool.map(
+                        lambda sym: fetch_recent_closes(sym, start_ms, limit)[-limit:],
+                        candidates,
+                    ),
+                )
+            )
+
+    restored: set[str] = set()
+    for sym, prices in candidates.items():
+        candles = fetched[sym]
+        prices.extend(price for _, price in candles)
+        if len(prices) < needed:
+            continue
+        # The snapshot's own prices were saved live already; only the
+        # candles fetched for the gap are new to prices.db
+        save_prices(sym, [(_utc_timestamp(ts_ms / 1000), p) for ts_ms, p in candles])
+        _seed_strategy(sym, prices)
+        restored.add(sym)
+
+    logger.info(
+        "♻️ Restored %d/%d histories from snapshot (%d minutes topped up)",
+        len(restored),
+        len(symbols),
+        missed,
+    )
+    return restored
+
 
-        if hasattr(strategy, "seed_history"):
-            strategy.seed_history(sym, prices)
-        else:
-            strategy.history[sym] = prices
-            
 def update_balance(balance, positions, price_cache):
     """Recalculate total balance using live USDT value and persist it."""
     binance_usdt = get_usdt_balance()
@@ -1248,9 +2247,42 @@ def sync_positions_with_exchange():
             p["stop_distance"] = trail - stop if stop is not None else None
     return db_positions
 
-def trade():
+def _investment_allowance(positions, price_cache) -> tuple[float, float]:
+    """Return the invested amount and what remains under ``DAILY_MAX_INVEST``.
+
+    Ensure all open positions contribute to the invested total by backfilling
+    any missing prices with fresh quotes (or their entry price as a last
+    resort).  Previously, uncached symbols counted as zero, allowing trades to
+    exceed ``DAILY_MAX_INVEST``.
+    """
+
+    missing_prices = [sym for sym in positions if sym not in price_cache]
+    for sym in missing_prices:
+        latest = get_price(sym)
+        if latest and latest > 0:
+            price_cache[sym] = latest
+            continue
+        entry_price = positions[sym].get("entry")
+        if entry_price:
+            price_cache[sym] = entry_price
+
+    current_invested = sum(
+        p["qty"] * price_cache.get(sym, 0) for sym, p in positions.items()
+    )
+    return current_invested, DAILY_MAX_INVEST - current_invested
+
+
+def trade(deadline: float | None = None):
+    """Run one trade cycle.
+
+    Open positions are checked before new entries.  With a ``deadline``
+    (``time.monotonic()``), entry candidates left when it passes are deferred
+    to the next cycle (see :func:`_cycle_order`).
+    """
     global SIM_USDT_BALANCE
-    positions = db.get_open_positions()
+    CYCLE_STATS["cycles"] += 1
+    with METRICS.span("positions"):
+        positions = db.get_open_positions()
     for p in positions.values():
         if p.get("stop_distance") is None:
             stop = p.get("stop_loss")
@@ -1262,7 +2294,8 @@ def trade():
     )
     balance.setdefault("total", balance.get("usdt", START_BALANCE))
     now = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M')
-    binance_usdt = get_usdt_balance()
+    with METRICS.span("balance"):
+        binance_usdt = get_usdt_balance()
     if binance_usdt <= 0:
         binance_usdt = balance.get("usdt", START_BALANCE)
     balance["usdt"] = binance_usdt
@@ -1273,336 +2306,389 @@ def trade():
     for sym in positions.keys():
         if sym not in symbols:
             symbols.append(sym)
-    try:
-        preload_history(symbols)
-    except TypeError:
-        preload_history()
+    with METRICS.span("preload"):
+        try:
+            preload_history(symbols)
+        except TypeError:
+            preload_history()
 
     buy_orders_this_cycle = 0
+    news_requests: list[LazyHeadlines] = []
+    priced_symbols = 0
+
+    symbols_started = time.perf_counter()
+    # Closing the order explicitly ends its candidate deadline even if
+    # the loop body raises
+    with contextlib.closing(_cycle_order(symbols, positions, deadline)) as order:
+        for symbol in order:
+            if (
+                buy_orders_this_cycle >= MAX_ORDERS_PER_CYCLE
+                and symbol not in positions
+            ):
+                continue
 
-    for symbol in symbols:
-        if (
-            buy_orders_this_cycle >= MAX_ORDERS_PER_CYCLE
-            and symbol not in positions
-        ):
-            continue
-
-        price = get_price(symbol)
-        if not price or price <= 0:
-            logger.warning("⚠️ %s skipped — invalid price", symbol)
-            continue
+            # Stop checks of open positions may use the whole weight budget
+            with _exchange_priority(
+                gateway.PRIORITY_HIGH if symbol in positions else gateway.PRIORITY_LOW
+            ):
+                price = get_price(symbol)
+            if not price or price <= 0:
+                logger.warning("⚠️ %s skipped — invalid price", symbol)
+                continue
 
-        price_cache[symbol] = price
-        logger.info("🔍 %s @ $%.2f", symbol, price)
-        headlines = get_news_headlines(symbol)
-
-        # Check existing positions first using strategy rules
-        if symbol in positions:
-            pos = positions[symbol]
-            entry = pos["entry"]
-            qty = pos["qty"]
-            trail = pos.get("trail_price", entry)
-            stop_distance = pos.get("stop_distance")
-            if stop_distance is None:
-                stop_distance = get_stop_distance(symbol, price)
-                pos["stop_distance"] = stop_distance
-                
-            updated = False
-            if price > trail:
-                trail = price
-                pos["trail_price"] = trail
-                stop = trail - stop_distance
-                updated = True
-            else:
-                stop = pos.get("stop_loss")
+            price_cache[symbol] = price
+            logger.info("🔍 %s @ $%.2f", symbol, price)
+            priced_symbols += 1
+
+            # Check existing positions first using strategy rules
+            if symbol in positions:
+                pos = positions[symbol]
+                entry = pos["entry"]
+                qty = pos["qty"]
+                stop_distance = pos.get("stop_distance")
+                if stop_distance is None:
+                    stop_distance = get_stop_distance(symbol, price)
+                    pos["stop_distance"] = stop_distance
 
-            if (
-                stop is not None
-                and price - entry >= stop_distance
-                and stop < entry
-            ):
-                stop = entry
-                pos["stop_loss"] = stop
-                updated = True
-                take_profit = calculate_fee_adjusted_take_profit(
-                    entry,
-                    stop,
-                    trail,
+                stop, stop_event = update_trailing_stop(
+                    pos,
+                    price,
+                    stop_distance,
                     FEE_RATE,
                     RISK_REWARD,
                     MIN_EXIT_PNL_PCT,
                 )
-                pos["take_profit"] = take_profit
-                db.upsert_position(
-                    symbol,
-                    qty,
-                    entry,
-                    stop,
-                    take_profit,
-                    pos.get("trade_id"),
-                    trail,
-                    pos.get("stop_distance"),
-                )
+                if stop_event:
+                    db.upsert_position(
+                        symbol,
+                        qty,
+                        entry,
+                        stop,
+                        pos["take_profit"],
+                        pos.get("trade_id"),
+                        pos.get("trail_price", entry),
+                        pos.get("stop_distance"),
+                    )
+                if stop_event == "break_even":
+                    logger.info(
+                        "🔒 %s stop-loss moved to break-even ($%.2f)",
+                        symbol,
+                        entry,
+                    )
+                    send(
+                        f"🔒 {symbol} stop-loss moved to break-even at ${entry:.2f} — {now}"
+                    )
+
+                entry_cost = entry * qty * (1 + FEE_RATE)
+                current_value = price * qty * (1 - FEE_RATE)
+                profit = current_value - entry_cost
+                pnl = (profit / entry_cost) * 100
+
                 logger.info(
-                    "🔒 %s stop-loss moved to break-even ($%.2f)",
-                    symbol,
-                    entry,
-                )
-                send(
-                    f"🔒 {symbol} stop-loss moved to break-even at ${entry:.2f} — {now}"
-                )
-            elif updated:
-                pos["stop_loss"] = stop
-                take_profit = calculate_fee_adjusted_take_profit(
-                    entry,
-                    stop,
-                    trail,
-                    FEE_RATE,
-                    RISK_REWARD,
-                    MIN_EXIT_PNL_PCT,
-                )
-                pos["take_profit"] = take_profit
-                db.upsert_position(
+                    "📈 %s Entry=$%.2f → Now=$%.2f | PnL=%.2f%%",
                     symbol,
-                    qty,
                     entry,
-                    stop,
-                    take_profit,
-                    pos.get("trade_id"),
-                    trail,
-                    pos.get("stop_distance"),
+                    price,
+                    pnl,
                 )
-                
-            entry_cost = entry * qty * (1 + FEE_RATE)
-            current_value = price * qty * (1 - FEE_RATE)
-            profit = current_value - entry_cost
-            pnl = (profit / entry_cost) * 100
-
-            logger.info(
-                "📈 %s Entry=$%.2f → Now=$%.2f | PnL=%.2f%%",
-                symbol,
-                entry,
-                price,
-                pnl,
-            )
 
             
-            if stop is not None and price <= stop:
-                decision = {
-                    "action": "sell",
-                    "symbol": symbol,
-                    "qty": qty,
-                    "price": price,
-                    "profit": profit,
-                    "pnl_pct": pnl,
-                    "trade_id": pos.get("trade_id"),
-                    "current_value": current_value,
-                    "reason": "stop_loss",
-                    "timestamp": now,
-                }
-                if profit < 0:
-                    question = (
-                        f"Stop-loss hit for {symbol}. SELL {qty} at ${price:.2f} and realize ${profit:.2f} USDT ({pnl:.2f}%)?"
-                    )
-                    _store_pending_decision(decision, question)
-                else:
-                    _execute_decision(decision)
-                    positions.pop(symbol, None)
-                continue
+                if stop is not None and price <= stop:
+                    decision = {
+                        "action": "sell",
+                        "symbol": symbol,
+                        "qty": qty,
+                        "price": price,
+                        "profit": profit,
+                        "pnl_pct": pnl,
+                        "trade_id": pos.get("trade_id"),
+                        "current_value": current_value,
+                        "reason": "stop_loss",
+                        "timestamp": now,
+                    }
+                    if profit < 0:
+                        question = (
+                            f"Stop-loss hit for {symbol}. SELL {qty} at ${price:.2f} and realize ${profit:.2f} USDT ({pnl:.2f}%)?"
+                        )
+                        _store_pending_decision(decision, question)
+                    else:
+                        _execute_decision(decision)
+                        positions.pop(symbol, None)
+                    continue
 
-            take_profit = pos.get("take_profit")
-            if take_profit and price >= take_profit:
-                decision = {
-                    "action": "sell",
-                    "symbol": symbol,
-                    "qty": qty,
-                    "price": price,
-                    "profit": profit,
-                    "pnl_pct": pnl,
-                    "trade_id": pos.get("trade_id"),
-                    "current_value": current_value,
-                    "reason": "take_profit",
-                    "timestamp": now,
-                }
-                if profit < 0:
-                    question = (
-                        f"Take profit signal for {symbol} would lose ${abs(profit):.2f} USDT ({pnl:.2f}%). Confirm SELL {qty}?"
-                    )
-                    _store_pending_decision(decision, question)
-                else:
-                    _execute_decision(decision)
-                    positions.pop(symbol, None)
-                continue
+                take_profit = pos.get("take_profit")
+                if take_profit and price >= take_profit:
+                    decision = {
+                        "action": "sell",
+                        "symbol": symbol,
+                        "qty": qty,
+                        "price": price,
+                        "profit": profit,
+                        "pnl_pct": pnl,
+                        "trade_id": pos.get("trade_id"),
+                        "current_value": current_value,
+                        "reason": "take_profit",
+                        "timestamp": now,
+                    }
+                    if profit < 0:
+                        question = (
+                            f"Take profit signal for {symbol} would lose ${abs(profit):.2f} USDT ({pnl:.2f}%). Confirm SELL {qty}?"
+                        )
+                        _store_pending_decision(decision, question)
+                    else:
+                        _execute_decision(decision)
+                        positions.pop(symbol, None)
+                    continue
+
+                headlines = LazyHeadlines(symbol)
+                news_requests.append(headlines)
+                with METRICS.span("strategy"):
+                    exit_signal = strategy.should_sell(symbol, pos, price, headlines)
+                if exit_signal:
+                    decision = {
+                        "action": "sell",
+                        "symbol": symbol,
+                        "qty": qty,
+                        "price": price,
+                        "profit": profit,
+                        "pnl_pct": pnl,
+                        "trade_id": pos.get("trade_id"),
+                        "current_value": current_value,
+                        "reason": "strategy_exit",
+                        "timestamp": now,
+                    }
+                    if profit < 0:
+                        question = (
+                            f"Strategy exit for {symbol} would realize ${profit:.2f} USDT ({pnl:.2f}%). SELL {qty}?"
+                        )
+                        _store_pending_decision(decision, question)
+                    else:
+                        _execute_decision(decision)
+                        positions.pop(symbol, None)
+                    continue
 
-            if strategy.should_sell(symbol, pos, price, headlines):
-                decision = {
-                    "action": "sell",
-                    "symbol": symbol,
-                    "qty": qty,
-                    "price": price,
-                    "profit": profit,
-                    "pnl_pct": pnl,
-                    "trade_id": pos.get("trade_id"),
-                    "current_value": current_value,
-                    "reason": "strategy_exit",
-                    "timestamp": now,
-                }
-                if profit < 0:
-                    question = (
-                        f"Strategy exit for {symbol} would realize ${profit:.2f} USDT ({pnl:.2f}%). SELL {qty}?"
-                    )
-                    _store_pending_decision(decision, question)
-                else:
-                    _execute_decision(decision)
-                    positions.pop(symbol, None)
                 continue
 
-            continue
+            # For new positions, defer decision to strategy
+            if buy_orders_this_cycle >= MAX_ORDERS_PER_CYCLE:
+                continue
 
-        # For new positions, defer decision to strategy
-        if buy_orders_this_cycle >= MAX_ORDERS_PER_CYCLE:
-            continue
+            # Technical pre-screen first: headlines are only fetched if the
+            # strategy signals a buy and the daily cap still leaves room for it.
+            allowance: dict[str, float] = {}
 
-        if not strategy.should_buy(symbol, price, headlines):
-            continue
+            def _cap_open() -> bool:
+                allowance["invested"], allowance["remaining"] = _investment_allowance(
+                    positions, price_cache
+                )
+                return allowance["remaining"] > 0
 
-        # Live cap enforcement: only 25% of START_BALANCE can be invested
-        # Live cap enforcement: only 25% of START_BALANCE can be invested.
-        # Ensure all open positions contribute to the invested total by
-        # backfilling any missing prices with fresh quotes (or their entry
-        # price as a last resort).  Previously, uncached symbols counted as
-        # zero, allowing trades to exceed ``DAILY_MAX_INVEST``.
-        missing_prices = [sym for sym in positions if sym not in price_cache]
-        for sym in missing_prices:
-            latest = get_price(sym)
-            if latest and latest > 0:
-                price_cache[sym] = latest
+            headlines = LazyHeadlines(symbol, gate=_cap_open)
+            news_requests.append(headlines)
+            with METRICS.span("strategy"):
+                entry_signal = strategy.should_buy(symbol, price, headlines)
+            if not entry_signal:
                 continue
-            entry_price = positions[sym].get("entry")
-            if entry_price:
-                price_cache[sym] = entry_price
 
-        current_invested = sum(
-            p["qty"] * price_cache.get(sym, 0) for sym, p in positions.items()
-        )
-        remaining_allowance = DAILY_MAX_INVEST - current_invested
-        logger.info(
-            "💰 Balance: $%.2f, Invested: $%.2f, Remaining cap: $%.2f",
-            binance_usdt,
-            current_invested,
-            remaining_allowance,
-        )
+            if "remaining" not in allowance:
+                _cap_open()
+            current_invested = allowance["invested"]
+            remaining_allowance = allowance["remaining"]
+            logger.info(
+                "💰 Balance: $%.2f, Invested: $%.2f, Remaining cap: $%.2f",
+                binance_usdt,
+                current_invested,
+                remaining_allowance,
+            )
 
-        if remaining_allowance <= 0:
-            logger.info("🔒 Skipped %s — daily investment cap reached", symbol)
-            continue
+            if remaining_allowance <= 0:
+                logger.info("🔒 Skipped %s — daily investment cap reached", symbol)
+                continue
 
-        max_trade = min(remaining_allowance, MAX_TRADE_USDT)
-        stop_distance = get_stop_distance(symbol, price)
-        qty, stop_loss, reason = calculate_position_size(
-            binance_usdt,
-            price,
-            RISK_PER_TRADE,
-            stop_distance,
-            MIN_TRADE_USDT,
-            max_trade,
-            fee_rate=FEE_RATE,
-        )
+            max_trade = min(remaining_allowance, MAX_TRADE_USDT)
+            stop_distance = get_stop_distance(symbol, price)
+            qty, stop_loss, reason = calculate_position_size(
+                binance_usdt,
+                price,
+                RISK_PER_TRADE,
+                stop_distance,
+                MIN_TRADE_USDT,
+                max_trade,
+                fee_rate=FEE_RATE,
+            )
        
-        if qty <= 0:
-            msg = reason or "position size too small"
-            logger.info("❌ Skipped %s — %s", symbol, msg)
-            continue
+            if qty <= 0:
+                msg = reason or "position size too small"
+                logger.info("❌ Skipped %s — %s", symbol, msg)
+                continue
 
-        actual_cost = qty * price * (1 + FEE_RATE)
+            actual_cost = qty * price * (1 + FEE_RATE)
 
-        if actual_cost < MIN_TRADE_USDT:
-            msg = reason or f"trade value ${actual_cost:.2f} below minimum"
-            logger.info("❌ Skipped %s — %s", symbol, msg)
-            continue
+            if actual_cost < MIN_TRADE_USDT:
+                msg = reason or f"trade value ${actual_cost:.2f} below minimum"
+                logger.info("❌ Skipped %s — %s", symbol, msg)
+                continue
 
         
-        stop_display = f"{stop_loss:.2f}" if stop_loss is not None else "0.0"
-        logger.info(
-            "🔢 %s → qty=%s, value=%.4f, stop=%s",
-            symbol,
-            qty,
-            actual_cost,
-            stop_display,
-        )
+            stop_display = f"{stop_loss:.2f}" if stop_loss is not None else "0.0"
+            logger.info(
+                "🔢 %s → qty=%s, value=%.4f, stop=%s",
+                symbol,
+                qty,
+                actual_cost,
+                stop_display,
+            )
 
-        if actual_cost > binance_usdt:
-            msg = reason or f"insufficient balance for ${actual_cost:.2f}"
-            logger.warning("❌ Skipped %s — %s", symbol, msg)
-            continue
+            if actual_cost > binance_usdt:
+                msg = reason or f"insufficient balance for ${actual_cost:.2f}"
+                logger.warning("❌ Skipped %s — %s", symbol, msg)
+                continue
 
 
-        take_profit = calculate_fee_adjusted_take_profit(
-            price,
-            stop_loss,
-            price,
-            FEE_RATE,
-            RISK_REWARD,
-            MIN_EXIT_PNL_PCT,
-        )
-        decision = {
-            "action": "buy",
-            "symbol": symbol,
-            "qty": qty,
-            "price": price,
-            "stop_loss": stop_loss,
-            "take_profit": take_profit,
-            "stop_distance": price - stop_loss if stop_loss is not None else stop_distance,
-            "actual_cost": actual_cost,
-            "timestamp": now,
-        }
+            take_profit = calculate_fee_adjusted_take_profit(
+                price,
+                stop_loss,
+                price,
+                FEE_RATE,
+                RISK_REWARD,
+                MIN_EXIT_PNL_PCT,
+            )
+            decision = {
+                "action": "buy",
+                "symbol": symbol,
+                "qty": qty,
+                "price": price,
+                "stop_loss": stop_loss,
+                "take_profit": take_profit,
+                "stop_distance": price - stop_loss if stop_loss is not None else stop_distance,
+                "actual_cost": actual_cost,
+                "timestamp": now,
+            }
 
-        _execute_decision(decision)
-        positions = db.get_open_positions()
-        binance_usdt = get_usdt_balance()
-        balance["usdt"] = binance_usdt
-        buy_orders_this_cycle += 1
-        continue
+            _execute_decision(decision)
+            positions = db.get_open_positions()
+            binance_usdt = get_usdt_balance()
+            balance["usdt"] = binance_usdt
+            buy_orders_this_cycle += 1
+            continue
+
+    METRICS.observe("symbols", time.perf_counter() - symbols_started)
 
     # Balance update
-    total = update_balance(balance, positions, price_cache)
+    with METRICS.span("update_balance"):
+        total = update_balance(balance, positions, price_cache)
     binance_usdt = balance["usdt"]
     maybe_send_balance_reminder(total, binance_usdt, now, price_cache)
 
-    avg = db.average_profit_last_n_trades(10)
+    NEWS_LOOKUPS["priced"] = priced_symbols
+    NEWS_LOOKUPS["fetched"] = sum(1 for h in news_requests if h.fetched)
+    logger.info(
+        "📰 News lookups: %d of %d priced symbol(s)",
+        NEWS_LOOKUPS["fetched"],
+        NEWS_LOOKUPS["priced"],
+    )
+
+    with METRICS.span("trade_stats"):
+        avg = db.average_profit_last_n_trades(10)
     logger.info("📈 Avg profit last 10 trades: %.2f%%", avg)
 
+def record_cycle_metrics() -> dict[str, float]:
+    """Close the metrics cycle, log its slowest spans and refresh ``METRICS_FILE``."""
+
+    if not METRICS.enabled:
+        return {}
+    cycle = METRICS.end_cycle()
+    slowest = sorted(cycle.items(), key=lambda kv: kv[1], reverse=True)[:5]
+    logger.info(
+        "⏱️ Cycle spans: %s | weight %d/%d",
+        ", ".join(f"{k}={v * 1000:.0f}ms" for k, v in slowest),
+        EXCHANGE_BUDGET.limiter.used(),
+        EXCHANGE_BUDGET.max_weight,
+    )
+    if METRICS_FILE:
+        try:
+            METRICS.write(METRICS_FILE)
+        except OSError as exc:
+            logger.warning("Metrics write failed: %s", exc)
+    return cycle
+
+
 def main():
     logger.info("🤖 Trading bot started.")
+    NOTIFIER.maxsize = max(1, NOTIFY_QUEUE_SIZE)
+    NOTIFIER.digest_window = NOTIFY_DIGEST_SECONDS
+    TELEGRAM_BUCKET.rate = TELEGRAM_MESSAGES_PER_SECOND
+    TELEGRAM_BUCKET.burst = max(1, TELEGRAM_BURST)
+    NOTIFIER.start()
     send("🤖 Trading bot is live.")
     positions = sync_positions_with_exchange()
 
-    # Seed initial price history so strategies can act on the first cycle
+    # Seed initial price history so strategies can act on the first cycle,
+    # starting from the last snapshot where possible
     preload_symbols = list(WATCHLIST)
     for sym in positions.keys():
         if sym not in preload_symbols:
             preload_symbols.append(sym)
-    try:
-        preload_history(preload_symbols)
-    except TypeError:
-        preload_history()
-
-    threading.Thread(target=poll_telegram_commands, daemon=True).start()
-    while True:
+    restored = restore_snapshot(preload_symbols)
+    remaining = [sym for sym in preload_symbols if sym not in restored]
+    if remaining:
         try:
-            trade()
-        except Exception as e:
-            logger.exception("ERROR: %s", e)
-            send(f"⚠️ Bot error: {e}")
-        time.sleep(300)
+            preload_history(remaining)
+        except TypeError:
+            preload_history()
+
+    if METRICS.enabled and METRICS_PORT:
+        METRICS.serve(METRICS_PORT)
+    if PROFILE_CYCLES:
+        PROFILER.arm(PROFILE_CYCLES)
+    if PROFILE_SAMPLE_SECONDS:
+        start_stack_sampler(PROFILE_SAMPLE_SECONDS)
+    receiver = start_telegram_listener()
+    cadence = scheduler.CycleScheduler(CYCLE_SECONDS, CYCLE_BUDGET_SECONDS)
+    try:
+        while True:
+            deadline = cadence.wait()
+            CYCLE_STATS["overruns"] = cadence.overruns
+            CYCLE_STATS["skipped_slots"] = cadence.skipped
+            profiled: list = []
+            try:
+                with METRICS.span("cycle"), PROFILER.cycle() as profiled:
+                    trade(deadline)
+            except Exception as e:
+                logger.exception("ERROR: %s", e)
+                send(f"⚠️ Bot error: {e}", urgent=True)
+            if profiled:
+                send(f"🧪 Profile of {PROFILER.cycles} cycle(s) saved to {profiled[0]}")
+            record_cycle_metrics()
+            maybe_save_snapshot()
+    finally:
+        save_snapshot()
+        if receiver is not None:
+            receiver.stop()
+        NOTIFIER.stop(NOTIFY_FLUSH_SECONDS)
+        close_http_sessions()
             
 if __name__ == "__main__":
+    import klines
+
     parser = argparse.ArgumentParser(description="Trading bot")
     parser.add_argument(
         "--summary", action="store_true", help="Show wallet summary and exit"
     )
+    subparsers = parser.add_subparsers(dest="command")
+    download_parser = subparsers.add_parser(
+        "download-klines", help="Bulk download historical klines and exit"
+    )
+    klines.add_download_arguments(download_parser)
     args = parser.parse_args()
-    if args.summary:
-        logger.info(json.dumps(wallet_summary(), indent=2))
+    if args.command == "download-klines":
+        # Only public market data is needed, so skip credential validation
+        load_dotenv()
+        _load_settings()
+        logger.info(json.dumps(klines.run_download(args, WATCHLIST), indent=2))
     else:
-        main()
+        bootstrap()
+        if args.summary:
+            logger.info(json.dumps(wallet_summary(), indent=2))
+        else:
+            main()
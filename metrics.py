@@ -0,0 +1,219 @@
+"""Lightweight latency spans for the trade cycle.
+
+``main`` wraps each phase of ``trade()`` in :meth:`Metrics.span` and every
+:func:`main.call_with_retries` target is timed under its ``name=`` label, so a
+slow cycle can be attributed to Binance, NewsAPI, ATR klines, SQLite or
+Telegram.  Durations are kept in a bounded window per span and summarised as
+p50/p95/p99 in the Prometheus text format, either written to a file after
+every cycle or served from a local HTTP endpoint.
+
+When disabled, :meth:`Metrics.span` returns a shared no-op context manager and
+records nothing, so instrumented code pays one attribute lookup per span.
+
+Usage::
+
+    METRICS_ENABLED=1 METRICS_FILE=metrics.prom python main.py
+    METRICS_ENABLED=1 METRICS_PORT=9108 python main.py
+    curl -s localhost:9108/metrics
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Samples kept per span for the percentile estimates
+DEFAULT_WINDOW = 1024
+QUANTILES = (0.5, 0.95, 0.99)
+
+_KINDS = {
+    "phase": ("trade_bot_phase_seconds", "Duration of trade cycle phases."),
+    "call": ("trade_bot_call_seconds", "Duration of retried external calls, retries included."),
+}
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("_metrics", "_key", "_start")
+
+    def __init__(self, metrics: "Metrics", key: Tuple[str, str]) -> None:
+        self._metrics = metrics
+        self._key = key
+
+    def __enter__(self) -> "_Span":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self._metrics._record(self._key, time.perf_counter() - self._start)
+        return False
+
+
+class _Series:
+    __slots__ = ("window", "count", "total")
+
+    def __init__(self, size: int) -> None:
+        self.window: collections.deque = collections.deque(maxlen=size)
+        self.count = 0
+        self.total = 0.0
+
+
+def percentile(values, q: float) -> float:
+    """Nearest-rank percentile of ``values`` (``q`` in ``[0, 1]``)."""
+
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, min(len(ordered), -(-int(q * 1000) * len(ordered) // 1000)))
+    return ordered[rank - 1]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    """Collect span durations and render them as Prometheus summaries."""
+
+    def __init__(self, enabled: bool = False, window: int = DEFAULT_WINDOW) -> None:
+        self.enabled = enabled
+        self.window = window
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._cycle: Dict[Tuple[str, str], float] = {}
+        self._cycles = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._collectors: List[Callable[[], List[str]]] = []
+
+    def add_collector(self, collector: Callable[[], List[str]]) -> None:
+        """Append the Prometheus lines returned by ``collector`` to :meth:`render`."""
+
+        self._collectors.append(collector)
+
+    def span(self, name: str, kind: str = "phase"):
+        """Return a context manager timing the enclosed block as ``name``."""
+
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, (kind, name))
+
+    def observe(self, name: str, seconds: float, kind: str = "phase") -> None:
+        if self.enabled:
+            self._record((kind, name), seconds)
+
+    def _record(self, key: Tuple[str, str], seconds: float) -> None:
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = _Series(self.window)
+            series.window.append(seconds)
+            series.count += 1
+            series.total += seconds
+            self._cycle[key] = self._cycle.get(key, 0.0) + seconds
+
+    def end_cycle(self) -> Dict[str, float]:
+        """Close the current cycle and return its time per span.
+
+        Keys are ``"<kind>:<name>"``; the totals are reset for the next cycle.
+        """
+
+        with self._lock:
+            cycle, self._cycle = self._cycle, {}
+            self._cycles += 1
+        return {f"{kind}:{name}": seconds for (kind, name), seconds in cycle.items()}
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Return count, sum and percentiles for every span."""
+
+        with self._lock:
+            items = [
+                (key, list(s.window), s.count, s.total) for key, s in self._series.items()
+            ]
+        result: Dict[str, Dict[str, float]] = {}
+        for (kind, name), window, count, total in sorted(items):
+            stats = {"count": count, "sum": total}
+            for q in QUANTILES:
+                stats[f"p{int(q * 100)}"] = percentile(window, q)
+            result[f"{kind}:{name}"] = stats
+        return result
+
+    def render(self) -> str:
+        """Return all spans in the Prometheus text exposition format."""
+
+        summary = self.summary()
+        lines = [
+            "# HELP trade_bot_cycles_total Completed trade cycles.",
+            "# TYPE trade_bot_cycles_total counter",
+            f"trade_bot_cycles_total {self._cycles}",
+        ]
+        for kind, (metric, help_text) in _KINDS.items():
+            rows = [
+                (key.split(":", 1)[1], stats)
+                for key, stats in summary.items()
+                if key.startswith(f"{kind}:")
+            ]
+            if not rows:
+                continue
+            lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} summary"]
+            for name, stats in rows:
+                label = f'{kind}="{_escape(name)}"'
+                for q in QUANTILES:
+                    lines.append(
+                        f'{metric}{{{label},quantile="{q}"}} {stats[f"p{int(q * 100)}"]:.6f}'
+                    )
+                lines.append(f"{metric}_sum{{{label}}} {stats['sum']:.6f}")
+                lines.append(f"{metric}_count{{{label}}} {stats['count']}")
+        for collector in self._collectors:
+            try:
+                lines.extend(collector())
+            except Exception as exc:
+                logger.error("Metrics collector failed: %s", exc)
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Atomically write :meth:`render` output to ``path``."""
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+
+    def serve(self, port: int, host: str = "127.0.0.1"):
+        """Serve ``/metrics`` on a daemon thread and return the server."""
+
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        logger.info("📊 Metrics on http://%s:%d/metrics", host, self._server.server_port)
+        return self._server
+
+    def close(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
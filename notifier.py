@@ -0,0 +1,330 @@
+"""Background delivery of outbound Telegram notifications.
+
+``main.send`` used to post to Telegram inline, retries and backoff sleeps
+included, so a Telegram outage stalled ``trade()`` and stop-loss handling.
+:class:`Notifier` decouples the two: once started, :meth:`Notifier.submit`
+only appends the message to a bounded queue and a single sender thread
+delivers messages in order.
+
+When the queue is full the new message is merged into the last queued one
+while the result stays within Telegram's message size; otherwise the oldest
+queued message is dropped.  :meth:`Notifier.stop` flushes what is left.
+Until :meth:`Notifier.start` is called, messages are delivered synchronously.
+
+With a ``digest_window``, non-urgent messages submitted within the window are
+sent as one digest message; urgent ones (stop-losses, pending confirmations)
+skip both the digest and the queued backlog.  :class:`TokenBucket` keeps the
+bot within Telegram's per-chat rate limit.
+
+Calls that need an answer, such as sending a confirmation prompt and later
+editing it, go through :meth:`Notifier.call`.  They run on the sender thread
+in the urgent lane and return a :class:`concurrent.futures.Future`.
+"""
+
+from __future__ import annotations
+
+import collections
+import logging
+from concurrent.futures import Future
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUEUE_SIZE = 100
+# Telegram rejects messages longer than this
+MAX_MESSAGE_LENGTH = 4096
+DEFAULT_DIGEST_WINDOW = 3.0
+# Telegram allows about one message per second to a chat, with short bursts
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 3
+
+
+class TokenBucket:
+    """Allow ``rate`` calls per second with bursts of up to ``burst``.
+
+    A ``rate`` of zero or less disables the limit.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: int = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = float("-inf")
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Take one token, sleeping until one is available; return the wait."""
+
+        if self.rate <= 0:
+            return 0.0
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float) -> None:
+        """Hold all calls for ``seconds`` (Telegram's ``retry_after``)."""
+
+        with self._lock:
+            now = self._clock()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = now
+
+
+def _chunks(messages: List[str], max_length: int) -> List[str]:
+    """Join ``messages`` with newlines into as few chunks as fit ``max_length``."""
+
+    chunks: List[str] = []
+    for msg in messages:
+        if chunks and len(chunks[-1]) + 1 + len(msg) <= max_length:
+            chunks[-1] = f"{chunks[-1]}\n{msg}"
+        else:
+            chunks.append(msg)
+    return chunks
+
+
+class _Call:
+    """A queued :meth:`Notifier.call` and the future for its result."""
+
+    def __init__(self, fn: Callable[..., Any], args: tuple) -> None:
+        self.fn = fn
+        self.args = args
+        self.future: Future = Future()
+
+
+class Notifier:
+    """Deliver messages through ``deliver`` from a background thread.
+
+    ``deliver`` returns ``False`` (or raises) when a message could not be sent.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[str], object],
+        maxsize: int = DEFAULT_QUEUE_SIZE,
+        max_length: int = MAX_MESSAGE_LENGTH,
+        digest_window: float = 0.0,
+    ) -> None:
+        self.deliver = deliver
+        self.maxsize = max(1, maxsize)
+        self.max_length = max_length
+        self.digest_window = digest_window
+        self._queue: collections.deque[str] = collections.deque()
+        self._urgent: collections.deque[str | _Call] = collections.deque()
+        self._digest: List[str] = []
+        self._digest_due: float | None = None
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+        self._busy = False
+        self.stats: Dict[str, int] = {
+            "sent": 0, "merged": 0, "dropped": 0, "failed": 0, "digested": 0, "urgent": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "Notifier":
+        with self._cond:
+            if self.running:
+                return self
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, msg: str, urgent: bool = False) -> None:
+        """Queue ``msg`` for delivery, or deliver it now if not started.
+
+        Urgent messages are sent before anything else that is waiting.
+        """
+
+        if not self.running:
+            self._deliver(msg)
+            return
+        with self._cond:
+            if urgent:
+                self._urgent.append(msg)
+                self.stats["urgent"] += 1
+            elif self.digest_window > 0:
+                if not self._digest:
+                    self._digest_due = time.monotonic() + self.digest_window
+                self._digest.append(msg)
+            else:
+                self._enqueue(msg)
+            self._cond.notify_all()
+
+    def call(self, fn: Callable[..., Any], *args: Any) -> Future:
+        """Run ``fn(*args)`` on the sender thread; return a future for its result.
+
+        Calls go ahead of routine messages, in order with urgent ones, so a
+        later call sees the effects of an earlier one.  Until the notifier is
+        started the call runs at once and the future is already done.
+        """
+
+        job = _Call(fn, args)
+        if not self.running:
+            self._run_call(job)
+            return job.future
+        with self._cond:
+            self._urgent.append(job)
+            self.stats["urgent"] += 1
+            self._cond.notify_all()
+        return job.future
+
+    def _run_call(self, job: _Call) -> None:
+        try:
+            result = job.fn(*job.args)
+        except Exception as exc:
+            self.stats["failed"] += 1
+            logger.error("Notification call failed: %s", exc)
+            job.future.set_exception(exc)
+        else:
+            self.stats["sent"] += 1
+            job.future.set_result(result)
+
+    def _enqueue(self, msg: str) -> None:
+        # caller holds self._cond
+        if len(self._queue) >= self.maxsize:
+            last = self._queue[-1]
+            if len(last) + 1 + len(msg) <= self.max_length:
+                self._queue[-1] = f"{last}\n{msg}"
+                self.stats["merged"] += 1
+                return
+            self._queue.popleft()
+            self.stats["dropped"] += 1
+            logger.warning("📭 Notification queue full; dropped the oldest message")
+        self._queue.append(msg)
+
+    def _close_digest(self) -> None:
+        # caller holds self._cond
+        if not self._digest:
+            return
+        if len(self._digest) > 1:
+            self.stats["digested"] += len(self._digest)
+        for chunk in _chunks(self._digest, self.max_length):
+            self._enqueue(chunk)
+        self._digest = []
+        self._digest_due = None
+
+    def _waiting(self) -> bool:
+        return bool(self._queue or self._urgent or self._digest or self._busy)
+
+    def pending(self) -> int:
+        with self._cond:
+            return (
+                len(self._queue) + len(self._urgent) + len(self._digest) + (1 if self._busy else 0)
+            )
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until the queue is empty; return whether it drained in time."""
+
+        end = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._close_digest()
+            self._cond.notify_all()
+            while self._waiting():
+                if not self.running:
+                    return False
+                remaining = None if end is None else end - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """Flush the queue within ``timeout`` seconds and stop the sender."""
+
+        drained = self.flush(timeout)
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread, left = self._thread, len(self._queue) + len(self._urgent) + len(self._digest)
+        if thread is not None:
+            thread.join(max(0.1, timeout))
+        self._thread = None
+        if left:
+            logger.warning("📭 %d notification(s) not delivered at shutdown", left)
+        return drained
+
+    def prometheus_lines(self) -> List[str]:
+        lines = [
+            "# HELP trade_bot_notifications_queued Notifications waiting to be sent.",
+            "# TYPE trade_bot_notifications_queued gauge",
+            f"trade_bot_notifications_queued {self.pending()}",
+            "# HELP trade_bot_notifications_total Notifications by outcome.",
+            "# TYPE trade_bot_notifications_total counter",
+        ]
+        lines += [
+            f'trade_bot_notifications_total{{outcome="{k}"}} {v}'
+            for k, v in sorted(self.stats.items())
+        ]
+        return lines
+
+    def _deliver(self, msg: str) -> None:
+        try:
+            if self.deliver(msg) is False:
+                self.stats["failed"] += 1
+            else:
+                self.stats["sent"] += 1
+        except Exception as exc:
+            self.stats["failed"] += 1
+            logger.error("Notification delivery failed: %s", exc)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._digest and (
+                        self._stopping or time.monotonic() >= (self._digest_due or 0)
+                    ):
+                        self._close_digest()
+                    if self._urgent or self._queue or self._stopping:
+                        break
+                    timeout = None
+                    if self._digest_due is not None:
+                        timeout = max(0.0, self._digest_due - time.monotonic())
+                    self._cond.wait(timeout)
+                if self._urgent:
+                    msg = self._urgent.popleft()
+                elif self._queue:
+                    msg = self._queue.popleft()
+                else:
+                    return
+                self._busy = True
+            try:
+                if isinstance(msg, _Call):
+                    self._run_call(msg)
+                else:
+                    self._deliver(msg)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
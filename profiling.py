@@ -0,0 +1,187 @@
+"""On-demand profiling of the running bot.
+
+Two tools, both switchable at runtime without editing code:
+
+* :class:`CycleProfiler` runs the next ``N`` trade cycles under
+  :mod:`cProfile` and writes the combined stats as ``.prof`` (for
+  ``snakeviz``/``pstats``) plus a plain text top-list.
+* :class:`StackSampler` samples the stacks of all threads from a background
+  thread for a time window and writes them in collapsed-stack format
+  (``frame;frame;frame count``), ready for ``flamegraph.pl``, speedscope or
+  ``inferno``.  Its overhead is one ``sys._current_frames()`` walk per
+  interval, so it is safe to leave running on the live bot.
+
+Output goes to ``PROFILE_DIR`` (``profiles/`` by default).
+"""
+
+from __future__ import annotations
+
+import collections
+import contextlib
+import cProfile
+import datetime
+import io
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+DEFAULT_SAMPLE_INTERVAL = 0.01
+TOP_FUNCTIONS = 40
+
+
+def _output_path(directory: str, prefix: str, suffix: str) -> str:
+    os.makedirs(directory, exist_ok=True)
+    stamp = datetime.datetime.now(datetime.timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return os.path.join(directory, f"{prefix}-{stamp}{suffix}")
+
+
+class CycleProfiler:
+    """Profile the next ``N`` cycles wrapped in :meth:`cycle`."""
+
+    def __init__(self, directory: str | None = None) -> None:
+        self.directory = directory or PROFILE_DIR
+        self.remaining = 0
+        self.cycles = 0
+        self._profile: cProfile.Profile | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.remaining > 0 or self._profile is not None
+
+    def arm(self, cycles: int = 1) -> None:
+        """Profile the next ``cycles`` cycles (added to any pending request)."""
+
+        with self._lock:
+            self.remaining += max(1, int(cycles))
+
+    @contextlib.contextmanager
+    def cycle(self):
+        """Profile the enclosed cycle if armed.
+
+        Yields a one-element list that receives the stats path once the last
+        requested cycle has finished.
+        """
+
+        result: list = []
+        with self._lock:
+            armed = self.remaining > 0
+            if armed:
+                self.remaining -= 1
+                if self._profile is None:
+                    self._profile = cProfile.Profile()
+                    self.cycles = 0
+        if not armed:
+            yield result
+            return
+
+        profile = self._profile
+        profile.enable()
+        try:
+            yield result
+        finally:
+            profile.disable()
+            self.cycles += 1
+            if self.remaining == 0:
+                result.append(self._dump(profile))
+
+    def _dump(self, profile: cProfile.Profile) -> str:
+        path = _output_path(self.directory, "cprofile", ".prof")
+        profile.dump_stats(path)
+        text = io.StringIO()
+        stats = pstats.Stats(profile, stream=text)
+        stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+        with open(path[: -len(".prof")] + ".txt", "w", encoding="utf-8") as f:
+            f.write(f"{self.cycles} cycle(s)\n")
+            f.write(text.getvalue())
+        self._profile = None
+        logger.info("🧪 Profiled %d cycle(s) → %s", self.cycles, path)
+        return path
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Sample every thread's stack at ``interval`` seconds for ``duration``."""
+
+    def __init__(
+        self,
+        duration: float,
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        directory: str | None = None,
+        on_done: Callable[[str], None] | None = None,
+    ) -> None:
+        self.duration = duration
+        self.interval = interval
+        self.directory = directory or PROFILE_DIR
+        self.on_done = on_done
+        self.samples = 0
+        self.stacks: Dict[str, int] = collections.Counter()
+        self.path: str | None = None
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> "StackSampler":
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def join(self, timeout: float | None = None) -> str | None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.path
+
+    def sample(self) -> None:
+        """Record one stack per thread (except the sampler itself)."""
+
+        names = {t.ident: t.name for t in threading.enumerate()}
+        own = threading.get_ident()
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, f"thread-{ident}"))
+            self.stacks[";".join(reversed(labels))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        deadline = time.monotonic() + self.duration
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            self.sample()
+            self._stop.wait(self.interval)
+        self.path = self.write()
+        if self.on_done is not None:
+            try:
+                self.on_done(self.path)
+            except Exception as exc:
+                logger.error("Sampler callback failed: %s", exc)
+
+    def write(self) -> str:
+        """Write the collapsed stacks and return the file path."""
+
+        path = _output_path(self.directory, "samples", ".folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+        logger.info("🧪 %d stack samples → %s", self.samples, path)
+        return path
@@ -0,0 +1,275 @@
+"""Offline wallet and PnL report.
+
+Unlike ``python main.py --summary`` this entry point does not import
+``main``: it builds no exchange client, loads no strategy and never creates
+or migrates a database.  Everything is read from the local state the bot
+keeps — ``balance.json``, the ``trades``/``positions`` tables of
+``trading.db`` and the last recorded prices in ``prices.db`` — so a report
+returns in milliseconds even when Binance is unreachable.  ``--refresh``
+opts into fetching the live USDT balance.
+
+Usage::
+
+    python report.py
+    python report.py --json --refresh
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, List
+
+logger = logging.getLogger(__name__)
+
+BALANCE_FILE = "balance.json"
+PRICES_DB_FILE = "prices.db"
+START_BALANCE = 100.32
+
+
+def _connect_ro(path: str) -> sqlite3.Connection | None:
+    """Open ``path`` read-only, or return ``None`` if it does not exist."""
+
+    if not os.path.exists(path):
+        return None
+    return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+
+
+def _to_float(value, default):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def read_balance(path: str = BALANCE_FILE) -> Dict[str, float]:
+    """Return the stored balance state without rewriting the file."""
+
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, json.JSONDecodeError):
+        data = {}
+    start = _to_float(data.get("start_balance"), START_BALANCE)
+    usdt = _to_float(data.get("usdt"), start)
+    return {
+        "start_balance": start,
+        "usdt": usdt,
+        "total": _to_float(data.get("total"), usdt),
+    }
+
+
+def read_positions(trade_db: str) -> Dict[str, Dict[str, Any]]:
+    conn = _connect_ro(trade_db)
+    if conn is None:
+        return {}
+    try:
+        rows = conn.execute(
+            "SELECT symbol, qty, entry, stop_loss, take_profit FROM positions"
+        ).fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        conn.close()
+    return {
+        row[0]: {"qty": row[1], "entry": row[2], "stop_loss": row[3], "take_profit": row[4]}
+        for row in rows
+    }
+
+
+def read_last_prices(symbols, prices_db: str = PRICES_DB_FILE) -> Dict[str, float]:
+    """Return the most recently recorded price of each symbol in ``symbols``."""
+
+    symbols = list(symbols)
+    conn = _connect_ro(prices_db)
+    if conn is None or not symbols:
+        return {}
+    placeholders = ",".join("?" for _ in symbols)
+    try:
+        rows = conn.execute(
+            f"""
+            SELECT symbol, price FROM prices AS p
+            WHERE symbol IN ({placeholders}) AND rowid = (
+                SELECT rowid FROM prices WHERE symbol = p.symbol
+                ORDER BY timestamp DESC, rowid DESC LIMIT 1
+            )
+            """,
+            symbols,
+        ).fetchall()
+    except sqlite3.Error:
+        rows = []
+    finally:
+        conn.close()
+    return {sym: price for sym, price in rows}
+
+
+def read_pnl(trade_db: str, recent: int = 10) -> Dict[str, Any]:
+    """Aggregate realised PnL from the ``trades`` table."""
+
+    empty = {"closed_trades": 0, "realized_pnl": 0.0, "win_rate_pct": 0.0,
+             "avg_pnl_pct_recent": 0.0, "by_symbol": []}
+    conn = _connect_ro(trade_db)
+    if conn is None:
+        return empty
+    try:
+        total = conn.execute(
+            """
+            SELECT COUNT(*), COALESCE(SUM(COALESCE(pnl_usdt, profit)), 0),
+                   SUM(CASE WHEN COALESCE(pnl_usdt, profit) > 0 THEN 1 ELSE 0 END)
+            FROM trades WHERE COALESCE(pnl_usdt, profit) IS NOT NULL
+            """
+        ).fetchone()
+        recent_avg = conn.execute(
+            """
+            SELECT AVG(pnl_pct) FROM (
+                SELECT pnl_pct FROM trades WHERE pnl_pct IS NOT NULL
+                ORDER BY timestamp DESC LIMIT ?
+            )
+            """,
+            (recent,),
+        ).fetchone()[0]
+        by_symbol = conn.execute(
+            """
+            SELECT symbol, COUNT(*), SUM(COALESCE(pnl_usdt, profit))
+            FROM trades WHERE COALESCE(pnl_usdt, profit) IS NOT NULL
+            GROUP BY symbol ORDER BY SUM(COALESCE(pnl_usdt, profit)) DESC
+            """
+        ).fetchall()
+    except sqlite3.Error:
+        return empty
+    finally:
+        conn.close()
+    count, realized, wins = total
+    return {
+        "closed_trades": count,
+        "realized_pnl": realized,
+        "win_rate_pct": (wins or 0) / count * 100 if count else 0.0,
+        "avg_pnl_pct_recent": recent_avg or 0.0,
+        "by_symbol": [
+            {"symbol": sym, "trades": n, "pnl": pnl} for sym, n, pnl in by_symbol
+        ],
+    }
+
+
+def fetch_usdt_balance(timeout: float = 5.0) -> float | None:
+    """Fetch the free USDT balance from Binance, or ``None`` on any failure."""
+
+    try:
+        from binance.client import Client
+
+        client = Client(
+            os.getenv("BINANCE_API_KEY"),
+            os.getenv("BINANCE_SECRET_KEY"),
+            requests_params={"timeout": timeout},
+            ping=False,
+        )
+        if os.getenv("TRADING_MODE", "spot").strip().lower() == "margin":
+            account = client.get_margin_account() or {}
+            for asset in account.get("userAssets") or []:
+                if asset.get("asset") == "USDT":
+                    return float(asset.get("free") or 0.0)
+            return 0.0
+        bal = client.get_asset_balance(asset="USDT") or {}
+        return float(bal.get("free", 0) or 0.0)
+    except Exception as exc:
+        logger.warning("USDT balance refresh failed: %s", exc)
+        return None
+
+
+def build_report(
+    balance_path: str = BALANCE_FILE,
+    trade_db: str | None = None,
+    prices_db: str = PRICES_DB_FILE,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """Collect balances, open positions and realised PnL from local state.
+
+    The ``start_balance``/``current_balance``/``positions`` keys match
+    ``main.wallet_summary`` so the result can be passed to
+    ``main.format_balance_breakdown``.
+    """
+
+    trade_db = trade_db or os.getenv("TRADE_DB_FILE", "trading.db")
+    balance = read_balance(balance_path)
+    current = balance["usdt"]
+    source = "stored"
+    if refresh:
+        live = fetch_usdt_balance()
+        if live is not None:
+            current, source = live, "exchange"
+
+    positions = read_positions(trade_db)
+    last_prices = read_last_prices(positions, prices_db)
+    pos_list: List[Dict[str, Any]] = []
+    unrealized = 0.0
+    for sym, info in positions.items():
+        qty = info["qty"] or 0.0
+        entry = info["entry"] or 0.0
+        last = last_prices.get(sym)
+        pnl = (last - entry) * qty if last is not None else None
+        if pnl is not None:
+            unrealized += pnl
+        pos_list.append(
+            {"symbol": sym, "qty": qty, "entry": entry, "last_price": last, "unrealized_pnl": pnl}
+        )
+
+    return {
+        "start_balance": balance["start_balance"],
+        "current_balance": current,
+        "balance_source": source,
+        "stored_total": balance["total"],
+        "positions": pos_list,
+        "unrealized_pnl": unrealized,
+        **read_pnl(trade_db),
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    lines = [
+        "💼 Wallet report",
+        f"• Starting balance: ${report['start_balance']:.2f}",
+        f"• Liquidity: ${report['current_balance']:.2f} ({report['balance_source']})",
+        f"• Last recorded total: ${report['stored_total']:.2f}",
+    ]
+    if report["positions"]:
+        lines.append("• Positions:")
+        for pos in report["positions"]:
+            line = f"  - {pos['symbol']}: {pos['qty']:g} @ ${pos['entry']:.2f}"
+            if pos["last_price"] is not None:
+                line += f" → ${pos['last_price']:.2f} ({pos['unrealized_pnl']:+.2f})"
+            lines.append(line)
+        lines.append(f"• Unrealized PnL: ${report['unrealized_pnl']:+.2f}")
+    else:
+        lines.append("• Positions: none")
+    lines.append(
+        f"• Realized PnL: ${report['realized_pnl']:+.2f} over {report['closed_trades']} trades "
+        f"({report['win_rate_pct']:.1f}% wins, avg last 10: {report['avg_pnl_pct_recent']:.2f}%)"
+    )
+    for row in report["by_symbol"]:
+        lines.append(f"  - {row['symbol']}: {row['trades']} trades, ${row['pnl']:+.2f}")
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline wallet and PnL report")
+    parser.add_argument("--balance-file", default=BALANCE_FILE)
+    parser.add_argument("--trade-db", default=None, help="default: TRADE_DB_FILE or trading.db")
+    parser.add_argument("--prices-db", default=PRICES_DB_FILE)
+    parser.add_argument("--refresh", action="store_true", help="fetch the live USDT balance")
+    parser.add_argument("--json", action="store_true", help="print raw JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    report = build_report(args.balance_file, args.trade_db, args.prices_db, args.refresh)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    logger.debug("Report built in %.1f ms", (time.perf_counter() - started) * 1000)
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -84,3 +84,100 @@ def calculate_position_size(
         logger.debug(msg)
         return 0.0, None, msg
     return qty, stop_loss, None
+
+
+def calculate_fee_adjusted_take_profit(
+    entry: float,
+    stop: float | None,
+    trail: float | None,
+    fee_rate: float,
+    risk_reward: float,
+    min_exit_pnl_pct: float,
+) -> float:
+    """Return a take-profit price that stays profitable after fees.
+
+    The helper keeps the original risk-reward target anchored at the entry
+    price, but adjusts it whenever the exchange fees would otherwise erase the
+    profit. The new stop price is used to measure the actual downside if the
+    stop were triggered after fees, ensuring the adjusted target still respects
+    the configured risk-reward multiple while guaranteeing that the realized
+    profit clears the configured ``min_exit_pnl_pct`` threshold on execution.
+    """
+
+    if stop is None:
+        stop = entry
+    if trail is None:
+        trail = stop
+
+    entry_cost = entry * (1 + fee_rate)
+    stop_value = stop * (1 - fee_rate)
+    risk_after_fees = max(entry_cost - stop_value, 0.0)
+    risk_distance = max(trail - stop, 0.0)
+
+    base_target = entry + risk_distance * risk_reward
+    required_profit = max(
+        risk_after_fees * risk_reward,
+        entry_cost * (min_exit_pnl_pct / 100.0),
+    )
+
+    net_profit = base_target * (1 - fee_rate) - entry_cost
+    if net_profit < required_profit:
+        base_target = (entry_cost + required_profit) / (1 - fee_rate)
+
+    return base_target
+
+
+def update_trailing_stop(
+    position: dict,
+    price: float,
+    stop_distance: float,
+    fee_rate: float,
+    risk_reward: float,
+    min_exit_pnl_pct: float,
+):
+    """Trail the stop of an open ``position`` and move it to break-even.
+
+    When ``price`` sets a new high the trail price follows it and the stop is
+    placed ``stop_distance`` below.  Once the price has moved at least
+    ``stop_distance`` above the entry, a stop still below entry is lifted to
+    break-even.  Whenever the stop changes the take profit is recomputed with
+    :func:`calculate_fee_adjusted_take_profit`.  ``position`` is updated in
+    place.
+
+    Returns
+    -------
+    tuple (stop, event)
+        stop:  the stop price now in effect (may be ``None``)
+        event: ``"break_even"``, ``"trailed"`` or ``None`` if nothing changed
+    """
+
+    entry = position["entry"]
+    trail = position.get("trail_price", entry)
+
+    updated = False
+    if price > trail:
+        trail = price
+        position["trail_price"] = trail
+        stop = trail - stop_distance
+        updated = True
+    else:
+        stop = position.get("stop_loss")
+
+    if stop is not None and price - entry >= stop_distance and stop < entry:
+        event = "break_even"
+        stop = entry
+    elif updated:
+        event = "trailed"
+    else:
+        return stop, None
+
+    position["stop_loss"] = stop
+    position["take_profit"] = calculate_fee_adjusted_take_profit(
+        entry,
+        stop,
+        trail,
+        fee_rate,
+        risk_reward,
+        min_exit_pnl_pct,
+    )
+    return stop, event
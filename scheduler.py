@@ -0,0 +1,61 @@
+"""Fixed-cadence trade cycle scheduling.
+
+The bot used to ``sleep(CYCLE_SECONDS)`` after each cycle, so every slow
+cycle pushed all later ones back.  :class:`CycleScheduler` keeps cycles on a
+fixed grid of ``interval`` seconds instead: after a short cycle it sleeps only
+for the rest of the slot, after an overrun it starts the next cycle at once,
+and when a cycle ran over several slots the missed ones are skipped rather
+than run back to back.  Each cycle gets a time budget; :meth:`wait` returns
+its deadline as a ``time.monotonic()`` value.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+# Share of the interval a cycle may use when no budget is given
+DEFAULT_BUDGET_FRACTION = 0.8
+
+
+class CycleScheduler:
+    """Start cycles every ``interval`` seconds with drift compensation."""
+
+    def __init__(
+        self,
+        interval: float,
+        budget: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.interval = interval
+        self.budget = interval * DEFAULT_BUDGET_FRACTION if budget is None else budget
+        self._clock = clock
+        self._sleep = sleep
+        self.next_start: float | None = None
+        self.cycles = 0
+        self.overruns = 0
+        self.skipped = 0
+
+    def wait(self) -> float:
+        """Sleep until the next slot and return the cycle's deadline."""
+
+        now = self._clock()
+        if self.next_start is None:
+            self.next_start = now
+        elif now < self.next_start:
+            self._sleep(self.next_start - now)
+            now = self._clock()
+        elif now > self.next_start:
+            self.overruns += 1
+            missed = int((now - self.next_start) // self.interval)
+            if missed:
+                self.skipped += missed
+                self.next_start += missed * self.interval
+                logger.warning("⏳ Cycle overran; skipped %d slot(s)", missed)
+        self.next_start += self.interval
+        self.cycles += 1
+        return now + self.budget
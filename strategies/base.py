@@ -6,7 +6,11 @@ from typing import Protocol, Sequence, Dict
 class Strategy(Protocol):
     """Trading strategy interface.
 
-    Implementations decide when to enter and exit positions.
+    Implementations decide when to enter and exit positions.  ``headlines``
+    may be fetched lazily on first access, so implementations should check
+    their cheap technical conditions before touching them.  The price is
+    therefore recorded before any news check: a buy rejected for its news
+    still extends the symbol's history.
     """
 
     def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
@@ -22,3 +26,12 @@ class Strategy(Protocol):
     ) -> bool:
         """Return True if an existing position should be closed."""
         ...
+
+    def warmup_period(self) -> int:
+        """Return how many recent prices are needed before signals are valid.
+
+        Start-up preloading fetches exactly this much history per symbol.  The
+        default covers strategies that only expose ``short_window`` and
+        ``long_window``.
+        """
+        return max(getattr(self, "short_window", 0), getattr(self, "long_window", 0))
@@ -0,0 +1,49 @@
+"""Helpers for evaluating strategy signals across many symbols at once."""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Sequence, Tuple
+
+import numpy as np
+
+
+def price_matrix(
+    histories: Mapping[str, Sequence[float]],
+    symbols: Sequence[str],
+    window: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lay out the trailing ``window`` prices of each symbol in a 2D array.
+
+    Returns a ``(len(symbols), window)`` float array ordered oldest to newest
+    along the second axis, plus a boolean mask marking the rows that had at
+    least ``window`` prices available.  Rows without enough history are left
+    filled with ``NaN`` so callers can ignore them via the mask.
+    """
+
+    matrix = np.full((len(symbols), window), np.nan, dtype=float)
+    ready = np.zeros(len(symbols), dtype=bool)
+    if window <= 0:
+        return matrix, ready
+
+    rows: List[int] = []
+    tails: List[Sequence[float]] = []
+    for idx, symbol in enumerate(symbols):
+        prices = histories.get(symbol) or ()
+        if len(prices) >= window:
+            rows.append(idx)
+            tails.append(prices[-window:])
+
+    if rows:
+        matrix[rows] = np.asarray(tails, dtype=float)
+        ready[rows] = True
+    return matrix, ready
+
+
+def record_prices(
+    history: Dict[str, List[float]], prices: Mapping[str, float]
+) -> List[str]:
+    """Append ``prices`` to ``history`` and return the symbols in input order."""
+
+    for symbol, price in prices.items():
+        history.setdefault(symbol, []).append(price)
+    return list(prices)
@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+from .base import Strategy
+from .batch import record_prices
+from .news import HeadlineFilter, NewsScreen
+from .sentiment import SentimentScorer
+
+
+class EnsembleStrategy(NewsScreen, Strategy):
+    """Combine the signals of several strategies into one decision.
+
+    All members share the ensemble's ``history`` dictionary, so each price is
+    recorded once and no member keeps its own copy of the series.  Members must
+    expose ``buy_signal(prices)`` and ``sell_signal(prices, position, price)``
+    which evaluate an already recorded history.
+
+    ``mode="vote"`` acts when more than half of the members agree, while
+    ``mode="weight"`` acts when the weighted share of agreeing members reaches
+    ``threshold``.
+    """
+
+    def __init__(
+        self,
+        members: Sequence[Strategy],
+        weights: Sequence[float] | None = None,
+        mode: str = "vote",
+        threshold: float = 0.5,
+        bad_words: Sequence[str] | None = None,
+        sentiment: SentimentScorer | None = None,
+        min_sentiment: float = 0.0,
+    ) -> None:
+        if not members:
+            raise ValueError("EnsembleStrategy requires at least one member")
+        if mode not in {"vote", "weight"}:
+            raise ValueError(f"Unknown ensemble mode '{mode}'")
+        if weights is not None and len(weights) != len(members):
+            raise ValueError("weights must match the number of members")
+
+        self.members = list(members)
+        self.weights = [float(w) for w in weights] if weights else [1.0] * len(members)
+        self.mode = mode
+        self.threshold = threshold
+        self.bad_words = [w.lower() for w in (bad_words or [])]
+        self.headline_filter = HeadlineFilter(self.bad_words)
+        self.sentiment = sentiment
+        self.min_sentiment = min_sentiment
+        self.history: Dict[str, List[float]] = {}
+        for member in self.members:
+            member.history = self.history
+
+    # -- helpers -----------------------------------------------------------
+    def warmup_period(self) -> int:
+        """Return the longest warm-up of any member."""
+
+        return max(
+            m.warmup_period() if hasattr(m, "warmup_period") else Strategy.warmup_period(m)
+            for m in self.members
+        )
+
+    def _combine(self, votes: Sequence[bool]) -> bool:
+        if self.mode == "vote":
+            return sum(votes) * 2 > len(votes)
+        total = sum(self.weights)
+        if total <= 0:
+            return False
+        score = sum(w for w, v in zip(self.weights, votes) if v) / total
+        return score >= self.threshold
+
+    # -- signals -----------------------------------------------------------
+    def buy_signal(self, prices: List[float]) -> bool:
+        """Return the combined technical buy signal of all members."""
+
+        return self._combine([m.buy_signal(prices) for m in self.members])
+
+    def sell_signal(
+        self, prices: List[float], position: Dict[str, float], price: float
+    ) -> bool:
+        """Return the combined exit signal of all members."""
+
+        return self._combine(
+            [m.sell_signal(prices, position, price) for m in self.members]
+        )
+
+    def buy_signals(self, symbols: Sequence[str]) -> np.ndarray:
+        """Return :meth:`buy_signal` for the recorded history of each symbol.
+
+        Members with a vectorized ``buy_signals`` evaluate all symbols at
+        once; others fall back to ``buy_signal`` per symbol.
+        """
+
+        votes = np.array(
+            [
+                m.buy_signals(symbols)
+                if hasattr(m, "buy_signals")
+                else [m.buy_signal(self.history.get(sym, [])) for sym in symbols]
+                for m in self.members
+            ],
+            dtype=bool,
+        ).reshape(len(self.members), len(symbols))
+        if self.mode == "vote":
+            return votes.sum(axis=0) * 2 > len(self.members)
+        total = sum(self.weights)
+        if total <= 0:
+            return np.zeros(len(symbols), dtype=bool)
+        return np.asarray(self.weights) @ votes / total >= self.threshold
+
+    # -- history management ------------------------------------------------
+    def seed_history(self, symbol: str, prices: Sequence[float]) -> None:
+        """Seed the shared price history for ``symbol``."""
+
+        self.history[symbol] = list(prices)
+
+    # -- Strategy API ------------------------------------------------------
+    def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        if not self.buy_signal(prices):
+            return False
+        return not self._rejects_news(symbol, headlines)
+
+    def evaluate_batch(
+        self,
+        prices: Mapping[str, float],
+        headlines: Mapping[str, Sequence[str]] | None = None,
+    ) -> Dict[str, bool]:
+        """Evaluate combined buy signals for many symbols in one pass.
+
+        Equivalent to calling :meth:`should_buy` for every ``symbol -> price``
+        pair: prices are recorded once in the shared history and each member
+        votes on all symbols together.  Headlines are only consulted for
+        symbols the ensemble would buy; omit ``headlines`` to skip news
+        filtering.
+        """
+
+        signals = {symbol: False for symbol in prices}
+        symbols = record_prices(self.history, prices)
+        if not symbols:
+            return signals
+
+        buy = self.buy_signals(symbols)
+        for symbol, flag in zip(symbols, buy.tolist()):
+            if flag and headlines is not None:
+                flag = not self._rejects_news(symbol, headlines.get(symbol) or ())
+            signals[symbol] = flag
+        return signals
+
+    def should_sell(
+        self,
+        symbol: str,
+        position: Dict[str, float],
+        price: float,
+        headlines: Sequence[str],
+    ) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        return self.sell_signal(prices, position, price)
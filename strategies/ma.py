@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List, Sequence
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
 
 from .base import Strategy
+from .batch import price_matrix, record_prices
+from .news import HeadlineFilter, NewsScreen
+from .sentiment import SentimentScorer
 
 
-class MovingAverageCrossStrategy(Strategy):
+class MovingAverageCrossStrategy(NewsScreen, Strategy):
     """Simple moving‑average crossover strategy.
 
     The strategy maintains an in-memory price history for each symbol. It
@@ -21,11 +26,16 @@ class MovingAverageCrossStrategy(Strategy):
         bad_words: Sequence[str] | None = None,
         fee_rate: float = 0.0,
         min_pnl_pct: float = 0.0,
+        sentiment: SentimentScorer | None = None,
+        min_sentiment: float = 0.0,
     ) -> None:
         self.short_window = short_window
         self.long_window = long_window
         self.history: Dict[str, List[float]] = {}
         self.bad_words = [w.lower() for w in (bad_words or [])]
+        self.headline_filter = HeadlineFilter(self.bad_words)
+        self.sentiment = sentiment
+        self.min_sentiment = min_sentiment
         self.fee_rate = fee_rate
         self.min_pnl_pct = min_pnl_pct
 
@@ -45,14 +55,9 @@ class MovingAverageCrossStrategy(Strategy):
 
         self.history[symbol] = list(prices)
 
-    # -- Strategy API ------------------------------------------------------
-    def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
-        # basic news filter
-        if any(bad in h.lower() for h in headlines for bad in self.bad_words):
-            return False
-
-        prices = self.history.setdefault(symbol, [])
-        prices.append(price)
+    # -- signals -----------------------------------------------------------
+    def buy_signal(self, prices: List[float]) -> bool:
+        """Return the technical buy signal for an already recorded history."""
 
         if len(prices) < self.long_window:
             # not enough data yet – wait for sufficient history
@@ -64,15 +69,10 @@ class MovingAverageCrossStrategy(Strategy):
             return False
         return short > long
 
-    def should_sell(
-        self,
-        symbol: str,
-        position: Dict[str, float],
-        price: float,
-        headlines: Sequence[str],
+    def sell_signal(
+        self, prices: List[float], position: Dict[str, float], price: float
     ) -> bool:
-        prices = self.history.setdefault(symbol, [])
-        prices.append(price)
+        """Return the exit signal for an already recorded history."""
 
         take_profit = position.get("take_profit")
         if take_profit and price >= take_profit:
@@ -95,3 +95,66 @@ class MovingAverageCrossStrategy(Strategy):
             pnl_pct = (profit / entry_cost) * 100
             return pnl_pct >= self.min_pnl_pct - 1e-6
         return False
+
+    # -- Strategy API ------------------------------------------------------
+    def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        if not self.buy_signal(prices):
+            return False
+        # news filter last: headlines may be fetched lazily on first access
+        return not self._rejects_news(symbol, headlines)
+
+    def evaluate_batch(
+        self,
+        prices: Mapping[str, float],
+        headlines: Mapping[str, Sequence[str]] | None = None,
+    ) -> Dict[str, bool]:
+        """Evaluate buy signals for many symbols in one vectorized pass.
+
+        Equivalent to calling :meth:`should_buy` for every ``symbol -> price``
+        pair: each price is appended to the symbol's history and the
+        short/long averages of all symbols are then computed together on a
+        ``symbols x window`` array.  Headlines are only consulted for symbols
+        with a technical buy signal; omit ``headlines`` to skip news filtering.
+        """
+
+        signals = {symbol: False for symbol in prices}
+        symbols = record_prices(self.history, prices)
+        if not symbols:
+            return signals
+
+        buy = self.buy_signals(symbols)
+        for symbol, flag in zip(symbols, buy.tolist()):
+            if flag and headlines is not None:
+                flag = not self._rejects_news(symbol, headlines.get(symbol) or ())
+            signals[symbol] = flag
+        return signals
+
+    def buy_signals(self, symbols: Sequence[str]) -> np.ndarray:
+        """Return :meth:`buy_signal` for the recorded history of each symbol.
+
+        The short/long averages of all symbols are computed together on a
+        ``symbols x window`` array; the result is a boolean array aligned with
+        ``symbols``.
+        """
+
+        window = max(self.short_window, self.long_window)
+        matrix, ready = price_matrix(self.history, symbols, window)
+        if not ready.any():
+            return ready
+
+        short = matrix[:, -self.short_window:].mean(axis=1)
+        long = matrix[:, -self.long_window:].mean(axis=1)
+        return ready & (short > long)
+
+    def should_sell(
+        self,
+        symbol: str,
+        position: Dict[str, float],
+        price: float,
+        headlines: Sequence[str],
+    ) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        return self.sell_signal(prices, position, price)
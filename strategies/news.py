@@ -0,0 +1,78 @@
+"""Compiled keyword matching and news screening for strategies."""
+
+from __future__ import annotations
+
+import functools
+import re
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+if TYPE_CHECKING:
+    from .sentiment import SentimentScorer
+
+
+class HeadlineFilter:
+    """Reject headlines that mention any of ``bad_words``.
+
+    All keywords are compiled once into a single case-insensitive regular
+    expression, so a headline is scanned in one pass regardless of how many
+    keywords are configured.  A keyword only matches at the start of a word
+    ("ban" matches "Ban", "bans" and "banned" but not "urban").  Verdicts are
+    memoized per headline because the same articles are returned for many
+    symbols and on every cycle.
+    """
+
+    def __init__(self, bad_words: Iterable[str] | None = None, cache_size: int = 4096) -> None:
+        words = sorted({w.strip().lower() for w in (bad_words or []) if w.strip()})
+        self.bad_words = words
+        if words:
+            # Longest alternatives first so overlapping keywords match greedily
+            alternatives = "|".join(
+                re.escape(w) for w in sorted(words, key=len, reverse=True)
+            )
+            self._pattern: re.Pattern[str] | None = re.compile(
+                rf"(?<!\w)(?:{alternatives})", re.IGNORECASE
+            )
+        else:
+            self._pattern = None
+        self._verdict = functools.lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, headline: str) -> bool:
+        return self._pattern.search(headline) is not None
+
+    def is_bad(self, headline: str) -> bool:
+        """Return ``True`` if ``headline`` mentions a blocked keyword."""
+
+        if self._pattern is None or not headline:
+            return False
+        return self._verdict(headline)
+
+    def blocked(self, headlines: Sequence[str]) -> bool:
+        """Return ``True`` if any of ``headlines`` mentions a blocked keyword."""
+
+        if self._pattern is None:
+            return False
+        return any(self.is_bad(h) for h in headlines)
+
+
+class NewsScreen:
+    """Headline and sentiment checks shared by the strategies.
+
+    Mixed into strategies that set ``headline_filter``, ``sentiment`` and
+    ``min_sentiment``.  ``headlines`` may be fetched lazily, so call
+    :meth:`_rejects_news` only after the technical signal has fired.
+    """
+
+    headline_filter: HeadlineFilter
+    sentiment: "SentimentScorer | None"
+    min_sentiment: float
+
+    def _is_blocked(self, headlines: Sequence[str]) -> bool:
+        return self.headline_filter.blocked(headlines)
+
+    def _sentiment_too_low(self, symbol: str, headlines: Sequence[str]) -> bool:
+        if self.sentiment is None or not headlines:
+            return False
+        return self.sentiment.update(symbol, headlines) < self.min_sentiment
+
+    def _rejects_news(self, symbol: str, headlines: Sequence[str]) -> bool:
+        return self._is_blocked(headlines) or self._sentiment_too_low(symbol, headlines)
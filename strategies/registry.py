@@ -0,0 +1,123 @@
+"""Name based strategy registry with lazy imports.
+
+Strategies are registered as ``"module:attribute"`` strings and only imported
+when first requested, so loading the bot does not pull in every strategy (and
+its dependencies) up front.  Third-party packages can contribute strategies by
+declaring an entry point in the ``trade_bot.strategies`` group::
+
+    [project.entry-points."trade_bot.strategies"]
+    breakout = "my_package.breakout:BreakoutStrategy"
+"""
+
+from __future__ import annotations
+
+import importlib
+import logging
+from importlib import metadata
+from typing import Any, Callable, Dict, List, Mapping, Sequence
+
+from .base import Strategy
+
+logger = logging.getLogger(__name__)
+
+ENTRY_POINT_GROUP = "trade_bot.strategies"
+
+_BUILTIN: Dict[str, str] = {
+    "ma": "strategies.ma:MovingAverageCrossStrategy",
+    "rsi": "strategies.rsi:RSIStrategy",
+}
+
+_registry: Dict[str, str | Callable[..., Strategy]] = dict(_BUILTIN)
+_loaded: Dict[str, Callable[..., Strategy]] = {}
+_entry_points_scanned = False
+
+
+def register(name: str, target: str | Callable[..., Strategy]) -> None:
+    """Register ``target`` under ``name``.
+
+    ``target`` is either a strategy factory (usually the class itself) or a
+    ``"module:attribute"`` string that is imported on first use.
+    """
+
+    key = name.strip().lower()
+    _registry[key] = target
+    _loaded.pop(key, None)
+
+
+def _scan_entry_points() -> None:
+    global _entry_points_scanned
+    if _entry_points_scanned:
+        return
+    _entry_points_scanned = True
+    try:
+        eps = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as exc:  # pragma: no cover - broken metadata
+        logger.warning("Strategy entry point discovery failed: %s", exc)
+        return
+    for ep in eps:
+        # Explicit registrations win over installed plug-ins
+        _registry.setdefault(ep.name.lower(), ep.value)
+
+
+def available() -> List[str]:
+    """Return the sorted names of all known strategies."""
+
+    _scan_entry_points()
+    return sorted(_registry)
+
+
+def load(name: str) -> Callable[..., Strategy]:
+    """Return the factory registered under ``name``, importing it if needed."""
+
+    key = name.strip().lower()
+    if key in _loaded:
+        return _loaded[key]
+
+    if key not in _registry:
+        _scan_entry_points()
+    target = _registry.get(key)
+    if target is None:
+        raise ValueError(f"Unknown strategy '{name}'")
+
+    if isinstance(target, str):
+        module_name, _, attr = target.partition(":")
+        module = importlib.import_module(module_name)
+        factory = getattr(module, attr) if attr else module
+    else:
+        factory = target
+    _loaded[key] = factory
+    return factory
+
+
+def create(name: str, **kwargs: Any) -> Strategy:
+    """Instantiate the strategy registered under ``name`` with ``kwargs``."""
+
+    return load(name)(**kwargs)
+
+
+def create_ensemble(
+    names: Sequence[str],
+    mode: str = "vote",
+    weights: Mapping[str, float] | None = None,
+    threshold: float = 0.5,
+    **kwargs: Any,
+) -> Strategy:
+    """Build an :class:`~strategies.ensemble.EnsembleStrategy` from names.
+
+    ``kwargs`` are passed to every member; ``weights`` maps member names to
+    their weight (missing names default to ``1.0``).
+    """
+
+    from .ensemble import EnsembleStrategy
+
+    members = [create(n, **kwargs) for n in names]
+    member_weights = [float((weights or {}).get(n, 1.0)) for n in names]
+    return EnsembleStrategy(
+        members,
+        weights=member_weights,
+        mode=mode,
+        threshold=threshold,
+        bad_words=kwargs.get("bad_words"),
+        sentiment=kwargs.get("sentiment"),
+        min_sentiment=kwargs.get("min_sentiment", 0.0),
+    )
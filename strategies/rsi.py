@@ -1,11 +1,16 @@
 from __future__ import annotations
 
-from typing import Dict, List, Sequence
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
 
 from .base import Strategy
+from .batch import price_matrix, record_prices
+from .news import HeadlineFilter, NewsScreen
+from .sentiment import SentimentScorer
 
 
-class RSIStrategy(Strategy):
+class RSIStrategy(NewsScreen, Strategy):
     """Relative Strength Index based trading strategy.
 
     The strategy computes an RSI value for each symbol using a sliding window
@@ -22,15 +27,25 @@ class RSIStrategy(Strategy):
         bad_words: Sequence[str] | None = None,
         fee_rate: float = 0.0,
         min_pnl_pct: float = 0.0,
+        sentiment: SentimentScorer | None = None,
+        min_sentiment: float = 0.0,
     ) -> None:
         self.period = period
         self.oversold = oversold
         self.overbought = overbought
         self.history: Dict[str, List[float]] = {}
         self.bad_words = [w.lower() for w in (bad_words or [])]
+        self.headline_filter = HeadlineFilter(self.bad_words)
+        self.sentiment = sentiment
+        self.min_sentiment = min_sentiment
         self.fee_rate = fee_rate
         self.min_pnl_pct = min_pnl_pct
 
+    def warmup_period(self) -> int:
+        """RSI needs ``period`` price changes, i.e. ``period + 1`` prices."""
+
+        return self.period + 1
+
     # -- helpers -----------------------------------------------------------
     def _rsi(self, prices: List[float]) -> float | None:
         """Calculate RSI for the given price sequence."""
@@ -51,28 +66,19 @@ class RSIStrategy(Strategy):
         rs = gains / losses
         return 100 - (100 / (1 + rs))
 
-    # -- Strategy API ------------------------------------------------------
-    def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
-        # basic news filter
-        if any(bad in h.lower() for h in headlines for bad in self.bad_words):
-            return False
+    # -- signals -----------------------------------------------------------
+    def buy_signal(self, prices: List[float]) -> bool:
+        """Return the technical buy signal for an already recorded history."""
 
-        prices = self.history.setdefault(symbol, [])
-        prices.append(price)
         rsi = self._rsi(prices)
         if rsi is None:
             return False
         return rsi < self.oversold
 
-    def should_sell(
-        self,
-        symbol: str,
-        position: Dict[str, float],
-        price: float,
-        headlines: Sequence[str],
+    def sell_signal(
+        self, prices: List[float], position: Dict[str, float], price: float
     ) -> bool:
-        prices = self.history.setdefault(symbol, [])
-        prices.append(price)
+        """Return the exit signal for an already recorded history."""
 
         take_profit = position.get("take_profit")
         if take_profit and price >= take_profit:
@@ -91,3 +97,65 @@ class RSIStrategy(Strategy):
             pnl_pct = (profit / entry_cost) * 100
             return pnl_pct >= self.min_pnl_pct - 1e-6
         return False
+
+    # -- Strategy API ------------------------------------------------------
+    def should_buy(self, symbol: str, price: float, headlines: Sequence[str]) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        if not self.buy_signal(prices):
+            return False
+        # news filter last: headlines may be fetched lazily on first access
+        return not self._rejects_news(symbol, headlines)
+
+    def evaluate_batch(
+        self,
+        prices: Mapping[str, float],
+        headlines: Mapping[str, Sequence[str]] | None = None,
+    ) -> Dict[str, bool]:
+        """Evaluate buy signals for many symbols in one vectorized pass.
+
+        Equivalent to calling :meth:`should_buy` for every ``symbol -> price``
+        pair; the RSI of all symbols is computed by :meth:`buy_signals`.
+        Headlines are only consulted for symbols with a technical buy signal.
+        """
+
+        signals = {symbol: False for symbol in prices}
+        symbols = record_prices(self.history, prices)
+        if not symbols:
+            return signals
+
+        buy = self.buy_signals(symbols)
+        for symbol, flag in zip(symbols, buy.tolist()):
+            if flag and headlines is not None:
+                flag = not self._rejects_news(symbol, headlines.get(symbol) or ())
+            signals[symbol] = flag
+        return signals
+
+    def buy_signals(self, symbols: Sequence[str]) -> np.ndarray:
+        """Return :meth:`buy_signal` for the recorded history of each symbol.
+
+        The last ``period + 1`` prices of all symbols are stacked into a single
+        array and gains/losses are summed along the window axis.
+        """
+
+        matrix, ready = price_matrix(self.history, symbols, self.period + 1)
+        if not ready.any():
+            return ready
+
+        deltas = np.diff(matrix, axis=1)
+        gains = np.where(deltas > 0, deltas, 0.0).sum(axis=1)
+        losses = -np.where(deltas > 0, 0.0, deltas).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = np.where(losses == 0, 100.0, 100 - 100 / (1 + gains / losses))
+        return ready & (rsi < self.oversold)
+
+    def should_sell(
+        self,
+        symbol: str,
+        position: Dict[str, float],
+        price: float,
+        headlines: Sequence[str],
+    ) -> bool:
+        prices = self.history.setdefault(symbol, [])
+        prices.append(price)
+        return self.sell_signal(prices, position, price)
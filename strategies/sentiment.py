@@ -0,0 +1,131 @@
+"""Cached, batched sentiment scoring for news headlines."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+def _textblob_analyzer() -> Callable[[str], float]:
+    """Return a TextBlob polarity scorer, or a neutral one if unavailable."""
+
+    try:
+        from textblob import TextBlob
+    except Exception as exc:
+        logger.warning("textblob unavailable, sentiment scores default to 0: %s", exc)
+        return lambda text: 0.0
+    return lambda text: float(TextBlob(text).sentiment.polarity)
+
+
+class SentimentScorer:
+    """Score headlines in batches and remember the results.
+
+    Scores are polarity values in ``[-1, 1]``.  Each headline is keyed by a
+    hash of its text in an LRU cache of ``cache_size`` entries, so articles
+    returned on consecutive cycles or for several symbols are scored once.
+    Uncached headlines are split into chunks of ``batch_size`` and scored on a
+    pool of ``max_workers`` threads.  :meth:`update` stores the mean score per
+    asset in :attr:`asset_scores` for strategies to consult.
+    """
+
+    def __init__(
+        self,
+        analyzer: Callable[[str], float] | None = None,
+        cache_size: int = 2048,
+        max_workers: int = 4,
+        batch_size: int = 16,
+    ) -> None:
+        self._analyzer = analyzer
+        self.cache_size = cache_size
+        self.max_workers = max(1, max_workers)
+        self.batch_size = max(1, batch_size)
+        self._cache: OrderedDict[str, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self.asset_scores: Dict[str, float] = {}
+
+    # -- helpers -----------------------------------------------------------
+    @staticmethod
+    def _key(headline: str) -> str:
+        return hashlib.blake2b(headline.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _score_chunk(self, texts: Sequence[str]) -> List[float]:
+        analyzer = self._analyzer
+        scores = []
+        for text in texts:
+            try:
+                scores.append(analyzer(text))
+            except Exception as exc:
+                logger.warning("Sentiment scoring failed: %s", exc)
+                scores.append(0.0)
+        return scores
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="sentiment"
+            )
+        return self._executor
+
+    # -- scoring -----------------------------------------------------------
+    def score_batch(self, headlines: Sequence[str]) -> List[float]:
+        """Return a polarity score for each of ``headlines``."""
+
+        keys = [self._key(h) for h in headlines]
+        missing: Dict[str, str] = {}
+        with self._lock:
+            for key, headline in zip(keys, headlines):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                elif key not in missing:
+                    missing[key] = headline
+
+        fresh: Dict[str, float] = {}
+        if missing:
+            if self._analyzer is None:
+                self._analyzer = _textblob_analyzer()
+            texts = list(missing.values())
+            chunks = [
+                texts[i : i + self.batch_size]
+                for i in range(0, len(texts), self.batch_size)
+            ]
+            if len(chunks) == 1:
+                results = [self._score_chunk(chunks[0])]
+            else:
+                results = list(self._pool().map(self._score_chunk, chunks))
+            fresh = dict(zip(missing, (s for chunk in results for s in chunk)))
+            with self._lock:
+                for key, score in fresh.items():
+                    self._cache[key] = score
+                    self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        with self._lock:
+            return [fresh[k] if k in fresh else self._cache.get(k, 0.0) for k in keys]
+
+    def update(self, symbol: str, headlines: Sequence[str]) -> float:
+        """Score ``headlines`` and record their mean as ``symbol``'s sentiment."""
+
+        scores = self.score_batch(list(headlines))
+        value = sum(scores) / len(scores) if scores else 0.0
+        self.asset_scores[symbol] = value
+        return value
+
+    def get(self, symbol: str) -> float | None:
+        """Return the last aggregate sentiment recorded for ``symbol``."""
+
+        return self.asset_scores.get(symbol)
+
+    def close(self) -> None:
+        """Shut down the worker pool."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
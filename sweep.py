@@ -0,0 +1,350 @@
+"""Parameter sweeps over :mod:`backtest` on a process pool.
+
+Every combination of the given parameter values is replayed with
+:func:`backtest.run_backtest`.  Strategy parameters (``short_window``,
+``oversold`` …) are passed to the strategy constructor, names matching a
+:class:`backtest.BacktestConfig` field (``stop_atr_mult``, ``risk_reward``,
+``min_exit_pnl_pct`` …) override the risk settings.
+
+The price arrays are copied once into a shared memory block that the workers
+attach to, so tasks only carry their parameter dict.  Ranked results are
+written to the ``sweep_results`` table of a local SQLite file.
+
+Usage::
+
+    python sweep.py --prices-db prices.db --symbol BTCUSDT --strategy ma \\
+        --param short_window=3,5,8 --param long_window=20:60:10 \\
+        --param stop_atr_mult=1.5,2,2.5 --param risk_reward=1.5,2,3
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import datetime
+import itertools
+import json
+import logging
+import os
+import sqlite3
+import sys
+import time
+import uuid
+from multiprocessing import Pool, shared_memory, util
+from typing import Any, Dict, Iterable, List, Mapping, Sequence
+
+import numpy as np
+
+import backtest
+from strategies import registry as strategy_registry
+
+logger = logging.getLogger(__name__)
+
+SWEEP_DB_FILE = os.getenv("SWEEP_DB_FILE", "sweep.db")
+CONFIG_FIELDS = {f.name for f in dataclasses.fields(backtest.BacktestConfig)}
+# Metrics where a lower value ranks better
+ASCENDING_METRICS = {"max_drawdown_pct"}
+
+# Worker state, set by _init_worker
+_shm: shared_memory.SharedMemory | None = None
+_bars: np.ndarray | None = None
+_job: Dict[str, Any] = {}
+
+
+# -- grid --------------------------------------------------------------------
+def _parse_value(text: str) -> Any:
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def parse_param(spec: str) -> tuple[str, List[Any]]:
+    """Parse ``name=v1,v2`` or ``name=start:stop:step`` (stop inclusive)."""
+
+    name, sep, values = spec.partition("=")
+    if not sep or not name.strip() or not values.strip():
+        raise ValueError(f"Invalid parameter spec {spec!r}, expected name=values")
+    values = values.strip()
+    if values.count(":") == 2:
+        start, stop, step = (_parse_value(v) for v in values.split(":"))
+        if not step or step <= 0:
+            raise ValueError(f"Invalid step in {spec!r}")
+        count = int(round((stop - start) / step)) + 1
+        series = [start + i * step for i in range(max(count, 0))]
+        if all(isinstance(v, int) for v in (start, stop, step)):
+            return name.strip().lower(), series
+        return name.strip().lower(), [round(v, 10) for v in series]
+    return name.strip().lower(), [_parse_value(v.strip()) for v in values.split(",") if v.strip()]
+
+
+def expand_grid(grid: Mapping[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Return every combination of ``grid`` that passes :func:`is_valid`."""
+
+    names = list(grid)
+    combos = (dict(zip(names, values)) for values in itertools.product(*grid.values()))
+    return [params for params in combos if is_valid(params)]
+
+
+def is_valid(params: Mapping[str, Any]) -> bool:
+    """Reject combinations that can never trade sensibly."""
+
+    if "short_window" in params and "long_window" in params:
+        if params["short_window"] >= params["long_window"]:
+            return False
+    if "oversold" in params and "overbought" in params:
+        if params["oversold"] >= params["overbought"]:
+            return False
+    return True
+
+
+def split_params(params: Mapping[str, Any]) -> tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split ``params`` into strategy kwargs and ``BacktestConfig`` overrides."""
+
+    strategy_kwargs: Dict[str, Any] = {}
+    config_kwargs: Dict[str, Any] = {}
+    for name, value in params.items():
+        (config_kwargs if name in CONFIG_FIELDS else strategy_kwargs)[name] = value
+    return strategy_kwargs, config_kwargs
+
+
+# -- workers -----------------------------------------------------------------
+def _init_worker(shm_name: str, shape: tuple[int, int], job: Dict[str, Any]) -> None:
+    global _shm
+    # The parent owns (and unlinks) the block; before 3.13 every attach is
+    # registered with the resource tracker regardless
+    kwargs = {"track": False} if sys.version_info >= (3, 13) else {}
+    _shm = shared_memory.SharedMemory(name=shm_name, **kwargs)
+    _use_bars(np.ndarray(shape, dtype=np.float64, buffer=_shm.buf), job)
+    util.Finalize(None, _close_worker, exitpriority=10)
+
+
+def _close_worker() -> None:
+    """Release the worker's mapping of the shared bars."""
+
+    global _shm
+    # The view must be dropped before the block can be closed
+    _use_bars(None, {})
+    if _shm is not None:
+        _shm.close()
+        _shm = None
+
+
+def _use_bars(bars: np.ndarray | None, job: Dict[str, Any]) -> None:
+    global _bars, _job
+    _bars = bars
+    _job = job
+
+
+def run_one(params: Dict[str, Any]) -> Dict[str, Any]:
+    """Backtest one parameter combination against the shared bars."""
+
+    strategy_kwargs, config_kwargs = split_params(params)
+    base = _job.get("config", {})
+    config = backtest.BacktestConfig(**{**base, **config_kwargs})
+    strategy = strategy_registry.create(
+        _job["strategy"],
+        fee_rate=config.fee_rate,
+        min_pnl_pct=config.min_exit_pnl_pct,
+        **strategy_kwargs,
+    )
+    timestamps, highs, lows, closes = _bars
+    result = backtest.run_backtest(
+        strategy,
+        closes,
+        highs,
+        lows,
+        timestamps,
+        symbol=_job["symbol"],
+        config=config,
+    )
+    return {"params": params, "stats": result.stats}
+
+
+# -- runner ------------------------------------------------------------------
+def run_sweep(
+    bars: Mapping[str, np.ndarray],
+    grid: Mapping[str, Sequence[Any]] | Iterable[Dict[str, Any]],
+    strategy: str = "ma",
+    symbol: str = "BTCUSDT",
+    workers: int | None = None,
+    config: Mapping[str, Any] | None = None,
+    sort_by: str = "total_return_pct",
+) -> List[Dict[str, Any]]:
+    """Backtest every combination in ``grid`` and return results ranked by ``sort_by``.
+
+    ``grid`` is either a mapping of parameter name to candidate values or an
+    explicit list of parameter dicts.  ``workers=0`` runs in this process,
+    ``None`` uses one worker per CPU.
+    """
+
+    combos = expand_grid(grid) if isinstance(grid, Mapping) else list(grid)
+    if not combos:
+        return []
+    data = np.ascontiguousarray(
+        np.vstack([bars["timestamps"], bars["highs"], bars["lows"], bars["closes"]]),
+        dtype=np.float64,
+    )
+    job = {"strategy": strategy, "symbol": symbol, "config": dict(config or {})}
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    shm = shared_memory.SharedMemory(create=True, size=max(data.nbytes, 1))
+    shared = None
+    started = time.perf_counter()
+    try:
+        shared = np.ndarray(data.shape, dtype=np.float64, buffer=shm.buf)
+        shared[:] = data
+        if workers <= 0:
+            _use_bars(shared, job)
+            try:
+                results = [run_one(params) for params in combos]
+            finally:
+                _use_bars(None, {})
+        else:
+            chunksize = max(1, len(combos) // (workers * 4))
+            with Pool(workers, _init_worker, (shm.name, data.shape, job)) as pool:
+                results = list(pool.imap_unordered(run_one, combos, chunksize))
+                # let the workers exit normally so _close_worker runs
+                pool.close()
+                pool.join()
+    finally:
+        # The view must be dropped before the block can be closed
+        del shared
+        shm.close()
+        shm.unlink()
+    logger.info(
+        "Swept %d configurations in %.1fs", len(combos), time.perf_counter() - started
+    )
+    return rank_results(results, sort_by)
+
+
+def rank_results(results: List[Dict[str, Any]], sort_by: str) -> List[Dict[str, Any]]:
+    """Sort ``results`` best first by ``sort_by`` and number them."""
+
+    descending = sort_by not in ASCENDING_METRICS
+    ranked = sorted(
+        results,
+        key=lambda r: r["stats"].get(sort_by, 0.0),
+        reverse=descending,
+    )
+    for rank, result in enumerate(ranked, start=1):
+        result["rank"] = rank
+    return ranked
+
+
+def save_results(
+    results: Sequence[Dict[str, Any]],
+    strategy: str,
+    symbol: str,
+    db_path: str = SWEEP_DB_FILE,
+    run_id: str | None = None,
+) -> str:
+    """Write ranked ``results`` to the ``sweep_results`` table and return the run id."""
+
+    run_id = run_id or uuid.uuid4().hex[:12]
+    created = datetime.datetime.now(datetime.timezone.utc).isoformat()
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS sweep_results (
+                run_id TEXT,
+                rank INTEGER,
+                strategy TEXT,
+                symbol TEXT,
+                params TEXT,
+                total_return_pct REAL,
+                trades INTEGER,
+                win_rate_pct REAL,
+                profit_factor REAL,
+                max_drawdown_pct REAL,
+                end_balance REAL,
+                created_at TEXT,
+                PRIMARY KEY (run_id, rank)
+            )
+            """
+        )
+        conn.executemany(
+            "INSERT INTO sweep_results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (
+                    run_id,
+                    r["rank"],
+                    strategy,
+                    symbol,
+                    json.dumps(r["params"], sort_keys=True),
+                    r["stats"]["total_return_pct"],
+                    r["stats"]["trades"],
+                    r["stats"]["win_rate_pct"],
+                    r["stats"]["profit_factor"],
+                    r["stats"]["max_drawdown_pct"],
+                    r["stats"]["end_balance"],
+                    created,
+                )
+                for r in results
+            ],
+        )
+    return run_id
+
+
+def format_table(results: Sequence[Dict[str, Any]], limit: int = 10) -> str:
+    """Return a plain text table of the best ``limit`` results."""
+
+    lines = [f"{'#':>4}  {'return%':>8}  {'trades':>6}  {'win%':>6}  {'maxDD%':>7}  params"]
+    for r in results[:limit]:
+        s = r["stats"]
+        params = " ".join(f"{k}={v}" for k, v in r["params"].items())
+        lines.append(
+            f"{r['rank']:>4}  {s['total_return_pct']:>8.2f}  {s['trades']:>6}  "
+            f"{s['win_rate_pct']:>6.1f}  {s['max_drawdown_pct']:>7.2f}  {params}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Parallel strategy parameter sweep")
+    backtest.add_source_arguments(parser)
+    parser.add_argument("--strategy", default="ma", help="registered strategy name")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help="name=v1,v2 or name=start:stop:step; repeat for each parameter",
+    )
+    parser.add_argument("--grid", help="JSON file mapping parameter names to value lists")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--sort", default="total_return_pct", help="stats field to rank by")
+    parser.add_argument("--db", default=SWEEP_DB_FILE, help="SQLite file for results")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    grid: Dict[str, List[Any]] = {}
+    if args.grid:
+        with open(args.grid, "r", encoding="utf-8") as f:
+            grid.update({k.lower(): list(v) for k, v in json.load(f).items()})
+    grid.update(parse_param(spec) for spec in args.param)
+    if not grid:
+        parser.error("no parameters given; use --param or --grid")
+
+    bars = backtest._load_bars(args)
+    results = run_sweep(
+        bars,
+        grid,
+        strategy=args.strategy,
+        symbol=args.symbol,
+        workers=args.workers,
+        sort_by=args.sort,
+    )
+    run_id = save_results(results, args.strategy, args.symbol, args.db)
+    print(format_table(results, args.top))
+    print(f"{len(results)} results saved to {args.db} (run {run_id})")
+    return 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    raise SystemExit(main())
@@ -0,0 +1,110 @@
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import backtest
+from risk import update_trailing_stop
+from strategies.ma import MovingAverageCrossStrategy
+
+
+class BuyOnce:
+    def __init__(self):
+        self.bought = False
+
+    def should_buy(self, symbol, price, headlines):
+        if self.bought:
+            return False
+        self.bought = True
+        return True
+
+    def should_sell(self, symbol, position, price, headlines):
+        return False
+
+
+def test_take_profit_exit_books_profit():
+    closes = [100.0] * 20 + [150.0]
+    result = backtest.run_backtest(BuyOnce(), closes)
+
+    assert len(result.trades) == 1
+    trade = result.trades[0]
+    assert trade["reason"] == "take_profit"
+    assert trade["profit"] > 0
+    assert result.stats["end_balance"] > result.stats["start_balance"]
+    assert result.equity.shape == (len(closes),)
+
+
+def test_stop_loss_exit_and_drawdown():
+    closes = [100.0, 100.0, 90.0]
+    result = backtest.run_backtest(BuyOnce(), closes)
+
+    assert [t["reason"] for t in result.trades] == ["stop_loss"]
+    assert result.trades[0]["profit"] < 0
+    assert result.stats["win_rate_pct"] == 0.0
+    assert result.stats["max_drawdown_pct"] > 0
+
+
+def test_trailing_stop_moves_to_break_even():
+    pos = {"entry": 100.0, "stop_loss": 98.0, "take_profit": None, "trail_price": 104.0}
+    stop, event = update_trailing_stop(pos, 103.0, 2.0, 0.001, 2.0, 1.0)
+
+    assert event == "break_even"
+    assert stop == pos["stop_loss"] == 100.0
+    assert pos["take_profit"] > 104.0
+
+    stop, event = update_trailing_stop(pos, 105.0, 2.0, 0.001, 2.0, 1.0)
+    assert (stop, event) == (103.0, "trailed")
+    assert pos["trail_price"] == 105.0
+
+
+def test_ma_strategy_replay_matches_signals():
+    t = np.arange(400)
+    closes = 100 + 10 * np.sin(t / 15.0)
+    strategy = MovingAverageCrossStrategy(short_window=3, long_window=8)
+
+    result = backtest.run_backtest(strategy, closes, symbol="ETHUSDT")
+
+    assert result.stats["bars"] == 400
+    assert result.stats["trades"] >= 1
+    assert all(t["symbol"] == "ETHUSDT" for t in result.trades)
+    assert len(strategy.history["ETHUSDT"]) > 0
+
+
+def test_loaders_read_csv_klines_and_prices_db(tmp_path):
+    csv_path = tmp_path / "bars.csv"
+    csv_path.write_text("timestamp,high,low,close\n1,11,9,10\n2,12,10,11\n")
+    bars = backtest.load_csv(str(csv_path))
+    assert bars["closes"].tolist() == [10.0, 11.0]
+    assert bars["highs"].tolist() == [11.0, 12.0]
+
+    kline_path = tmp_path / "klines.json"
+    kline_path.write_text(json.dumps([[1000, "1", "2", "0.5", "1.5", "10"]]))
+    assert backtest.load_kline_file(str(kline_path))["closes"].tolist() == [1.5]
+
+    db_path = tmp_path / "prices.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("CREATE TABLE prices (symbol TEXT, timestamp TEXT, price REAL)")
+        conn.executemany(
+            "INSERT INTO prices VALUES (?, ?, ?)",
+            [
+                ("BTCUSDT", "2024-01-01T00:00:00", 1.0),
+                ("BTCUSDT", "2024-01-01T00:01:00", 2.0),
+                ("ETHUSDT", "2024-01-01T00:00:00", 5.0),
+            ],
+        )
+    assert backtest.load_prices_db(str(db_path), "BTCUSDT")["closes"].tolist() == [1.0, 2.0]
+
+
+def test_cli_prints_stats(tmp_path, capsys):
+    csv_path = tmp_path / "bars.csv"
+    rows = "\n".join(f"{i},{100 + (i % 7)}" for i in range(60))
+    csv_path.write_text("timestamp,close\n" + rows + "\n")
+
+    assert backtest.main(["--csv", str(csv_path), "--strategy", "ma"]) == 0
+    output = json.loads(capsys.readouterr().out)
+    assert output["stats"]["bars"] == 60
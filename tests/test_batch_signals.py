@@ -0,0 +1,111 @@
+import random
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from strategies.batch import price_matrix
+from strategies.ensemble import EnsembleStrategy
+from strategies.ma import MovingAverageCrossStrategy
+from strategies.rsi import RSIStrategy
+
+
+def _random_histories(count, rng):
+    histories = {}
+    for i in range(count):
+        length = rng.randint(0, 30)
+        price = rng.uniform(10, 100)
+        series = []
+        for _ in range(length):
+            price *= 1 + rng.uniform(-0.03, 0.03)
+            series.append(price)
+        histories[f"SYM{i}USDT"] = series
+    return histories
+
+
+def _assert_batch_matches_scalar(factory, rng):
+    histories = _random_histories(200, rng)
+    latest = {sym: rng.uniform(10, 100) for sym in histories}
+
+    scalar = factory()
+    batch = factory()
+    for sym, series in histories.items():
+        scalar.history[sym] = list(series)
+        batch.history[sym] = list(series)
+
+    expected = {sym: scalar.should_buy(sym, price, []) for sym, price in latest.items()}
+    result = batch.evaluate_batch(latest)
+
+    assert result == expected
+    assert batch.history == scalar.history
+    assert any(expected.values()) and not all(expected.values())
+
+
+def test_ma_batch_matches_should_buy():
+    rng = random.Random(26)
+    _assert_batch_matches_scalar(
+        lambda: MovingAverageCrossStrategy(short_window=3, long_window=5), rng
+    )
+
+
+def test_rsi_batch_matches_should_buy():
+    rng = random.Random(62)
+    _assert_batch_matches_scalar(lambda: RSIStrategy(period=5, oversold=45.0), rng)
+
+
+def test_ensemble_batch_matches_should_buy():
+    def ensemble(**kwargs):
+        members = [
+            MovingAverageCrossStrategy(short_window=3, long_window=5),
+            RSIStrategy(period=5, oversold=45.0),
+            MovingAverageCrossStrategy(short_window=2, long_window=8),
+        ]
+        return EnsembleStrategy(members, **kwargs)
+
+    _assert_batch_matches_scalar(ensemble, random.Random(7))
+    _assert_batch_matches_scalar(
+        lambda: ensemble(weights=[1.0, 2.0, 1.0], mode="weight", threshold=0.5),
+        random.Random(8),
+    )
+
+
+def test_batch_news_filter_only_checks_candidates():
+    strat = MovingAverageCrossStrategy(short_window=2, long_window=3, bad_words=["hack"])
+    strat.seed_history("BTCUSDT", [1.0, 2.0])
+    strat.seed_history("ETHUSDT", [1.0, 2.0])
+    strat.seed_history("XRPUSDT", [3.0, 2.0])
+
+    class Headlines(dict):
+        def __init__(self, *args):
+            super().__init__(*args)
+            self.requested = []
+
+        def get(self, key, default=None):
+            self.requested.append(key)
+            return super().get(key, default)
+
+    headlines = Headlines(
+        {
+            "BTCUSDT": ["Exchange HACK reported"],
+            "ETHUSDT": ["rally"],
+            "XRPUSDT": ["hack"],
+        }
+    )
+    signals = strat.evaluate_batch(
+        {"BTCUSDT": 3.0, "ETHUSDT": 3.0, "XRPUSDT": 1.0}, headlines
+    )
+
+    assert signals == {"BTCUSDT": False, "ETHUSDT": True, "XRPUSDT": False}
+    assert headlines.requested == ["BTCUSDT", "ETHUSDT"]
+    assert strat.history["BTCUSDT"] == [1.0, 2.0, 3.0]
+
+
+def test_price_matrix_marks_short_histories():
+    matrix, ready = price_matrix(
+        {"A": [1.0, 2.0, 3.0, 4.0], "B": [1.0]}, ["A", "B", "C"], 3
+    )
+
+    assert matrix.shape == (3, 3)
+    assert matrix[0].tolist() == [2.0, 3.0, 4.0]
+    assert ready.tolist() == [True, False, False]
@@ -0,0 +1,67 @@
+import json
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import bench
+
+
+def test_run_benchmarks_in_scratch_directory(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    result = bench.run_benchmarks(
+        ["save_price", "db_upsert_position", "rsi_should_buy", "normalize_command_token"],
+        repeat=2,
+        min_time=0,
+    )
+
+    assert os.getcwd() == str(tmp_path)
+    assert list(tmp_path.iterdir()) == []
+    assert result["version"] == bench.FORMAT_VERSION
+    assert result["seed"] == bench.DEFAULT_SEED
+    for stats in result["benchmarks"].values():
+        assert stats["number"] == 1
+        assert stats["repeat"] == 2
+        assert 0 < stats["min_us"] <= stats["median_us"]
+
+
+def test_unknown_benchmark_is_rejected():
+    with pytest.raises(ValueError):
+        bench.run_benchmarks(["nope"])
+
+
+def test_compare_flags_regressions():
+    def run(**timings):
+        return {"benchmarks": {k: {"min_us": v} for k, v in timings.items()}}
+
+    rows = bench.compare(
+        run(a=1.3, b=0.5, c=1.05, new=2.0),
+        run(a=1.0, b=1.0, c=1.0, gone=1.0),
+        threshold=20,
+    )
+
+    status = {row["name"]: row["status"] for row in rows}
+    assert status == {
+        "a": "regression", "b": "improved", "c": "ok", "gone": "missing", "new": "new"
+    }
+    assert rows[0]["change_pct"] == 30.0
+    assert "regression" in bench.format_comparison(rows)
+
+
+def test_cli_compare_exit_status(monkeypatch, tmp_path, capsys):
+    baseline = tmp_path / "baseline.json"
+    args = ["--only", "calculate_position_size", "--repeat", "1", "--min-time", "0"]
+
+    assert bench.main(args + ["--json", str(baseline)]) == 0
+    data = json.loads(baseline.read_text())
+    assert list(data["benchmarks"]) == ["calculate_position_size"]
+
+    data["benchmarks"]["calculate_position_size"]["min_us"] = 1e-6
+    baseline.write_text(json.dumps(data))
+    assert bench.main(args + ["--compare", str(baseline)]) == 1
+    assert "regression" in capsys.readouterr().out
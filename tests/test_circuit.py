@@ -0,0 +1,130 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import circuit
+
+
+def setup_main(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    return importlib.import_module("main")
+
+
+def test_backoff_delay_is_jittered_within_bounds():
+    assert circuit.backoff_delay(0, 1.0, rng=lambda: 0.0) == 0.5
+    assert circuit.backoff_delay(2, 1.0, rng=lambda: 1.0) == 4.0
+    assert circuit.backoff_delay(10, 1.0, cap=30, rng=lambda: 1.0) == 30.0
+    delays = {circuit.backoff_delay(1, 1.0) for _ in range(20)}
+    assert len(delays) > 1 and all(1.0 <= d <= 2.0 for d in delays)
+
+
+def test_breaker_opens_probes_and_closes():
+    now = [0.0]
+    cb = circuit.CircuitBreaker("newsapi", failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    cb.record_failure()
+    assert cb.allow()
+    cb.record_failure()
+    assert cb.state == circuit.OPEN
+    assert not cb.allow()
+    assert cb.remaining() == 10
+
+    now[0] = 10.0
+    assert cb.allow()  # half-open probe
+    assert not cb.allow()  # only one probe at a time
+    cb.record_failure()
+    assert cb.state == circuit.OPEN and cb.trips == 2
+
+    now[0] = 20.0
+    assert cb.allow()
+    cb.record_success()
+    assert cb.state == circuit.CLOSED and cb.failures == 0
+    assert cb.rejected == 2
+
+
+def test_dead_dependency_is_skipped_for_the_rest_of_the_cycle(monkeypatch, tmp_path):
+    monkeypatch.setenv("BREAKER_FAILURE_THRESHOLD", "3")
+    main = setup_main(monkeypatch, tmp_path)
+    sleeps = []
+    monkeypatch.setattr(main.time, "sleep", sleeps.append)
+    monkeypatch.setattr(main, "send", lambda msg: None)
+    calls = []
+
+    def news_down():
+        calls.append(1)
+        raise ConnectionError("NewsAPI down")
+
+    results = [
+        main.call_with_retries(news_down, name=f"NewsAPI {sym}", breaker="newsapi")
+        for sym in ["BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT"]
+    ]
+
+    assert results == [None] * 4
+    # three attempts for the first symbol open the circuit; the rest are skipped
+    assert len(calls) == 3
+    assert len(sleeps) == 2
+    assert main.BREAKERS.states() == {"newsapi": circuit.OPEN}
+    assert 'trade_bot_circuit_open{endpoint="newsapi"} 1' in main.METRICS.render()
+
+    # other endpoints are unaffected
+    assert main.call_with_retries(lambda: 42, name="Binance price", breaker="binance.ticker") == 42
+
+
+def test_deadline_gives_up_instead_of_sleeping(monkeypatch, tmp_path):
+    main = setup_main(monkeypatch, tmp_path)
+    sleeps = []
+    monkeypatch.setattr(main.time, "sleep", sleeps.append)
+    monkeypatch.setattr(main, "send", lambda msg: None)
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise TimeoutError("slow")
+
+    assert main.call_with_retries(failing, name="NewsAPI BTCUSDT", deadline=0.1) is None
+    assert calls == [1] and sleeps == []
+
+    with main.call_deadline(0.0):
+        assert main.call_with_retries(failing, name="Telegram") is None
+    assert len(calls) == 2 and sleeps == []
+
+    # without a deadline the normal retries apply
+    assert main.call_with_retries(failing, name="Telegram", attempts=2) is None
+    assert len(calls) == 4 and len(sleeps) == 1
+
+
+def test_circuit_opening_mid_retry_still_alerts(monkeypatch, tmp_path):
+    monkeypatch.setenv("BREAKER_FAILURE_THRESHOLD", "2")
+    main = setup_main(monkeypatch, tmp_path)
+    monkeypatch.setattr(main.time, "sleep", lambda s: None)
+    alerts = []
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: alerts.append(msg))
+    calls = []
+
+    def failing():
+        calls.append(1)
+        raise ConnectionError("refused")
+
+    # the second failure opens the circuit before the third attempt
+    assert main.call_with_retries(failing, name="Telegram", breaker="telegram") is None
+    assert len(calls) == 2
+    assert alerts == ["⚠️ Telegram failed after 2 attempts: refused"]
+
+    # once open, later calls are skipped quietly
+    assert main.call_with_retries(failing, name="Telegram", breaker="telegram") is None
+    assert len(calls) == 2 and len(alerts) == 1
@@ -24,17 +24,63 @@ def reload_module():
     return importlib.import_module(MODULE_NAME)
 
 
-def test_env_all_present(monkeypatch):
+def test_env_all_present(monkeypatch, tmp_path):
     for var in REQUIRED:
         monkeypatch.setenv(var, 'x')
+    main = reload_module()
+    monkeypatch.setattr(main.db, 'DB_FILE', str(tmp_path / 'trading.db'))
     # Should not raise SystemExit when all vars present
-    reload_module()
+    main.bootstrap(load_env=False)
+    assert (tmp_path / 'trading.db').exists()
 
 
 def test_missing_env_var(monkeypatch):
     for var in REQUIRED:
         monkeypatch.delenv(var, raising=False)
     monkeypatch.setenv('TELEGRAM_TOKEN', 'token')
+    # Importing never validates; bootstrap does
+    main = reload_module()
     with pytest.raises(SystemExit) as exc:
-        reload_module()
+        main.bootstrap(load_env=False)
     assert 'Missing required environment variables' in str(exc.value)
+
+
+def test_invalid_trading_mode(monkeypatch):
+    for var in REQUIRED:
+        monkeypatch.setenv(var, 'x')
+    monkeypatch.setenv('TRADING_MODE', 'futures')
+    main = reload_module()
+    with pytest.raises(SystemExit) as exc:
+        main.bootstrap(load_env=False)
+    assert 'TRADING_MODE' in str(exc.value)
+
+
+def test_import_has_no_side_effects(monkeypatch, tmp_path):
+    for var in REQUIRED:
+        monkeypatch.delenv(var, raising=False)
+    monkeypatch.chdir(tmp_path)
+
+    from binance import client as binance_client
+
+    created = []
+
+    class RecordingClient:
+        def __init__(self, *args, **kwargs):
+            created.append(args)
+
+        def get_asset_balance(self, asset):
+            return {"free": "5"}
+
+    monkeypatch.setattr(binance_client, 'Client', RecordingClient)
+    for name in ['db', MODULE_NAME]:
+        sys.modules.pop(name, None)
+    monkeypatch.setenv('TRADE_DB_FILE', str(tmp_path / 'trading.db'))
+
+    main = importlib.import_module(MODULE_NAME)
+
+    assert created == []
+    assert list(tmp_path.iterdir()) == []
+    assert main.client.get_asset_balance('USDT') == {"free": "5"}
+    assert len(created) == 1
+    assert main.db.get_open_positions() == {}
+    assert (tmp_path / 'trading.db').exists()
@@ -0,0 +1,169 @@
+import importlib
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import gateway
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeClient:
+    def __init__(self, used="0"):
+        self.calls = []
+        self.response = types.SimpleNamespace(headers={"X-MBX-USED-WEIGHT-1M": used})
+        self.API_URL = "https://api.binance.com/api"
+
+    def get_symbol_ticker(self, symbol):
+        self.calls.append(("get_symbol_ticker", symbol))
+        return {"price": "100"}
+
+    def get_asset_balance(self, asset):
+        self.calls.append(("get_asset_balance", asset))
+        return {"free": "50"}
+
+    def create_order(self, **kwargs):
+        self.calls.append(("create_order", kwargs["symbol"]))
+        return {"orderId": 1}
+
+
+class RateLimited(Exception):
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"Retry-After": retry_after} if retry_after else {}
+        self.response = types.SimpleNamespace(headers=headers)
+
+
+def make_budget(max_weight=100):
+    clock = FakeClock()
+    limiter = gateway.WeightLimiter(max_weight, clock=clock, sleep=clock.sleep)
+    return gateway.WeightBudget(limiter=limiter), clock
+
+
+def test_low_priority_market_data_is_deferred_at_its_ceiling():
+    budget, clock = make_budget(100)
+    gw = gateway.ExchangeGateway(FakeClient(), budget)
+
+    # 37 tickers x 2 weight = 74 <= 75% of 100
+    for _ in range(37):
+        gw.get_symbol_ticker(symbol="BTCUSDT")
+    with pytest.raises(gateway.RequestDeferred):
+        gw.get_symbol_ticker(symbol="BTCUSDT")
+
+    assert budget.stats()["deferred"] == {"get_symbol_ticker": 1}
+    assert budget.stats()["requests"]["get_symbol_ticker"] == 37
+    assert clock.sleeps == []
+
+    # orders may still use the remaining budget without waiting
+    assert gw.create_order(symbol="BTCUSDT")["orderId"] == 1
+    assert clock.sleeps == []
+
+
+def test_high_priority_context_waits_instead_of_deferring():
+    budget, clock = make_budget(10)
+    client = FakeClient()
+    gw = gateway.ExchangeGateway(client, budget)
+
+    with gw.priority(gateway.PRIORITY_HIGH):
+        for _ in range(6):
+            gw.get_symbol_ticker(symbol="BTCUSDT")
+
+    assert clock.sleeps == [60.0]
+    assert len(client.calls) == 6
+    assert budget.stats()["deferred"] == {}
+    assert budget.stats()["throttled_seconds"] == pytest.approx(60.0)
+
+
+def test_server_reported_weight_drives_the_budget():
+    budget, _ = make_budget(100)
+    gw = gateway.ExchangeGateway(FakeClient(used="80"), budget)
+
+    gw.get_asset_balance(asset="USDT")
+
+    assert budget.stats()["used_weight"] == 80
+    with pytest.raises(gateway.RequestDeferred):
+        gw.get_symbol_ticker(symbol="BTCUSDT")
+
+
+def test_rate_limit_response_pauses_all_calls():
+    budget, clock = make_budget(100)
+    client = FakeClient()
+
+    def limited(asset):
+        raise RateLimited(429, retry_after="7")
+
+    client.get_asset_balance = limited
+    gw = gateway.ExchangeGateway(client, budget)
+
+    with pytest.raises(RateLimited):
+        gw.get_asset_balance(asset="USDT")
+    gw.create_order(symbol="BTCUSDT")
+
+    assert clock.sleeps == [pytest.approx(7.0)]
+    assert budget.stats()["rate_limited"] == 1
+
+    # low priority calls are deferred rather than waiting out a ban
+    budget.observe_error(RateLimited(418))
+    with pytest.raises(gateway.RequestDeferred):
+        gw.get_symbol_ticker(symbol="BTCUSDT")
+    assert clock.sleeps == [pytest.approx(7.0)]
+
+
+def test_non_callables_pass_through_and_prometheus_lines():
+    budget, _ = make_budget(100)
+    gw = gateway.ExchangeGateway(FakeClient(), budget)
+
+    assert gw.API_URL == "https://api.binance.com/api"
+    gw.get_symbol_ticker(symbol="BTCUSDT")
+
+    text = "\n".join(budget.prometheus_lines())
+    assert "trade_bot_exchange_weight_used 2" in text
+    assert "trade_bot_exchange_weight_limit 100" in text
+    assert 'trade_bot_exchange_requests_total{endpoint="get_symbol_ticker"} 1' in text
+    assert "trade_bot_exchange_deferred_total" not in text
+
+
+def test_deferred_calls_are_not_retried(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+
+    calls = []
+    sent = []
+
+    def deferred():
+        calls.append(1)
+        raise gateway.RequestDeferred("get_klines deferred")
+
+    monkeypatch.setattr(main, "send", sent.append)
+    monkeypatch.setattr(main.time, "sleep", lambda s: pytest.fail("retried"))
+
+    assert main.call_with_retries(deferred, name="ATR klines") is None
+    assert calls == [1]
+    assert sent == []
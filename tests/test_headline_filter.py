@@ -0,0 +1,65 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from strategies.ensemble import EnsembleStrategy
+from strategies.ma import MovingAverageCrossStrategy
+from strategies.news import HeadlineFilter, NewsScreen
+from strategies.rsi import RSIStrategy
+
+
+def test_filter_matches_word_prefixes_case_insensitively():
+    filt = HeadlineFilter(["ban", "hack", "SEC probe"])
+
+    assert filt.is_bad("Country moves to BAN crypto")
+    assert filt.is_bad("Exchange hacked overnight")
+    assert filt.is_bad("Token banned in two states")
+    assert filt.is_bad("Reports of an sec probe emerge")
+    assert not filt.is_bad("Urban adoption grows")
+    assert not filt.is_bad("Shack prices stable")
+    assert not filt.blocked(["rally", "partnership announced"])
+    assert filt.blocked(["rally", "hack confirmed"])
+
+
+def test_filter_without_keywords_never_blocks():
+    filt = HeadlineFilter([])
+
+    assert not filt.blocked(["hack", "ban"])
+
+
+def test_verdicts_are_memoized():
+    filt = HeadlineFilter(["crash"])
+    headline = "Market crash fears"
+
+    assert filt.is_bad(headline)
+    assert filt.is_bad(headline)
+    info = filt._verdict.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def test_strategy_uses_compiled_filter():
+    strat = MovingAverageCrossStrategy(short_window=1, long_window=2, bad_words=["lawsuit"])
+    strat.seed_history("BTCUSDT", [1.0])
+
+    assert strat.should_buy("BTCUSDT", 2.0, ["Lawsuits pile up"]) is False
+    assert strat.should_buy("BTCUSDT", 3.0, ["Adoption grows"]) is True
+
+
+def test_buy_blocked_by_news_still_records_the_price():
+    strategies = [
+        MovingAverageCrossStrategy(short_window=1, long_window=2, bad_words=["lawsuit"]),
+        RSIStrategy(period=2, oversold=101, bad_words=["lawsuit"]),
+        EnsembleStrategy(
+            [MovingAverageCrossStrategy(short_window=1, long_window=2)], bad_words=["lawsuit"]
+        ),
+    ]
+    for strat in strategies:
+        assert isinstance(strat, NewsScreen)
+        strat.history["BTCUSDT"] = [1.0, 2.0]
+
+        assert strat.should_buy("BTCUSDT", 3.0, ["Lawsuits pile up"]) is False
+        # the price is kept, so the next cycle sees an unbroken series
+        assert strat.history["BTCUSDT"] == [1.0, 2.0, 3.0]
+        assert strat.should_buy("BTCUSDT", 4.0, ["Adoption grows"]) is True
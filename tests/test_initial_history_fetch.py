@@ -1,12 +1,17 @@
 import importlib
 import sys
+import threading
+import time
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 ROOT = Path(__file__).resolve().parents[1]
 sys.path.insert(0, str(ROOT))
 
+import klines
+
 
 def setup_main(monkeypatch, tmp_path):
     monkeypatch.chdir(tmp_path)
@@ -65,4 +70,82 @@ def test_initial_history_allows_first_trade(monkeypatch, tmp_path):
 
     positions = main.db.get_open_positions()
     assert "BTCUSDT" in positions
-    assert len(main.strategy.history["BTCUSDT"]) >= main.strategy.long_window
+    assert len(main.strategy.history["BTCUSDT"]) >= main.strategy.warmup_period()
+
+
+def test_preload_reads_fresh_kline_store(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRADING_PAIRS", '["BTCUSDT"]')
+    main = setup_main(monkeypatch, tmp_path)
+    store = klines.KlineStore(str(tmp_path / "klines"))
+    monkeypatch.setattr(main, "KLINE_STORE", store)
+    fetch = []
+    monkeypatch.setattr(main, "fetch_historical_prices", lambda sym, limit: fetch.append(sym) or [])
+
+    limit = main.strategy.warmup_period()
+    now = int(time.time() * 1000) // 60_000 * 60_000
+    rows = np.array(
+        [(now - (limit - i) * 60_000, 1.0, 1.0, 1.0, float(i), 1.0) for i in range(limit)],
+        dtype=klines.KLINE_DTYPE,
+    )
+    store.append("BTCUSDT", "1m", rows)
+
+    main.preload_history(["BTCUSDT"])
+
+    assert fetch == []
+    assert main.strategy.history["BTCUSDT"] == [float(i) for i in range(limit)]
+
+
+def test_preload_fetches_rsi_warmup(monkeypatch, tmp_path):
+    monkeypatch.setenv("TRADING_PAIRS", '["BTCUSDT"]')
+    monkeypatch.setenv("STRATEGY_NAME", "rsi")
+    main = setup_main(monkeypatch, tmp_path)
+    limits = []
+    monkeypatch.setattr(
+        main,
+        "fetch_historical_prices",
+        lambda sym, limit: limits.append(limit) or [float(i) for i in range(limit)],
+    )
+
+    main.preload_history(["BTCUSDT"])
+
+    assert limits == [main.strategy.period + 1]
+    assert main.strategy.history["BTCUSDT"] == [float(i) for i in range(15)]
+
+
+def test_preload_fetches_missing_symbols_concurrently(monkeypatch, tmp_path):
+    monkeypatch.setenv("PRELOAD_WORKERS", "2")
+    main = setup_main(monkeypatch, tmp_path)
+    symbols = ["AAAUSDT", "BBBUSDT", "CCCUSDT", "DDDUSDT"]
+    for i in range(5):
+        main.save_price("AAAUSDT", float(i), f"2024-01-01 00:0{i}:00")
+
+    lock = threading.Lock()
+    active = []
+    peak = []
+
+    class KlineClient:
+        def get_klines(self, symbol, interval, limit):
+            with lock:
+                active.append(symbol)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(symbol)
+            return [[1_700_000_000_000 + i * 60_000, 0, 0, 0, str(100 + i)] for i in range(limit)]
+
+    monkeypatch.setattr(main, "client", KlineClient())
+    monkeypatch.setattr(main, "call_with_retries", lambda fn, **kwargs: fn())
+    saved = []
+    real_save_prices = main.save_prices
+    monkeypatch.setattr(
+        main, "save_prices", lambda sym, rows: saved.append(sym) or real_save_prices(sym, rows)
+    )
+
+    main.preload_history(symbols)
+
+    assert sorted(saved) == symbols[1:]
+    assert max(peak) == 2
+    assert main.strategy.history["AAAUSDT"] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    for sym in symbols[1:]:
+        assert main.strategy.history[sym] == [100.0, 101.0, 102.0, 103.0, 104.0]
+        assert main.load_prices(sym, 10) == [100.0, 101.0, 102.0, 103.0, 104.0]
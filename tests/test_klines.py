@@ -0,0 +1,152 @@
+import json
+import sys
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import backtest
+import klines
+
+MINUTE = 60_000
+START = 1_700_000_000_000 - 1_700_000_000_000 % MINUTE
+
+
+class FakeKlineServer:
+    """Serve deterministic 1m candles the way /api/v3/klines does."""
+
+    def __init__(self, throttle_first=0):
+        self.requests = []
+        self.throttle_first = throttle_first
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                url = urllib.parse.urlparse(self.path)
+                query = dict(urllib.parse.parse_qsl(url.query))
+                server.requests.append(query)
+                if server.throttle_first > 0:
+                    server.throttle_first -= 1
+                    self.send_response(429)
+                    self.send_header("Retry-After", "0")
+                    self.end_headers()
+                    return
+                start = int(query["startTime"])
+                end = int(query["endTime"])
+                limit = int(query["limit"])
+                first = -(-start // MINUTE) * MINUTE
+                rows = []
+                for t in range(first, end + 1, MINUTE)[:limit]:
+                    price = float(t // MINUTE % 1000)
+                    rows.append([t, str(price), str(price + 1), str(price - 1), str(price), "5", t + MINUTE - 1])
+                body = json.dumps(rows).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("X-MBX-USED-WEIGHT-1M", str(2 * len(server.requests)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    srv = FakeKlineServer()
+    yield srv
+    srv.close()
+
+
+def test_download_paginates_and_resumes(server, tmp_path):
+    store = klines.KlineStore(str(tmp_path))
+    end = START + 2500 * MINUTE
+
+    result = klines.download(
+        ["BTCUSDT", "ethusdt"], start=START, end=end, store=store, workers=2, base_url=server.url
+    )
+
+    assert result == {"BTCUSDT": 2500, "ETHUSDT": 2500}
+    assert len(server.requests) == 6
+    data = store.load("BTCUSDT", "1m")
+    assert data["open_time"][0] == START
+    assert (data["open_time"][1:] - data["open_time"][:-1] == MINUTE).all()
+
+    server.requests.clear()
+    again = klines.download(["BTCUSDT"], start=START, end=end + 10 * MINUTE, store=store, base_url=server.url)
+
+    assert again == {"BTCUSDT": 10}
+    assert len(server.requests) == 1
+    assert int(server.requests[0]["startTime"]) == START + 2500 * MINUTE
+    assert store.count("BTCUSDT", "1m") == 2510
+
+
+def test_partial_record_is_ignored_and_repaired(server, tmp_path):
+    store = klines.KlineStore(str(tmp_path))
+    klines.download(["BTCUSDT"], start=START, end=START + 5 * MINUTE, store=store, base_url=server.url)
+    with open(store.path("BTCUSDT", "1m"), "ab") as f:
+        f.write(b"\x00" * 10)
+
+    assert store.count("BTCUSDT", "1m") == 5
+    klines.download(["BTCUSDT"], start=START, end=START + 7 * MINUTE, store=store, base_url=server.url)
+    assert store.load("BTCUSDT", "1m")["open_time"].tolist() == [START + i * MINUTE for i in range(7)]
+
+
+def test_rate_limited_response_is_retried(tmp_path):
+    srv = FakeKlineServer(throttle_first=1)
+    try:
+        store = klines.KlineStore(str(tmp_path))
+        result = klines.download(["BTCUSDT"], start=START, end=START + 3 * MINUTE, store=store, base_url=srv.url)
+    finally:
+        srv.close()
+
+    assert result == {"BTCUSDT": 3}
+    assert len(srv.requests) == 2
+
+
+def test_weight_limiter_waits_for_window():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    limiter = klines.WeightLimiter(max_weight=4, clock=lambda: now[0], sleep=sleep)
+    limiter.acquire(2)
+    limiter.acquire(2)
+    limiter.acquire(2)
+    assert sleeps == [60.0]
+
+    limiter.observe(4)
+    limiter.acquire(2)
+    assert len(sleeps) == 2
+
+    limiter.backoff(5)
+    before = now[0]
+    limiter.acquire(0)
+    assert now[0] - before == pytest.approx(5)
+
+
+def test_backtest_and_store_closes_read_download(server, tmp_path):
+    store = klines.KlineStore(str(tmp_path))
+    klines.download(["BTCUSDT"], start=START, end=START + 50 * MINUTE, store=store, base_url=server.url)
+
+    bars = backtest.load_store(str(tmp_path), "BTCUSDT")
+    assert bars["closes"].shape == (50,)
+    assert (bars["highs"] - bars["closes"] == 1).all()
+    assert store.closes("BTCUSDT", "1m", 3) == bars["closes"][-3:].tolist()
+    # candles from 2023 are far older than any freshness limit
+    assert store.closes("BTCUSDT", "1m", 3, max_age=600) == []
@@ -0,0 +1,120 @@
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+def _setup_main(monkeypatch, tmp_path, trading_pairs):
+    monkeypatch.setenv("TELEGRAM_TOKEN", "token")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "chat")
+    monkeypatch.setenv("BINANCE_API_KEY", "key")
+    monkeypatch.setenv("BINANCE_SECRET_KEY", "secret")
+    monkeypatch.setenv("NEWSAPI_KEY", "news")
+    monkeypatch.setenv("TRADING_PAIRS", trading_pairs)
+    monkeypatch.setenv("TRADE_DB_FILE", str(tmp_path / "trading.db"))
+
+    for mod in ["db", "main"]:
+        if mod in sys.modules:
+            del sys.modules[mod]
+
+    import db
+
+    db.init_db()
+
+    import binance.client as bc
+
+    class DummyClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+        def get_asset_balance(self, asset):
+            return {"free": "1000"}
+
+    monkeypatch.setattr(bc, "Client", DummyClient)
+
+    main = importlib.import_module("main")
+    monkeypatch.setattr(main, "preload_history", lambda symbols=None: None)
+    monkeypatch.setattr(main, "get_usdt_balance", lambda: 1000.0)
+    monkeypatch.setattr(main, "load_json", lambda path, default: {"usdt": 1000.0, "total": 1000.0})
+    monkeypatch.setattr(main, "update_balance", lambda balance, positions, price_cache: balance["usdt"])
+    monkeypatch.setattr(main, "send", lambda msg: None)
+    monkeypatch.setattr(main, "save_json", lambda path, data: None)
+    monkeypatch.setattr(main, "get_stop_distance", lambda s, p: 2.0)
+    monkeypatch.setattr(main, "place_order", MagicMock(return_value={}))
+    return main
+
+
+def test_news_only_fetched_for_technical_candidates(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["BTCUSDT", "XRPUSDT", "ETHUSDT"]')
+
+    news = MagicMock(return_value=["rally"])
+    monkeypatch.setattr(main, "get_news_headlines", news)
+    monkeypatch.setattr(main, "get_price", lambda symbol: 100.0)
+    # Only ETH has a rising series that produces a crossover buy signal
+    main.strategy.history["BTCUSDT"] = [104.0, 103.0, 102.0, 101.0]
+    main.strategy.history["ETHUSDT"] = [96.0, 97.0, 98.0, 99.0]
+    main.strategy.history["XRPUSDT"] = [100.0, 100.0, 100.0, 100.0]
+
+    main.trade()
+
+    news.assert_called_once_with("ETHUSDT")
+    assert main.NEWS_LOOKUPS == {"priced": 3, "fetched": 1}
+    assert "ETHUSDT" in main.db.get_open_positions()
+
+
+def test_news_skipped_when_daily_cap_exhausted(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["BTCUSDT"]')
+
+    positions = {
+        "ETHUSDT": {
+            "qty": 1.0,
+            "entry": main.DAILY_MAX_INVEST,
+            "stop_loss": None,
+            "take_profit": None,
+            "trail_price": main.DAILY_MAX_INVEST,
+            "trade_id": 1,
+            "stop_distance": 1.0,
+        }
+    }
+    monkeypatch.setattr(main.db, "get_open_positions", lambda: positions)
+    monkeypatch.setattr(main.strategy, "should_sell", lambda *args: False)
+    prices = {"BTCUSDT": 100.0, "ETHUSDT": main.DAILY_MAX_INVEST}
+    monkeypatch.setattr(main, "get_price", lambda symbol: prices[symbol])
+
+    def should_buy(symbol, price, headlines):
+        return not any("hack" in h for h in headlines)
+
+    monkeypatch.setattr(main.strategy, "should_buy", should_buy)
+    news = MagicMock(return_value=["hack"])
+    monkeypatch.setattr(main, "get_news_headlines", news)
+
+    main.trade()
+
+    news.assert_not_called()
+    assert main.NEWS_LOOKUPS == {"priced": 2, "fetched": 0}
+    main.place_order.assert_not_called()
+
+
+def test_price_is_recorded_before_the_news_check(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["ETHUSDT"]')
+    monkeypatch.setattr(main, "get_price", lambda symbol: 100.0)
+    main.strategy.history["ETHUSDT"] = [96.0, 97.0, 98.0, 99.0]
+    seen = []
+
+    def news(symbol):
+        seen.append(list(main.strategy.history[symbol]))
+        return ["Exchange hack drains wallets"]
+
+    monkeypatch.setattr(main, "get_news_headlines", news)
+
+    main.trade()
+
+    # headlines are read only after the cycle's price joined the history
+    assert seen == [[96.0, 97.0, 98.0, 99.0, 100.0]]
+    # the bad news blocks the buy but the price stays in the series
+    assert main.strategy.history["ETHUSDT"][-1] == 100.0
+    assert main.db.get_open_positions() == {}
+    main.place_order.assert_not_called()
@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import loadtest
+
+
+def test_synthetic_exchange_fills_orders_and_serves_klines():
+    exchange = loadtest.SyntheticExchange(["AAAUSDT"], seed=1, usdt=1000.0)
+    price = float(exchange.get_symbol_ticker(symbol="AAAUSDT")["price"])
+
+    klines = exchange.get_klines(symbol="AAAUSDT", interval="1h", limit=15)
+    assert len(klines) == 15
+    assert float(klines[-1][4]) == price
+    assert klines[1][0] - klines[0][0] == 3_600_000
+
+    exchange.create_order(symbol="AAAUSDT", side="BUY", type="MARKET", quantity=2)
+    assert exchange.balances["AAA"] == 2
+    assert exchange.balances["USDT"] == 1000.0 - 2 * price
+    assert exchange.calls == {"get_symbol_ticker": 1, "get_klines": 1, "create_order": 1}
+
+    exchange.tick()
+    assert float(exchange.get_symbol_ticker(symbol="AAAUSDT")["price"]) != price
+
+
+def test_stub_http_answers_newsapi_and_telegram():
+    http = loadtest.StubHTTP(headlines=2)
+
+    news = http.get("https://newsapi.org/v2/everything", params={"q": "BTC"}).json()
+    sent = http.post("https://api.telegram.org/botX/sendMessage", data={}).json()
+
+    assert [a["title"] for a in news["articles"]] == ["BTC market update 0", "BTC market update 1"]
+    assert sent["ok"] is True
+    assert http.calls == {"newsapi": 1, "telegram.sendMessage": 1}
+
+
+def test_run_load_reports_cycle_costs(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+
+    result = loadtest.run_load(20, cycles=3, spans=True, max_orders=100)
+
+    assert list(tmp_path.iterdir()) == []
+    assert result["symbols"] == 20
+    assert result["cycles"] == 3
+    assert result["priced_per_cycle"] == [20, 20, 20]
+    # every priced symbol is saved: one insert plus one trim
+    assert all(writes >= 40 for writes in result["db_writes_per_cycle"])
+    assert result["exchange_calls"]["get_symbol_ticker"] == 60
+    assert result["exchange_calls"]["get_klines"] >= 20
+    assert result["per_symbol_ms"] > 0
+    assert "phase:symbols" in result["phases_ms"]
+    assert "symbols" in loadtest.format_results([result])
@@ -0,0 +1,106 @@
+import importlib
+import sys
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import metrics
+
+
+def setup_main(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    return importlib.import_module("main")
+
+
+def test_disabled_metrics_record_nothing():
+    m = metrics.Metrics()
+
+    with m.span("cycle"):
+        pass
+    m.observe("symbols", 1.0)
+
+    assert m.span("cycle") is m.span("other")
+    assert m.summary() == {}
+    assert m.end_cycle() == {}
+
+
+def test_percentiles_and_prometheus_text():
+    m = metrics.Metrics(enabled=True, window=100)
+    for ms in range(1, 101):
+        m.observe("preload", ms / 1000)
+    m.observe('NewsAPI "X"', 0.25, kind="call")
+
+    stats = m.summary()["phase:preload"]
+    assert stats["count"] == 100
+    assert (stats["p50"], stats["p95"], stats["p99"]) == (0.05, 0.095, 0.099)
+    assert m.end_cycle()["phase:preload"] == pytest.approx(5.05)
+
+    text = m.render()
+    assert "trade_bot_cycles_total 1" in text
+    assert "# TYPE trade_bot_phase_seconds summary" in text
+    assert 'trade_bot_phase_seconds{phase="preload",quantile="0.95"} 0.095000' in text
+    assert 'trade_bot_phase_seconds_count{phase="preload"} 100' in text
+    assert 'trade_bot_call_seconds_sum{call="NewsAPI \\"X\\""} 0.250000' in text
+
+
+def test_window_bounds_samples_but_not_totals():
+    m = metrics.Metrics(enabled=True, window=3)
+    for seconds in (9.0, 1.0, 1.0, 1.0):
+        m.observe("cycle", seconds)
+
+    stats = m.summary()["phase:cycle"]
+    assert stats["p99"] == 1.0
+    assert stats["count"] == 4
+    assert stats["sum"] == 12.0
+
+
+def test_serve_metrics_endpoint():
+    m = metrics.Metrics(enabled=True)
+    m.observe("cycle", 0.5)
+    server = m.serve(0)
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/metrics"
+        with urllib.request.urlopen(url, timeout=5) as resp:
+            body = resp.read().decode()
+    finally:
+        m.close()
+    assert 'trade_bot_phase_seconds_count{phase="cycle"} 1' in body
+
+
+def test_call_with_retries_spans_and_metrics_file(monkeypatch, tmp_path):
+    monkeypatch.setenv("METRICS_ENABLED", "1")
+    monkeypatch.setenv("METRICS_FILE", str(tmp_path / "bot.prom"))
+    main = setup_main(monkeypatch, tmp_path)
+    monkeypatch.setattr(main.time, "sleep", lambda s: None)
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise RuntimeError("boom")
+        return 42
+
+    assert main.call_with_retries(flaky, name="Binance price BTCUSDT", breaker="binance.ticker") == 42
+    assert main.call_with_retries(lambda: 7, name="Binance price ETHUSDT", breaker="binance.ticker") == 7
+    assert main.call_with_retries(lambda: {}, name="Binance order BTCUSDT", metric="binance.order") == {}
+    cycle = main.record_cycle_metrics()
+
+    # one series per endpoint, not per symbol
+    assert set(cycle) == {"call:binance.ticker", "call:binance.order"}
+    text = (tmp_path / "bot.prom").read_text()
+    assert 'trade_bot_call_seconds_count{call="binance.ticker"} 2' in text
+    assert "BTCUSDT" not in text
@@ -0,0 +1,100 @@
+import importlib
+import json
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import montecarlo
+
+
+def test_bootstrap_constant_profits_is_deterministic():
+    result = montecarlo.bootstrap([1.0, 1.0, 1.0], 100.0, simulations=50, horizon=10, seed=1)
+
+    assert result["final_balance"]["p5"] == pytest.approx(110.0)
+    assert result["max_drawdown_pct"]["p99"] == 0.0
+    assert result["ruin_probability"] == 0.0
+    assert result["loss_probability"] == 0.0
+
+
+def test_bootstrap_drawdown_and_ruin():
+    result = montecarlo.bootstrap(
+        [-10.0, 5.0], 100.0, simulations=4000, horizon=20, ruin_pct=50, seed=7
+    )
+
+    # Every path of 20 trades contains at least one loss
+    assert result["max_drawdown_pct"]["p5"] >= 10.0 * 100 / 105 - 1e-9
+    assert 0.0 < result["ruin_probability"] < 1.0
+    assert result["loss_probability"] > 0.5
+    assert result["final_balance"]["p5"] <= result["final_balance"]["p95"]
+    assert "P(loss)" in montecarlo.format_report(result)
+
+
+def test_bootstrap_is_fast_for_telegram():
+    profits = np.random.default_rng(0).normal(0.1, 1.0, size=500)
+
+    started = time.perf_counter()
+    result = montecarlo.bootstrap(profits, 100.0, simulations=10_000, seed=0)
+
+    assert time.perf_counter() - started < 5
+    assert result["horizon"] == 500
+
+
+def test_no_trades_report():
+    result = montecarlo.bootstrap([], 100.0)
+
+    assert result["trades"] == 0
+    assert "no closed trades" in montecarlo.format_report(result)
+
+
+def test_reads_trades_table_and_backtest_output(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("TRADE_DB_FILE", str(tmp_path / "trades.db"))
+    if "db" in sys.modules:
+        del sys.modules["db"]
+    db = importlib.import_module("db")
+    db.init_db()
+    for profit in (2.0, -1.0, 3.0):
+        trade_id = db.log_trade("BTCUSDT", "BUY", 1.0, 100.0)
+        db.update_trade_pnl(trade_id, profit, profit, profit)
+    db.log_trade("ETHUSDT", "BUY", 1.0, 10.0)  # still open
+
+    assert db.get_closed_trade_profits() == [2.0, -1.0, 3.0]
+    assert db.get_closed_trade_profits(2) == [-1.0, 3.0]
+
+    bt = tmp_path / "bt.json"
+    bt.write_text(json.dumps({"trades": [{"profit": 1.5}, {"profit": -0.5}]}))
+    assert montecarlo.load_backtest_profits(str(bt)) == [1.5, -0.5]
+
+    assert montecarlo.main(["--sims", "100", "--seed", "3", "--json"]) == 0
+    out = json.loads(capsys.readouterr().out)
+    assert out["trades"] == 3
+
+
+def test_telegram_simulation_count_is_capped(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for var in ["TELEGRAM_TOKEN", "BINANCE_API_KEY", "BINANCE_SECRET_KEY", "NEWSAPI_KEY"]:
+        monkeypatch.setenv(var, "x")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "42")
+    monkeypatch.setenv("MONTE_CARLO_MAX_SIMULATIONS", "1000")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+    sent = []
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: sent.append(msg))
+    runs = []
+    monkeypatch.setattr(main, "send_monte_carlo_report", runs.append)
+
+    def command(text):
+        main.handle_telegram_update({"message": {"chat": {"id": 42}, "text": text}})
+
+    command("MC 999999999")
+    command("MC 500")
+    command("MONTECARLO")
+
+    assert runs == [1000, 500, None]
+    assert sent == ["ℹ️ 999999999 simulations is above the limit; running 1000."]
@@ -0,0 +1,260 @@
+import importlib
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import notifier
+
+
+class BlockingSink:
+    """Record deliveries; hold them until ``release`` is set."""
+
+    def __init__(self):
+        self.delivered = []
+        self.release = threading.Event()
+        self.entered = threading.Event()
+
+    def __call__(self, msg):
+        self.entered.set()
+        self.release.wait(5)
+        self.delivered.append(msg)
+
+
+def test_not_started_delivers_synchronously():
+    delivered = []
+    n = notifier.Notifier(delivered.append)
+
+    n.submit("hello")
+
+    assert delivered == ["hello"]
+    assert n.stats["sent"] == 1
+
+
+def test_started_notifier_queues_in_order_and_flushes_on_stop():
+    sink = BlockingSink()
+    n = notifier.Notifier(sink).start()
+
+    started = time.perf_counter()
+    for i in range(5):
+        n.submit(f"m{i}")
+    assert time.perf_counter() - started < 0.5
+    assert sink.entered.wait(5)
+    assert n.pending() == 5
+
+    sink.release.set()
+    assert n.stop(timeout=5)
+    assert sink.delivered == ["m0", "m1", "m2", "m3", "m4"]
+    assert not n.running
+
+
+def test_overload_merges_then_drops_oldest():
+    sink = BlockingSink()
+    n = notifier.Notifier(sink, maxsize=2, max_length=20).start()
+    n.submit("first")
+    assert sink.entered.wait(5)  # "first" is in flight, the queue is empty
+
+    n.submit("a")
+    n.submit("b")
+    n.submit("c")  # queue full: merged into "b"
+    n.submit("x" * 19)  # too long to merge: "a" is dropped
+
+    assert n.stats["merged"] == 1 and n.stats["dropped"] == 1
+    sink.release.set()
+    assert n.flush(timeout=5)
+    assert sink.delivered == ["first", "b\nc", "x" * 19]
+    n.stop()
+
+
+def test_failed_deliveries_are_counted():
+    n = notifier.Notifier(lambda msg: False)
+    n.submit("lost")
+    assert (n.stats["sent"], n.stats["failed"]) == (0, 1)
+    assert 'trade_bot_notifications_total{outcome="failed"} 1' in n.prometheus_lines()
+
+
+def test_send_does_not_wait_for_telegram(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+
+    sink = BlockingSink()
+    monkeypatch.setattr(main, "NOTIFIER", notifier.Notifier(sink).start())
+
+    started = time.perf_counter()
+    main.send("🛑 BTCUSDT stop-loss")
+    assert time.perf_counter() - started < 0.5
+
+    sink.release.set()
+    assert main.NOTIFIER.stop(timeout=5)
+    assert sink.delivered == ["🛑 BTCUSDT stop-loss"]
+
+
+def test_token_bucket_limits_rate_and_honours_retry_after():
+    now = [0.0]
+    sleeps = []
+
+    def sleep(seconds):
+        sleeps.append(seconds)
+        now[0] += seconds
+
+    bucket = notifier.TokenBucket(rate=1.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 1.0]
+
+    bucket.pause(5)
+    assert bucket.acquire() == 5.0
+    assert notifier.TokenBucket(rate=0).acquire() == 0.0
+
+
+def test_digest_merges_routine_messages_and_urgent_ones_go_first():
+    sink = BlockingSink()
+    sink.release.set()
+    n = notifier.Notifier(sink, digest_window=0.2).start()
+
+    n.submit("🟢 BUY BTCUSDT")
+    n.submit("🔒 ETHUSDT break-even")
+    n.submit("🔒 XRPUSDT break-even")
+    n.submit("🛑 STOP SOLUSDT", urgent=True)
+    assert sink.entered.wait(5)
+    time.sleep(0.05)
+    assert sink.delivered == ["🛑 STOP SOLUSDT"]
+
+    assert n.stop(timeout=5)
+    assert sink.delivered == [
+        "🛑 STOP SOLUSDT",
+        "🟢 BUY BTCUSDT\n🔒 ETHUSDT break-even\n🔒 XRPUSDT break-even",
+    ]
+    assert n.stats["digested"] == 3 and n.stats["urgent"] == 1
+
+
+def test_messages_and_polls_share_the_rate_limit(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+
+    class Bucket:
+        def __init__(self):
+            self.acquired = 0
+            self.paused = []
+
+        def acquire(self):
+            self.acquired += 1
+            return 0.0
+
+        def pause(self, seconds):
+            self.paused.append(seconds)
+
+    class Response:
+        def __init__(self, status_code, payload):
+            self.status_code = status_code
+            self.payload = payload
+
+        def json(self):
+            return self.payload
+
+        def raise_for_status(self):
+            pass
+
+    responses = [
+        Response(429, {"ok": False, "parameters": {"retry_after": 7}}),
+        Response(200, {"ok": True}),
+        Response(200, {"result": {"poll": {"id": "p1"}}}),
+    ]
+    bucket = Bucket()
+    monkeypatch.setattr(main, "TELEGRAM_BUCKET", bucket)
+    monkeypatch.setattr(main.time, "sleep", lambda s: None)
+    monkeypatch.setattr(
+        main, "http_session", lambda upstream: types.SimpleNamespace(post=lambda *a, **k: responses.pop(0))
+    )
+
+    main.send("hello")
+    assert main.send_poll("Sell?", ["Confirm", "Decline"]) == "p1"
+
+    assert bucket.acquired == 3
+    assert bucket.paused == [7.0]
+    assert main.NOTIFIER.stats["sent"] == 1
+
+
+def test_calls_run_on_the_sender_thread_in_order():
+    sink = BlockingSink()
+    n = notifier.Notifier(sink).start()
+    n.submit("routine")
+    assert sink.entered.wait(5)  # "routine" is in flight
+
+    ran = []
+    first = n.call(lambda: ran.append("prompt") or 7)
+    second = n.call(lambda: ran.append("edit"))
+    assert not first.done() and ran == []
+
+    sink.release.set()
+    assert first.result(timeout=5) == 7
+    second.result(timeout=5)
+    assert ran == ["prompt", "edit"]
+
+    failing = n.call(lambda: 1 / 0)
+    assert isinstance(failing.exception(timeout=5), ZeroDivisionError)
+    assert n.stop(timeout=5)
+
+    # not started: the call runs at once
+    assert notifier.Notifier(sink).call(lambda: 3).result(timeout=0) == 3
+
+
+def test_confirmations_do_not_block_the_trading_loop(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "TELEGRAM_CHAT_ID",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+
+    telegram_up = threading.Event()
+    calls = []
+
+    def telegram_call(method, data, limited=True):
+        telegram_up.wait(5)
+        calls.append((method, data))
+        return {"ok": True, "result": {"message_id": 77}}
+
+    monkeypatch.setattr(main, "_telegram_call", telegram_call)
+    monkeypatch.setattr(main, "NOTIFIER", notifier.Notifier(lambda msg: True).start())
+    decision = {"symbol": "BTCUSDT", "action": "sell", "price": 94.0}
+
+    started = time.perf_counter()
+    main._store_pending_decision(decision, "Stop-loss hit for BTCUSDT. SELL?")
+    main.finalize_pending_decision("BTCUSDT", False)
+    assert time.perf_counter() - started < 0.5
+    assert calls == []
+
+    telegram_up.set()
+    assert main.NOTIFIER.stop(timeout=5)
+    assert [method for method, _ in calls] == ["sendMessage", "editMessageText"]
+    assert calls[1][1]["message_id"] == 77
+    assert decision["message_id"] == 77
@@ -0,0 +1,88 @@
+import importlib
+import pstats
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import profiling
+
+
+def busy_work(n=20000):
+    return sum(i * i for i in range(n))
+
+
+def test_cycle_profiler_profiles_armed_cycles(tmp_path):
+    profiler = profiling.CycleProfiler(str(tmp_path))
+
+    with profiler.cycle() as result:
+        busy_work()
+    assert result == []
+    assert list(tmp_path.iterdir()) == []
+
+    profiler.arm(2)
+    with profiler.cycle() as first:
+        busy_work()
+    with profiler.cycle() as second:
+        busy_work()
+
+    assert first == []
+    assert len(second) == 1 and second[0].endswith(".prof")
+    assert profiler.cycles == 2 and not profiler.active
+    stats = pstats.Stats(second[0])
+    assert any(func[2] == "busy_work" for func in stats.stats)
+    summary = Path(second[0][: -len(".prof")] + ".txt").read_text()
+    assert summary.startswith("2 cycle(s)")
+
+
+def test_stack_sampler_writes_collapsed_stacks(tmp_path):
+    stop = threading.Event()
+
+    def spin():
+        while not stop.is_set():
+            busy_work(2000)
+
+    worker = threading.Thread(target=spin, name="spinner")
+    worker.start()
+    done = []
+    try:
+        sampler = profiling.StackSampler(
+            0.3, interval=0.005, directory=str(tmp_path), on_done=done.append
+        ).start()
+        path = sampler.join(timeout=5)
+    finally:
+        stop.set()
+        worker.join()
+
+    assert done == [path]
+    lines = Path(path).read_text().splitlines()
+    assert sampler.samples > 5
+    spinner = [line for line in lines if line.startswith("spinner;")]
+    assert spinner and any("busy_work (test_profiling.py:" in line for line in spinner)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in lines)
+    assert not any(line.startswith("stack-sampler;") for line in lines)
+
+
+def test_profile_command(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    for var in ["TELEGRAM_TOKEN", "TELEGRAM_CHAT_ID", "BINANCE_API_KEY", "BINANCE_SECRET_KEY"]:
+        monkeypatch.setenv(var, "x")
+    monkeypatch.setenv("PROFILE_DIR", str(tmp_path / "prof"))
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+    sent = []
+    monkeypatch.setattr(main, "send", sent.append)
+
+    assert main.handle_profile_command(["3"]) == "🧪 Profiling the next 3 trade cycle(s)."
+    assert main.PROFILER.remaining == 3
+
+    assert "Sampling" in main.handle_profile_command(["sample", "1"])
+    assert "already running" in main.handle_profile_command(["SAMPLE"])
+    main.SAMPLER.stop()
+    path = main.SAMPLER.join(timeout=5)
+    assert path.startswith(str(tmp_path / "prof"))
+    assert sent == [f"🧪 Stack samples saved to {path}"]
@@ -0,0 +1,96 @@
+import importlib
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import report
+
+
+def _make_state(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRADE_DB_FILE", str(tmp_path / "trading.db"))
+    if "db" in sys.modules:
+        del sys.modules["db"]
+    db = importlib.import_module("db")
+    db.init_db()
+    for symbol, profit, pct in [("BTCUSDT", 2.0, 2.0), ("ETHUSDT", -1.0, -1.0), ("BTCUSDT", 1.0, 1.0)]:
+        trade_id = db.log_trade(symbol, "BUY", 1.0, 100.0)
+        db.update_trade_pnl(trade_id, profit, profit, pct)
+    trade_id = db.log_trade("SOLUSDT", "BUY", 2.0, 10.0)
+    db.upsert_position("SOLUSDT", 2.0, 10.0, 9.0, 12.0, trade_id, 10.0, 1.0)
+
+    with sqlite3.connect(tmp_path / "prices.db") as conn:
+        conn.execute("CREATE TABLE prices (timestamp TEXT, symbol TEXT, price REAL)")
+        conn.executemany(
+            "INSERT INTO prices VALUES (?, ?, ?)",
+            [("2024-01-01 00:00:00", "SOLUSDT", 10.5), ("2024-01-01 00:05:00", "SOLUSDT", 11.0)],
+        )
+    (tmp_path / "balance.json").write_text(
+        json.dumps({"usdt": 80.0, "total": 102.0, "start_balance": 100.0})
+    )
+
+
+def test_report_reads_local_state(tmp_path, monkeypatch):
+    _make_state(tmp_path, monkeypatch)
+
+    rep = report.build_report(
+        str(tmp_path / "balance.json"), prices_db=str(tmp_path / "prices.db")
+    )
+
+    assert rep["current_balance"] == 80.0 and rep["balance_source"] == "stored"
+    assert rep["positions"] == [
+        {"symbol": "SOLUSDT", "qty": 2.0, "entry": 10.0, "last_price": 11.0, "unrealized_pnl": 2.0}
+    ]
+    assert rep["closed_trades"] == 3
+    assert rep["realized_pnl"] == pytest.approx(2.0)
+    assert rep["win_rate_pct"] == pytest.approx(200 / 3)
+    assert rep["by_symbol"][0] == {"symbol": "BTCUSDT", "trades": 2, "pnl": 3.0}
+    text = report.format_report(rep)
+    assert "SOLUSDT: 2 @ $10.00 → $11.00 (+2.00)" in text
+
+
+def test_report_without_state_creates_nothing(tmp_path):
+    rep = report.build_report(
+        str(tmp_path / "balance.json"),
+        str(tmp_path / "trading.db"),
+        str(tmp_path / "prices.db"),
+    )
+
+    assert rep["start_balance"] == report.START_BALANCE
+    assert rep["positions"] == [] and rep["closed_trades"] == 0
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_refresh_falls_back_to_stored_balance(tmp_path, monkeypatch):
+    _make_state(tmp_path, monkeypatch)
+    monkeypatch.setattr(report, "fetch_usdt_balance", lambda: None)
+    rep = report.build_report(str(tmp_path / "balance.json"), refresh=True)
+    assert (rep["current_balance"], rep["balance_source"]) == (80.0, "stored")
+
+    monkeypatch.setattr(report, "fetch_usdt_balance", lambda: 55.0)
+    rep = report.build_report(str(tmp_path / "balance.json"), refresh=True)
+    assert (rep["current_balance"], rep["balance_source"]) == (55.0, "exchange")
+
+
+def test_cli_does_not_import_main_or_exchange(tmp_path):
+    code = (
+        "import sys, report; report.main(['--json']); "
+        "print(any(m in sys.modules for m in ('main', 'binance', 'requests')))"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env={"PYTHONPATH": str(ROOT), "PATH": ""},
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+    assert out.strip().endswith("False")
+    assert json.loads(out.rsplit("\n", 2)[0])["closed_trades"] == 0
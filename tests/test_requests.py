@@ -1,11 +1,14 @@
 import os
 import sys
+import tempfile
 import types
 import unittest
 from unittest.mock import MagicMock, patch
 
 # Stub external modules if not installed
 requests_mock = MagicMock()
+# main talks to Telegram and NewsAPI through pooled sessions
+session_mock = requests_mock.Session.return_value
 sys.modules['requests'] = requests_mock
 
 dotenv = types.ModuleType('dotenv')
@@ -30,6 +33,11 @@ import main
 
 class TestExternalRequests(unittest.TestCase):
     def setUp(self):
+        # get_price stores each price in prices.db in the working directory
+        workdir = tempfile.TemporaryDirectory()
+        self.addCleanup(workdir.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(workdir.name)
         self.sleep = patch('time.sleep', return_value=None)
         self.sleep.start()
         requests_mock.reset_mock()
@@ -38,11 +46,14 @@ class TestExternalRequests(unittest.TestCase):
 
     def tearDown(self):
         self.sleep.stop()
+        # Exhausted side_effect lists would leak into later tests sharing the mocks
+        requests_mock.reset_mock(side_effect=True)
+        client_instance.reset_mock(side_effect=True)
 
     def test_send_retry_on_failure(self):
-        requests_mock.post.side_effect = [Exception('fail'), None]
+        session_mock.post.side_effect = [Exception('fail'), None]
         main.send('hello')
-        self.assertEqual(requests_mock.post.call_count, 2)
+        self.assertEqual(session_mock.post.call_count, 2)
 
     def test_get_price_retry(self):
         client_instance.get_symbol_ticker.side_effect = [Exception('err'), {'price': '100'}]
@@ -53,10 +64,10 @@ class TestExternalRequests(unittest.TestCase):
     def test_get_news_retry(self):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {'articles': [{'title': 'Good'}]}
-        requests_mock.get.side_effect = [Exception('fail'), mock_resp]
+        session_mock.get.side_effect = [Exception('fail'), mock_resp]
         headlines = main.get_news_headlines('BTCUSDT')
         self.assertEqual(headlines, ['Good'])
-        self.assertEqual(requests_mock.get.call_count, 2)
+        self.assertEqual(session_mock.get.call_count, 2)
     
     def test_get_usdt_balance_retry(self):
         client_instance.get_asset_balance.side_effect = [Exception('err'), {'free': '50'}]
@@ -70,5 +81,23 @@ class TestExternalRequests(unittest.TestCase):
         self.assertEqual(bal, 50.0)
         self.assertEqual(client_instance.get_asset_balance.call_count, 2)
 
+    def test_sessions_are_pooled_per_upstream(self):
+        main.close_http_sessions()
+        session = main.http_session('telegram')
+        self.assertIs(main.http_session('telegram'), session)
+        requests_mock.adapters.HTTPAdapter.assert_called_once_with(
+            pool_connections=1, pool_maxsize=main.HTTP_POOL_SIZES['telegram']
+        )
+        session.mount.assert_called_once_with(
+            'https://', requests_mock.adapters.HTTPAdapter.return_value
+        )
+
+        # a replaced requests module gets its own session; stubs without
+        # Session are used directly
+        stub = types.SimpleNamespace(post=MagicMock())
+        with patch.object(main, 'requests', stub):
+            self.assertIs(main.http_session('telegram'), stub)
+        self.assertIs(main.http_session('telegram'), session)
+
 if __name__ == '__main__':
     unittest.main()
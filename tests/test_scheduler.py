@@ -0,0 +1,156 @@
+import importlib
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import scheduler
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_scheduler_keeps_a_fixed_cadence():
+    clock = FakeClock()
+    cadence = scheduler.CycleScheduler(300, 240, clock=clock, sleep=clock.sleep)
+
+    assert cadence.wait() == 240
+    clock.now += 100  # short cycle: sleep only for the rest of the slot
+    assert cadence.wait() == 540
+    assert clock.sleeps == [200]
+
+    clock.now += 350  # overran its slot by 50 s: start at once, stay on the grid
+    assert cadence.wait() == 650 + 240
+    assert clock.sleeps == [200]
+    clock.now += 200
+    cadence.wait()
+    assert clock.now == 900 and clock.sleeps == [200, 50]
+
+    clock.now += 1000  # ran over three slots: skip them instead of catching up
+    cadence.wait()
+    assert (cadence.overruns, cadence.skipped, cadence.cycles) == (2, 2, 5)
+    clock.now += 10
+    cadence.wait()
+    assert clock.now == pytest.approx(2100)
+
+
+def _setup_main(monkeypatch, tmp_path, trading_pairs):
+    for var, value in {
+        "TELEGRAM_TOKEN": "token",
+        "TELEGRAM_CHAT_ID": "chat",
+        "BINANCE_API_KEY": "key",
+        "BINANCE_SECRET_KEY": "secret",
+        "NEWSAPI_KEY": "news",
+        "TRADING_PAIRS": trading_pairs,
+        "TRADE_DB_FILE": str(tmp_path / "trading.db"),
+    }.items():
+        monkeypatch.setenv(var, value)
+    monkeypatch.chdir(tmp_path)
+    for mod in ["db", "main"]:
+        if mod in sys.modules:
+            del sys.modules[mod]
+
+    import db
+
+    db.init_db()
+
+    import binance.client as bc
+
+    class DummyClient:
+        def __init__(self, *args, **kwargs):
+            pass
+
+    monkeypatch.setattr(bc, "Client", DummyClient)
+    main = importlib.import_module("main")
+    monkeypatch.setattr(main, "preload_history", lambda symbols=None: None)
+    monkeypatch.setattr(main, "get_usdt_balance", lambda: 1000.0)
+    monkeypatch.setattr(main, "load_json", lambda path, default: {"usdt": 1000.0, "total": 1000.0})
+    monkeypatch.setattr(main, "update_balance", lambda balance, positions, price_cache: balance["usdt"])
+    monkeypatch.setattr(main, "send", lambda msg: None)
+    monkeypatch.setattr(main, "get_news_headlines", lambda symbol: [])
+    monkeypatch.setattr(main, "place_order", MagicMock(return_value={}))
+    monkeypatch.setattr(main.strategy, "should_buy", lambda *a: False)
+    monkeypatch.setattr(main.strategy, "should_sell", lambda *a: False)
+    return main
+
+
+def test_exits_first_and_deferred_candidates_lead_the_next_cycle(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["BTCUSDT", "ETHUSDT", "XRPUSDT", "SOLUSDT"]')
+    main.db.upsert_position("SOLUSDT", 1.0, 100.0, 90.0, 130.0, None, 100.0, 10.0)
+    clock = [0.0]
+    monkeypatch.setattr(main.time, "monotonic", lambda: clock[0])
+    priced = []
+
+    def get_price(symbol):
+        priced.append(symbol)
+        clock[0] += 1.0  # every lookup costs a second
+        return 100.0
+
+    monkeypatch.setattr(main, "get_price", get_price)
+
+    main.trade(deadline=2.0)
+
+    assert priced == ["SOLUSDT", "BTCUSDT"]
+    assert main.DEFERRED_SYMBOLS == ["ETHUSDT", "XRPUSDT"]
+    assert main.CYCLE_STATS["deferred_cycles"] == 1
+    assert main.CYCLE_STATS["deferred_symbols"] == 2
+
+    priced.clear()
+    main.trade(deadline=clock[0] + 10)
+
+    assert priced == ["SOLUSDT", "ETHUSDT", "XRPUSDT", "BTCUSDT"]
+    assert main.DEFERRED_SYMBOLS == []
+    assert main.CYCLE_STATS["cycles"] == 2
+    assert "trade_bot_deferred_symbols_total 2" in main.METRICS.render()
+
+
+def test_exits_are_never_deferred(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["BTCUSDT"]')
+    for sym in ("ETHUSDT", "SOLUSDT"):
+        main.db.upsert_position(sym, 1.0, 100.0, 90.0, 130.0, None, 100.0, 10.0)
+    priced = []
+    monkeypatch.setattr(main, "get_price", lambda symbol: priced.append(symbol) or 100.0)
+
+    main.trade(deadline=main.time.monotonic() - 1)
+
+    assert sorted(priced) == ["ETHUSDT", "SOLUSDT"]
+    assert main.DEFERRED_SYMBOLS == ["BTCUSDT"]
+
+
+def test_candidate_deadline_ends_when_the_cycle_raises(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path, '["BTCUSDT"]')
+    seen = []
+    orders = []
+    cycle_order = main._cycle_order
+
+    def keep_order(*args):
+        # a live reference stops refcounting from closing the generator
+        orders.append(cycle_order(*args))
+        return orders[-1]
+
+    def get_price(symbol):
+        seen.append(getattr(main._CALL_DEADLINE, "at", None))
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(main, "_cycle_order", keep_order)
+    monkeypatch.setattr(main, "get_price", get_price)
+
+    with pytest.raises(RuntimeError):
+        main.trade(deadline=main.time.monotonic() + 60)
+
+    assert seen[0] is not None
+    assert getattr(main._CALL_DEADLINE, "at", None) is None
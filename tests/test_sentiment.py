@@ -0,0 +1,71 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from strategies.ma import MovingAverageCrossStrategy
+from strategies.sentiment import SentimentScorer
+
+
+class CountingAnalyzer:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return -0.5 if "bad" in text else 0.5
+
+
+def test_scores_are_cached_by_headline():
+    analyzer = CountingAnalyzer()
+    scorer = SentimentScorer(analyzer=analyzer)
+
+    assert scorer.score_batch(["good news", "bad news", "good news"]) == [0.5, -0.5, 0.5]
+    assert scorer.score_batch(["bad news"]) == [-0.5]
+    assert analyzer.calls == ["good news", "bad news"]
+
+
+def test_lru_eviction_rescores_oldest():
+    analyzer = CountingAnalyzer()
+    scorer = SentimentScorer(analyzer=analyzer, cache_size=2)
+
+    scorer.score_batch(["a", "b"])
+    scorer.score_batch(["a"])  # refresh "a" so "b" is evicted next
+    scorer.score_batch(["c"])
+    scorer.score_batch(["a", "b"])
+
+    assert analyzer.calls == ["a", "b", "c", "b"]
+
+
+def test_large_batches_use_worker_pool():
+    analyzer = CountingAnalyzer()
+    scorer = SentimentScorer(analyzer=analyzer, batch_size=3, max_workers=2)
+    headlines = [f"headline {i}" for i in range(10)]
+
+    try:
+        assert scorer.score_batch(headlines) == [0.5] * 10
+    finally:
+        scorer.close()
+    assert sorted(analyzer.calls) == sorted(headlines)
+
+
+def test_update_records_asset_sentiment():
+    scorer = SentimentScorer(analyzer=CountingAnalyzer())
+
+    assert scorer.update("BTCUSDT", ["good", "bad", "bad"]) == pytest.approx(-1 / 6)
+    assert scorer.get("BTCUSDT") == pytest.approx(-1 / 6)
+    assert scorer.get("ETHUSDT") is None
+
+
+def test_strategy_blocks_buy_on_negative_sentiment():
+    scorer = SentimentScorer(analyzer=CountingAnalyzer())
+    strat = MovingAverageCrossStrategy(
+        short_window=1, long_window=2, sentiment=scorer, min_sentiment=0.0
+    )
+    strat.seed_history("BTCUSDT", [1.0])
+
+    assert strat.should_buy("BTCUSDT", 2.0, ["bad outlook"]) is False
+    assert strat.should_buy("BTCUSDT", 3.0, ["good outlook"]) is True
@@ -0,0 +1,191 @@
+import gzip
+import importlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+
+class DummyClient:
+    def __init__(self, *args, **kwargs):
+        self.kline_calls = []
+
+    def get_klines(self, **kwargs):
+        self.kline_calls.append(kwargs)
+        if kwargs.get("interval") == "1h":
+            return [[0, "0", "11", "9", "10"]] * (kwargs["limit"])
+        start = kwargs.get("startTime", 0)
+        return [
+            [start + i * 60_000, "0", "0", "0", str(200.0 + i)] for i in range(kwargs["limit"])
+        ]
+
+
+def _setup_main(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("TRADING_PAIRS", '["BTCUSDT", "ETHUSDT"]')
+    monkeypatch.setenv("TRADE_DB_FILE", str(tmp_path / "trading.db"))
+    monkeypatch.setenv("SNAPSHOT_FILE", str(tmp_path / "snap.json.gz"))
+    for mod in ["db", "main"]:
+        sys.modules.pop(mod, None)
+
+    import binance.client as bc
+
+    monkeypatch.setattr(bc, "Client", DummyClient)
+    main = importlib.import_module("main")
+    monkeypatch.setattr(main, "send", lambda msg: None)
+    return main
+
+
+def _rewrite(path, **changes):
+    with gzip.open(path, "rb") as f:
+        data = json.loads(f.read())
+    data.update(changes)
+    with gzip.open(path, "wb") as f:
+        f.write(json.dumps(data).encode())
+
+
+def test_snapshot_round_trip(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    long_window = main.strategy.warmup_period()
+    main.strategy.history["BTCUSDT"] = [float(i) for i in range(long_window * 20)]
+    main.strategy.history["ETHUSDT"] = [1.0, 2.0]
+    main.PRICE_BASELINE["BTCUSDT"] = 123.0
+    assert main.get_atr("BTCUSDT", 14) == 2.0
+
+    assert main.save_snapshot()
+
+    main.strategy.history.clear()
+    main.ATR_CACHE.clear()
+    main.PRICE_BASELINE.clear()
+    restored = main.restore_snapshot(["BTCUSDT", "ETHUSDT", "XRPUSDT"])
+
+    assert restored == {"BTCUSDT"}
+    history = main.strategy.history["BTCUSDT"]
+    assert len(history) == main._history_cap()
+    assert history[-1] == float(long_window * 20 - 1)
+    assert main.PRICE_BASELINE == {"BTCUSDT": 123.0}
+    calls = len(main.client.kline_calls)
+    assert main.get_atr("BTCUSDT", 14) == 2.0
+    assert len(main.client.kline_calls) == calls
+
+
+def test_restore_tops_up_missed_cycles(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    needed = main.strategy.warmup_period()
+    main.strategy.history["BTCUSDT"] = [100.0] * needed
+    main.save_snapshot()
+    saved_at = time.time() - 3 * 60 - 5
+    _rewrite(main.SNAPSHOT_FILE, saved_at=saved_at)
+    main.strategy.history.clear()
+
+    restored = main.restore_snapshot(["BTCUSDT"])
+
+    assert restored == {"BTCUSDT"}
+    assert main.strategy.history["BTCUSDT"][-4:] == [100.0, 200.0, 201.0, 202.0]
+    call = main.client.kline_calls[-1]
+    # same 1m candles as preload_history and the kline store
+    assert call["limit"] == 3 and call["interval"] == "1m"
+    assert call["startTime"] == int(saved_at * 1000) + 1
+    # only the fetched candles are persisted, like a preload
+    assert main.load_prices("BTCUSDT", needed + 3) == [200.0, 201.0, 202.0]
+
+
+def _price_rows(tmp_path):
+    conn = sqlite3.connect(tmp_path / "prices.db")
+    try:
+        return conn.execute("SELECT COUNT(*) FROM prices").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_restarts_do_not_duplicate_stored_prices(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    needed = main.strategy.warmup_period()
+    main.strategy.history["BTCUSDT"] = [100.0] * needed
+
+    for gap_minutes, expected_rows in ((3, 3), (2, 5)):
+        main.save_snapshot()
+        _rewrite(main.SNAPSHOT_FILE, saved_at=time.time() - gap_minutes * 60 - 5)
+        main.strategy.history.clear()
+
+        assert main.restore_snapshot(["BTCUSDT"]) == {"BTCUSDT"}
+        assert _price_rows(tmp_path) == expected_rows
+
+
+def test_restored_history_survives_the_first_cycle(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    needed = main.strategy.warmup_period()
+    restored_history = [float(i) for i in range(1, needed + 2)]
+    main.strategy.history["BTCUSDT"] = list(restored_history)
+    main.save_snapshot()
+    main.strategy.history.clear()
+
+    assert main.restore_snapshot(["BTCUSDT"]) == {"BTCUSDT"}
+
+    monkeypatch.setattr(main, "get_usdt_balance", lambda: 1000.0)
+    monkeypatch.setattr(main, "load_json", lambda path, default: {"usdt": 1000.0, "total": 1000.0})
+    monkeypatch.setattr(main, "update_balance", lambda balance, positions, price_cache: 1000.0)
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: None)
+    monkeypatch.setattr(main, "get_price", lambda symbol: 100.0)
+    monkeypatch.setattr(main.strategy, "should_buy", lambda *a: False)
+    monkeypatch.setattr(main, "WATCHLIST", ["BTCUSDT"])
+    calls = len(main.client.kline_calls)
+
+    main.trade()
+
+    assert main.strategy.history["BTCUSDT"] == restored_history
+    assert len(main.client.kline_calls) == calls
+
+
+def test_long_gap_or_stale_snapshot_falls_back_to_preload(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    needed = main.strategy.warmup_period()
+    main.strategy.history["BTCUSDT"] = [100.0] * needed
+    main.save_snapshot()
+
+    _rewrite(main.SNAPSHOT_FILE, saved_at=time.time() - needed * main.CYCLE_SECONDS - 5)
+    assert main.restore_snapshot(["BTCUSDT"]) == set()
+
+    _rewrite(main.SNAPSHOT_FILE, saved_at=time.time() - main.SNAPSHOT_MAX_AGE_SECONDS - 5)
+    assert main.load_snapshot() is None
+
+    (tmp_path / "snap.json.gz").write_bytes(b"not gzip")
+    assert main.restore_snapshot(["BTCUSDT"]) == set()
+
+
+def test_maybe_save_snapshot_respects_interval(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+
+    assert main.maybe_save_snapshot() is True
+    assert main.maybe_save_snapshot() is False
+    assert (tmp_path / "snap.json.gz").exists()
+    assert not (tmp_path / "snap.json.gz.tmp").exists()
+
+
+def test_top_ups_are_fetched_concurrently(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    needed = main.strategy.warmup_period()
+    for sym in ("BTCUSDT", "ETHUSDT"):
+        main.strategy.history[sym] = [100.0] * needed
+    main.save_snapshot()
+    _rewrite(main.SNAPSHOT_FILE, saved_at=time.time() - 2 * 60 - 5)
+    main.strategy.history.clear()
+    monkeypatch.setattr(main, "PRELOAD_WORKERS", 4)
+
+    # each fetch waits for the other: a serial top-up would break the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def fetch(symbol, start_ms, limit):
+        barrier.wait()
+        return [(start_ms + i * 60_000, 300.0 + i) for i in range(limit)]
+
+    monkeypatch.setattr(main, "fetch_recent_closes", fetch)
+
+    assert main.restore_snapshot(["BTCUSDT", "ETHUSDT"]) == {"BTCUSDT", "ETHUSDT"}
+    for sym in ("BTCUSDT", "ETHUSDT"):
+        assert main.strategy.history[sym][-2:] == [300.0, 301.0]
@@ -0,0 +1,89 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from strategies import registry
+from strategies.ensemble import EnsembleStrategy
+from strategies.ma import MovingAverageCrossStrategy
+
+
+class AlwaysBuy:
+    def __init__(self, **kwargs):
+        self.history = {}
+
+    def buy_signal(self, prices):
+        return True
+
+    def sell_signal(self, prices, position, price):
+        return False
+
+
+class NeverBuy(AlwaysBuy):
+    def buy_signal(self, prices):
+        return False
+
+
+def test_builtin_strategies_load_by_name():
+    strat = registry.create("MA", bad_words=["hack"], fee_rate=0.001)
+
+    assert isinstance(strat, MovingAverageCrossStrategy)
+    assert strat.bad_words == ["hack"]
+    assert {"ma", "rsi"} <= set(registry.available())
+
+
+def test_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        registry.load("does-not-exist")
+
+
+def test_register_lazy_target(monkeypatch):
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+    monkeypatch.setattr(registry, "_loaded", {})
+    registry.register("always", f"{__name__}:AlwaysBuy")
+
+    assert isinstance(registry.create("always"), AlwaysBuy)
+
+
+def test_ensemble_members_share_history():
+    ens = registry.create_ensemble(["ma", "rsi"], bad_words=["hack"])
+
+    assert all(m.history is ens.history for m in ens.members)
+    ens.should_buy("BTCUSDT", 1.0, [])
+    ens.should_buy("BTCUSDT", 2.0, [])
+    assert ens.history["BTCUSDT"] == [1.0, 2.0]
+    assert ens.should_buy("BTCUSDT", 3.0, ["Exchange hack"]) is False
+    assert ens.history["BTCUSDT"] == [1.0, 2.0, 3.0]
+
+
+def test_ensemble_vote_and_weight_modes():
+    members = [AlwaysBuy(), NeverBuy()]
+
+    assert EnsembleStrategy(members, mode="vote").should_buy("X", 1.0, []) is False
+    assert (
+        EnsembleStrategy([AlwaysBuy(), AlwaysBuy(), NeverBuy()], mode="vote")
+        .should_buy("X", 1.0, [])
+        is True
+    )
+
+    weighted = EnsembleStrategy(
+        [AlwaysBuy(), NeverBuy()], weights=[3.0, 1.0], mode="weight", threshold=0.7
+    )
+    assert weighted.should_buy("X", 1.0, []) is True
+    weighted.threshold = 0.8
+    assert weighted.should_buy("X", 1.0, []) is False
+
+    blocked = EnsembleStrategy([AlwaysBuy()], bad_words=["hack"])
+    assert blocked.should_buy("X", 1.0, ["hack"]) is False
+
+
+def test_ensemble_warmup_covers_longest_member():
+    ens = registry.create_ensemble(["ma", "rsi"])
+
+    assert ens.members[0].warmup_period() == 5
+    assert ens.members[1].warmup_period() == 15
+    assert ens.warmup_period() == 15
+    assert EnsembleStrategy([AlwaysBuy(), NeverBuy()]).warmup_period() == 0
@@ -0,0 +1,118 @@
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import backtest
+import sweep
+from strategies.ma import MovingAverageCrossStrategy
+
+
+def _bars(n=300):
+    t = np.arange(n, dtype=float)
+    closes = 100 + 8 * np.sin(t / 12.0) + t * 0.01
+    return {"timestamps": t, "highs": closes + 0.5, "lows": closes - 0.5, "closes": closes}
+
+
+def test_parse_param_lists_and_ranges():
+    assert sweep.parse_param("short_window=3,5") == ("short_window", [3, 5])
+    assert sweep.parse_param("long_window=20:40:10") == ("long_window", [20, 30, 40])
+    assert sweep.parse_param("STOP_ATR_MULT=1.5:2.5:0.5") == ("stop_atr_mult", [1.5, 2.0, 2.5])
+    with pytest.raises(ValueError):
+        sweep.parse_param("short_window")
+
+
+def test_expand_grid_drops_invalid_combinations():
+    combos = sweep.expand_grid({"short_window": [3, 10], "long_window": [5, 20]})
+
+    assert combos == [
+        {"short_window": 3, "long_window": 5},
+        {"short_window": 3, "long_window": 20},
+        {"short_window": 10, "long_window": 20},
+    ]
+    assert sweep.split_params({"short_window": 3, "risk_reward": 2.0}) == (
+        {"short_window": 3},
+        {"risk_reward": 2.0},
+    )
+
+
+def test_pool_results_match_in_process_run():
+    bars = _bars()
+    grid = {"short_window": [3, 5], "long_window": [10, 20], "stop_atr_mult": [1.5, 3.0]}
+
+    pooled = sweep.run_sweep(bars, grid, workers=2)
+    local = sweep.run_sweep(bars, grid, workers=0)
+
+    assert len(pooled) == len(local) == 8
+    key = lambda r: sorted(r["params"].items())
+    assert sorted((key(r), r["stats"]["end_balance"]) for r in pooled) == sorted(
+        (key(r), r["stats"]["end_balance"]) for r in local
+    )
+    returns = [r["stats"]["total_return_pct"] for r in pooled]
+    assert returns == sorted(returns, reverse=True)
+    assert [r["rank"] for r in pooled] == list(range(1, 9))
+
+    direct = backtest.run_backtest(
+        MovingAverageCrossStrategy(3, 10, fee_rate=0.001, min_pnl_pct=1.0),
+        bars["closes"],
+        bars["highs"],
+        bars["lows"],
+        bars["timestamps"],
+        config=backtest.BacktestConfig(stop_atr_mult=1.5),
+    )
+    match = next(
+        r for r in local
+        if r["params"] == {"short_window": 3, "long_window": 10, "stop_atr_mult": 1.5}
+    )
+    assert match["stats"]["end_balance"] == direct.stats["end_balance"]
+
+
+def test_results_saved_ranked(tmp_path):
+    results = sweep.run_sweep(
+        _bars(), {"risk_reward": [1.5, 2.0, 3.0]}, workers=0, sort_by="max_drawdown_pct"
+    )
+    db_path = tmp_path / "sweep.db"
+
+    run_id = sweep.save_results(results, "ma", "BTCUSDT", str(db_path))
+
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute(
+            "SELECT rank, max_drawdown_pct FROM sweep_results WHERE run_id = ? ORDER BY rank",
+            (run_id,),
+        ).fetchall()
+    assert [r[0] for r in rows] == [1, 2, 3]
+    assert [r[1] for r in rows] == sorted(r[1] for r in rows)
+    assert "return%" in sweep.format_table(results)
+
+
+def test_workers_release_the_shared_bars():
+    script = (
+        "import numpy as np, sweep\n"
+        "t = np.arange(200, dtype=float)\n"
+        "c = 100 + np.sin(t / 9.0)\n"
+        "bars = {'timestamps': t, 'highs': c + 0.5, 'lows': c - 0.5, 'closes': c}\n"
+        "sweep.run_sweep(bars, {'short_window': [3, 5]}, workers=2)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, timeout=120
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stderr == ""
+
+    # in-process: the view is dropped before the mapping is closed
+    data = np.zeros((4, 3))
+    shm = sweep.shared_memory.SharedMemory(create=True, size=data.nbytes)
+    try:
+        sweep._init_worker(shm.name, data.shape, {"strategy": "ma"})
+        assert sweep._bars is not None
+        sweep._close_worker()
+        assert sweep._shm is None and sweep._bars is None
+    finally:
+        shm.close()
+        shm.unlink()
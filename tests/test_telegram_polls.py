@@ -34,9 +34,12 @@ import main
 
 
 def test_send_poll(monkeypatch):
-    # Prepare a mock for requests.post
+    # Prepare a mock for the Telegram session's post
     post_mock = MagicMock()
-    monkeypatch.setattr(main.requests, 'post', post_mock)
+    upstreams = []
+    monkeypatch.setattr(
+        main, 'http_session', lambda upstream: upstreams.append(upstream) or types.SimpleNamespace(post=post_mock)
+    )
 
     response = MagicMock()
     response.json.return_value = {"result": {"poll": {"id": "123"}}}
@@ -54,6 +57,7 @@ def test_send_poll(monkeypatch):
     assert data['options'] == json.dumps(['Yes', 'No'])
     assert data['is_anonymous'] is False
     assert poll_id == "123"
+    assert upstreams == ["telegram"]
     response.raise_for_status.assert_called_once()
 
 
@@ -99,22 +103,23 @@ def test_send_balance_breakdown_uses_wallet_summary(monkeypatch):
 
 def test_trade_prompt_mentions_balance(monkeypatch):
     main.PENDING_DECISIONS.clear()
-    main.PENDING_POLLS.clear()
+    main.DECISION_IDS.clear()
 
     decision = {"symbol": "BTCUSDT", "action": "buy", "price": 101.23}
 
-    monkeypatch.setattr(main, "send_poll", lambda *a, **k: None)
-
-    messages = []
-
-    def fake_send(msg):
-        messages.append(msg)
-
-    monkeypatch.setattr(main, "send", fake_send)
+    prompts = []
+    monkeypatch.setattr(
+        main, "send_confirmation", lambda text, decision_id: prompts.append(text) or 9
+    )
 
     main._store_pending_decision(decision, "Proceed?")
 
-    assert any("BALANCE" in msg for msg in messages)
+    assert len(prompts) == 1
+    assert "Proceed?" in prompts[0] and "BALANCE" in prompts[0]
+    assert main.DECISION_IDS[decision["id"]] == "BTCUSDT"
+    assert decision["message_id"] == 9
+    main.PENDING_DECISIONS.clear()
+    main.DECISION_IDS.clear()
 
 
 def test_normalize_command_token_handles_bot_commands():
@@ -131,3 +136,16 @@ def test_normalize_command_token_handles_bot_commands():
     assert normalize("/") == ""
     assert normalize("") == ""
     assert normalize(None) == ""
+
+
+def test_send_monte_carlo_report(monkeypatch):
+    monkeypatch.setattr(main.db, "get_closed_trade_profits", lambda: [1.0, -0.5, 2.0])
+    monkeypatch.setattr(main, "load_json", lambda path, default: {"usdt": 50.0, "total": 80.0})
+    sent = []
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: sent.append(msg))
+
+    result = main.send_monte_carlo_report(200)
+
+    assert result["simulations"] == 200
+    assert result["start_balance"] == 80.0
+    assert sent and "Monte Carlo" in sent[0]
@@ -1,4 +1,5 @@
 import importlib
+import json
 import sys
 from pathlib import Path
 from unittest.mock import MagicMock
@@ -53,14 +54,15 @@ def _setup_main(monkeypatch, tmp_path, trading_pairs='["BTCUSDT"]'):
     monkeypatch.setattr(main, "load_json", lambda path, default: {"usdt": 1000.0, "total": 1000.0})
     monkeypatch.setattr(main, "update_balance", lambda balance, positions, price_cache: balance["usdt"])
     monkeypatch.setattr(main, "get_news_headlines", lambda symbol: [])
-    monkeypatch.setattr(main, "send", lambda msg: None)
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: None)
     monkeypatch.setattr(main, "save_json", lambda path, data: None)
+    monkeypatch.setattr(main, "_telegram_call", MagicMock(return_value=None))
     main.PENDING_DECISIONS.clear()
-    main.PENDING_POLLS.clear()
+    main.DECISION_IDS.clear()
     return main
 
 
-def test_strategy_buy_executes_without_poll(monkeypatch, tmp_path):
+def test_strategy_buy_executes_without_confirmation(monkeypatch, tmp_path):
     main = _setup_main(monkeypatch, tmp_path)
 
     positions = {}
@@ -86,19 +88,19 @@ def test_strategy_buy_executes_without_poll(monkeypatch, tmp_path):
     monkeypatch.setattr(main, "calculate_position_size", lambda *args, **kwargs: (1.0, 98.0, ""))
     monkeypatch.setattr(main, "get_price", lambda symbol: 100.0)
 
-    send_poll_mock = MagicMock()
-    monkeypatch.setattr(main, "send_poll", send_poll_mock)
+    prompt_mock = MagicMock()
+    monkeypatch.setattr(main, "send_confirmation", prompt_mock)
     place_order_mock = MagicMock(return_value={})
     monkeypatch.setattr(main, "place_order", place_order_mock)
 
     main.trade()
 
-    send_poll_mock.assert_not_called()
+    prompt_mock.assert_not_called()
     place_order_mock.assert_called_once_with("BTCUSDT", "buy", 1.0)
     assert "BTCUSDT" in positions
 
 
-def test_strategy_sell_loss_enqueues_poll(monkeypatch, tmp_path):
+def test_strategy_sell_loss_asks_for_confirmation(monkeypatch, tmp_path):
     main = _setup_main(monkeypatch, tmp_path)
 
     position = {
@@ -121,8 +123,8 @@ def test_strategy_sell_loss_enqueues_poll(monkeypatch, tmp_path):
     monkeypatch.setattr(main, "get_price", lambda symbol: 94.0)
     monkeypatch.setattr(main, "get_stop_distance", lambda s, p: 5.0)
     
-    send_poll_mock = MagicMock(return_value="poll3")
-    monkeypatch.setattr(main, "send_poll", send_poll_mock)
+    prompt_mock = MagicMock(return_value=301)
+    monkeypatch.setattr(main, "send_confirmation", prompt_mock)
     place_order_mock = MagicMock()
     monkeypatch.setattr(main, "place_order", place_order_mock)
     
@@ -132,7 +134,7 @@ def test_strategy_sell_loss_enqueues_poll(monkeypatch, tmp_path):
     assert "BTCUSDT" in main.PENDING_DECISIONS
     decision = main.PENDING_DECISIONS["BTCUSDT"]
     assert decision["reason"] == "stop_loss"
-    send_poll_mock.assert_called_once()
+    prompt_mock.assert_called_once()
 
     main.finalize_pending_decision("BTCUSDT", True)
 
@@ -179,29 +181,24 @@ def test_pending_decisions_support_multiple_symbols(monkeypatch, tmp_path):
     monkeypatch.setattr(main, "get_price", _price)
     monkeypatch.setattr(main, "get_stop_distance", lambda s, p: 5.0)
 
-    poll_id = "poll-eth"
-    send_poll_mock = MagicMock(return_value=poll_id)
-    monkeypatch.setattr(main, "send_poll", send_poll_mock)
+    prompt_mock = MagicMock(return_value=302)
+    monkeypatch.setattr(main, "send_confirmation", prompt_mock)
     place_order_mock = MagicMock()
     monkeypatch.setattr(main, "place_order", place_order_mock)
 
-    main.PENDING_DECISIONS.clear()
-    main.PENDING_POLLS.clear()
-
     main.trade()
 
     place_order_mock.assert_not_called()
     assert "ETHUSDT" in main.PENDING_DECISIONS
     assert "BTCUSDT" not in main.PENDING_DECISIONS
-    assert main.PENDING_POLLS[poll_id] == "ETHUSDT"
-
     decision = main.PENDING_DECISIONS["ETHUSDT"]
-    decision["poll_id"] = poll_id
+    assert main.DECISION_IDS == {decision["id"]: "ETHUSDT"}
+    assert decision["message_id"] == 302
 
     main.finalize_pending_decision("ETHUSDT", True)
 
     place_order_mock.assert_called_once_with("ETHUSDT", "sell", 2.0)
-    assert poll_id not in main.PENDING_POLLS
+    assert main.DECISION_IDS == {}
     assert "ETHUSDT" not in main.PENDING_DECISIONS
 
 def test_strategy_sell_profit_executes_immediately(monkeypatch, tmp_path):
@@ -226,8 +223,8 @@ def test_strategy_sell_profit_executes_immediately(monkeypatch, tmp_path):
     monkeypatch.setattr(main, "get_price", lambda symbol: 110.0)
     monkeypatch.setattr(main, "get_stop_distance", lambda s, p: 10.0)
 
-    send_poll_mock = MagicMock()
-    monkeypatch.setattr(main, "send_poll", send_poll_mock)
+    prompt_mock = MagicMock()
+    monkeypatch.setattr(main, "send_confirmation", prompt_mock)
     place_order_mock = MagicMock(return_value={})
     monkeypatch.setattr(main, "place_order", place_order_mock)
 
@@ -235,12 +232,10 @@ def test_strategy_sell_profit_executes_immediately(monkeypatch, tmp_path):
     main.trade()
 
     place_order_mock.assert_called_once_with("BTCUSDT", "sell", 1.5)
-    send_poll_mock.assert_not_called()
+    prompt_mock.assert_not_called()
 
     assert "BTCUSDT" not in main.PENDING_DECISIONS
-def test_poll_answer_executes_pending_sell(monkeypatch, tmp_path):
-    main = _setup_main(monkeypatch, tmp_path)
-
+def _loss_position(main, monkeypatch):
     position = {
         "qty": 1.0,
         "entry": 105.0,
@@ -260,21 +255,84 @@ def test_poll_answer_executes_pending_sell(monkeypatch, tmp_path):
     monkeypatch.setattr(main, "get_price", lambda symbol: 99.0)
     monkeypatch.setattr(main, "get_stop_distance", lambda s, p: 5.0)
 
-    poll_id = "poll-stop"
-    send_poll_mock = MagicMock(return_value=poll_id)
-    monkeypatch.setattr(main, "send_poll", send_poll_mock)
+
+def test_confirm_button_executes_pending_sell_and_edits_prompt(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    _loss_position(main, monkeypatch)
+
+    calls = []
+
+    def telegram_call(method, data, limited=True):
+        calls.append((method, data))
+        if method == "sendMessage":
+            return {"ok": True, "result": {"message_id": 55}}
+        return {"ok": True, "result": True}
+
+    monkeypatch.setattr(main, "_telegram_call", telegram_call)
     place_order_mock = MagicMock(return_value={})
     monkeypatch.setattr(main, "place_order", place_order_mock)
 
     main.trade()
 
-    assert main.PENDING_POLLS[poll_id] == "BTCUSDT"
-    decision = main.PENDING_DECISIONS["BTCUSDT"]
-    decision["poll_id"] = poll_id
-
-    poll_answer = {"poll_id": poll_id, "option_ids": [0]}
-    main._handle_poll_answer(poll_answer)
+    # one message per decision, carrying both buttons
+    assert [method for method, _ in calls] == ["sendMessage"]
+    keyboard = json.loads(calls[0][1]["reply_markup"])["inline_keyboard"][0]
+    decision_id = main.PENDING_DECISIONS["BTCUSDT"]["id"]
+    assert [b["callback_data"] for b in keyboard] == [
+        f"confirm:{decision_id}",
+        f"decline:{decision_id}",
+    ]
+    assert all(len(b["callback_data"].encode()) <= 64 for b in keyboard)
+    calls.clear()
+
+    main._handle_callback_query(
+        {"id": "cb1", "data": f"confirm:{decision_id}", "message": {"chat": {"id": "chat"}}}
+    )
 
     place_order_mock.assert_called_once_with("BTCUSDT", "sell", 1.0)
-    assert poll_id not in main.PENDING_POLLS
     assert "BTCUSDT" not in main.PENDING_DECISIONS
+    assert main.DECISION_IDS == {}
+    assert calls[0] == ("answerCallbackQuery", {"callback_query_id": "cb1", "text": "✅ Confirmed"})
+    assert calls[1][0] == "editMessageText"
+    assert calls[1][1]["message_id"] == 55
+    assert calls[1][1]["text"].startswith("✅ Confirmed SELL BTCUSDT")
+
+    # a second press on the same (now resolved) button does nothing
+    calls.clear()
+    main._handle_callback_query(
+        {"id": "cb2", "data": f"confirm:{decision_id}", "message": {"chat": {"id": "chat"}}}
+    )
+    place_order_mock.assert_called_once()
+    assert [method for method, _ in calls] == ["answerCallbackQuery"]
+
+
+def test_decline_button_edits_prompt_instead_of_sending(monkeypatch, tmp_path):
+    main = _setup_main(monkeypatch, tmp_path)
+    _loss_position(main, monkeypatch)
+    monkeypatch.setattr(main, "send_confirmation", lambda text, decision_id: 56)
+    edits = []
+    monkeypatch.setattr(
+        main, "edit_confirmation", lambda decision, text: edits.append(text) or True
+    )
+    sent = []
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: sent.append(msg))
+    place_order_mock = MagicMock()
+    monkeypatch.setattr(main, "place_order", place_order_mock)
+
+    main.trade()
+    decision_id = main.PENDING_DECISIONS["BTCUSDT"]["id"]
+
+    # buttons pressed in another chat are ignored
+    main._handle_callback_query(
+        {"id": "cb0", "data": f"decline:{decision_id}", "message": {"chat": {"id": "other"}}}
+    )
+    assert "BTCUSDT" in main.PENDING_DECISIONS
+
+    main._handle_callback_query(
+        {"id": "cb1", "data": f"decline:{decision_id}", "message": {"chat": {"id": "chat"}}}
+    )
+
+    place_order_mock.assert_not_called()
+    assert "BTCUSDT" not in main.PENDING_DECISIONS
+    assert edits == ["🚫 Declined SELL BTCUSDT at $99.00"]
+    assert not any("Declined" in msg for msg in sent)
@@ -70,7 +70,7 @@ def _bootstrap_main(monkeypatch, tmp_path, initial_prices, trading_pairs=None):
     monkeypatch.setattr(
         main, "update_balance", lambda balance, positions, price_cache: balance["usdt"]
     )
-    monkeypatch.setattr(main, "send", lambda msg: None)
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: None)
     monkeypatch.setattr(main.strategy, "should_sell", lambda s, p, price, h: False)
     monkeypatch.setattr(main.strategy, "should_buy", lambda s, price, h: False)
 
@@ -143,18 +143,18 @@ def test_stop_skip_when_loss(monkeypatch, tmp_path):
     db.upsert_position("BTCUSDT", 1.0, 100.0, 99.0, 150.0, trade_id, 100.0, 1.0)
 
     notifications = []
-    monkeypatch.setattr(main, "send", lambda msg: notifications.append(msg))
-    polls = []
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: notifications.append(msg))
+    prompts = []
     monkeypatch.setattr(
         main,
-        "send_poll",
-        lambda question, options, **kwargs: polls.append((question, options)) or "poll-id",
+        "send_confirmation",
+        lambda text, decision_id: prompts.append(text) or 1,
     )
 
     main.trade()
 
     positions = db.get_open_positions()
     assert "BTCUSDT" in positions
-    assert polls, "expected a Telegram poll to be sent for loss-making stop"
-    assert any("confirm" in msg.lower() for msg in notifications)
+    assert len(prompts) == 1, "expected one confirmation prompt for loss-making stop"
+    assert "confirm" in prompts[0].lower()
     assert "BTCUSDT" in main.PENDING_DECISIONS
@@ -0,0 +1,161 @@
+import importlib
+import json
+import sys
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import webhook
+
+
+def post(server, payload, secret="s3cret"):
+    host, port = server.address
+    body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+    req = urllib.request.Request(
+        f"http://{host}:{port}/telegram",
+        data=body,
+        headers={"Content-Type": "application/json", webhook.SECRET_HEADER: secret},
+    )
+    with urllib.request.urlopen(req, timeout=5) as resp:
+        return resp.status
+
+
+@pytest.fixture
+def receiver():
+    handled = []
+    server = webhook.WebhookServer(handled.append, secret="s3cret", port=0).start()
+    server.handled = handled
+    yield server
+    server.stop()
+
+
+def test_updates_are_handled_in_order_once(receiver):
+    for update_id in (1, 2, 2, 3):
+        assert post(receiver, {"update_id": update_id}) == 200
+
+    assert receiver.wait_idle(5)
+    assert [u["update_id"] for u in receiver.handled] == [1, 2, 3]
+    assert receiver.stats["duplicates"] == 1
+
+
+def test_bad_secret_and_bodies_are_rejected(receiver):
+    with pytest.raises(urllib.error.HTTPError) as err:
+        post(receiver, {"update_id": 1}, secret="wrong")
+    assert err.value.code == 403
+    with pytest.raises(urllib.error.HTTPError) as err:
+        post(receiver, b"not json")
+    assert err.value.code == 400
+
+    assert receiver.wait_idle(5)
+    assert receiver.handled == []
+    assert receiver.stats["rejected"] == 2
+
+
+def test_slow_handler_does_not_hold_the_response():
+    release = threading.Event()
+    handled = []
+
+    def handle(update):
+        release.wait(5)
+        handled.append(update["update_id"])
+
+    server = webhook.WebhookServer(handle, port=0).start()
+    try:
+        assert post(server, {"update_id": 1}) == 200
+        assert post(server, {"update_id": 2}) == 200
+        assert handled == []
+        release.set()
+        assert server.wait_idle(5)
+        assert handled == [1, 2]
+    finally:
+        server.stop()
+
+
+def setup_main(monkeypatch, tmp_path, **env):
+    monkeypatch.chdir(tmp_path)
+    for var in [
+        "TELEGRAM_TOKEN",
+        "BINANCE_API_KEY",
+        "BINANCE_SECRET_KEY",
+        "NEWSAPI_KEY",
+    ]:
+        monkeypatch.setenv(var, "x")
+    monkeypatch.setenv("TELEGRAM_CHAT_ID", "42")
+    for var, value in env.items():
+        monkeypatch.setenv(var, value)
+    if "main" in sys.modules:
+        del sys.modules["main"]
+    main = importlib.import_module("main")
+    monkeypatch.setattr(main, "send", lambda msg, **kwargs: None)
+    return main
+
+
+def test_webhook_confirms_pending_decisions(monkeypatch, tmp_path):
+    main = setup_main(
+        monkeypatch,
+        tmp_path,
+        TELEGRAM_WEBHOOK_URL="https://bot.example.com/telegram",
+        TELEGRAM_WEBHOOK_PORT="0",
+        TELEGRAM_WEBHOOK_SECRET="s3cret",
+    )
+    calls = []
+
+    def telegram_call(method, data, limited=True):
+        calls.append((method, data))
+        return {"ok": True, "result": True}
+
+    monkeypatch.setattr(main, "_telegram_call", telegram_call)
+    executed = []
+    monkeypatch.setattr(main, "_execute_decision", executed.append)
+    for symbol, decision_id in (("BTCUSDT", "abc"), ("ETHUSDT", "def")):
+        main.PENDING_DECISIONS[symbol] = {
+            "symbol": symbol, "action": "sell", "price": 99.0, "id": decision_id,
+        }
+        main.DECISION_IDS[decision_id] = symbol
+
+    server = main.start_telegram_listener()
+    try:
+        assert isinstance(server, webhook.WebhookServer)
+        method, data = calls[0]
+        assert method == "setWebhook"
+        assert data["url"] == "https://bot.example.com/telegram"
+        assert data["secret_token"] == "s3cret"
+
+        post(server, {
+            "update_id": 10,
+            "callback_query": {"id": "cb", "data": "confirm:abc", "message": {"chat": {"id": 42}}},
+        })
+        post(server, {
+            "update_id": 11,
+            "message": {"chat": {"id": 42}, "text": "CONFIRM ETHUSDT"},
+        })
+        assert server.wait_idle(5)
+    finally:
+        server.stop()
+
+    assert [d["symbol"] for d in executed] == ["BTCUSDT", "ETHUSDT"]
+    assert main.PENDING_DECISIONS == {} and main.DECISION_IDS == {}
+    assert ("answerCallbackQuery", {"callback_query_id": "cb", "text": "✅ Confirmed"}) in calls
+
+
+def test_refused_webhook_falls_back_to_polling(monkeypatch, tmp_path):
+    main = setup_main(
+        monkeypatch,
+        tmp_path,
+        TELEGRAM_WEBHOOK_URL="http://not-https.example.com",
+        TELEGRAM_WEBHOOK_PORT="0",
+    )
+    monkeypatch.setattr(
+        main, "_telegram_call", lambda method, data, limited=True: {"ok": False}
+    )
+    polled = threading.Event()
+    monkeypatch.setattr(main, "poll_telegram_commands", polled.set)
+
+    assert main.start_telegram_listener() is None
+    assert polled.wait(5)
@@ -0,0 +1,168 @@
+"""Local receiver for Telegram webhook updates.
+
+Long-polling ``getUpdates`` delivers a CONFIRM/DECLINE press only after the
+poll returns and the loop comes round again.  In webhook mode Telegram posts
+each update to the bot as it happens.  :class:`WebhookServer` accepts those
+posts on a small built-in HTTP server, answers at once and hands the update to
+a single worker thread, so updates are handled one at a time and in order,
+as the poller does.
+
+Telegram sends the ``secret_token`` given to ``setWebhook`` in the
+``X-Telegram-Bot-Api-Secret-Token`` header; posts without it are rejected.
+Updates that Telegram delivers again after a slow answer are skipped by
+``update_id``.
+"""
+
+from __future__ import annotations
+
+import collections
+import json
+import logging
+import threading
+from typing import Callable, Deque, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PORT = 8443
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+# update_ids remembered to drop redeliveries
+SEEN_UPDATES = 1000
+# Telegram does not send bigger updates than this to bots
+MAX_BODY_BYTES = 1 << 20
+# how often the server checks for shutdown; bounds stop() latency
+SHUTDOWN_POLL_SECONDS = 0.1
+
+
+class WebhookServer:
+    """Receive updates over HTTP and pass them to ``handle`` in order."""
+
+    def __init__(
+        self,
+        handle: Callable[[dict], object],
+        secret: str = "",
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+    ) -> None:
+        self.handle = handle
+        self.secret = secret
+        self.host = host
+        self.port = port
+        self._server = None
+        self._worker: threading.Thread | None = None
+        self._queue: Deque[dict] = collections.deque()
+        self._cond = threading.Condition()
+        self._busy = False
+        self._stopping = False
+        self._seen: Deque[int] = collections.deque()
+        self._seen_ids: Set[int] = set()
+        self.stats = {"received": 0, "duplicates": 0, "rejected": 0, "failed": 0}
+
+    @property
+    def running(self) -> bool:
+        return self._server is not None
+
+    @property
+    def address(self) -> tuple:
+        """``(host, port)`` the server listens on (the real port if 0 was given)."""
+
+        return self._server.server_address[:2]
+
+    def start(self) -> "WebhookServer":
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        receiver = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                if receiver.secret and self.headers.get(SECRET_HEADER) != receiver.secret:
+                    receiver.stats["rejected"] += 1
+                    self.send_error(403)
+                    return
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    if length > MAX_BODY_BYTES:
+                        raise ValueError("body too large")
+                    update = json.loads(self.rfile.read(length) or b"null")
+                    if not isinstance(update, dict):
+                        raise ValueError("not an update")
+                except ValueError:
+                    receiver.stats["rejected"] += 1
+                    self.send_error(400)
+                    return
+                receiver.submit(update)
+                self.send_response(200)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        with self._cond:
+            self._stopping = False
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": SHUTDOWN_POLL_SECONDS},
+            name="webhook",
+            daemon=True,
+        ).start()
+        self._worker = threading.Thread(target=self._run, name="webhook-updates", daemon=True)
+        self._worker.start()
+        logger.info("📬 Telegram webhook receiver on http://%s:%d", *self.address)
+        return self
+
+    def submit(self, update: dict) -> bool:
+        """Queue ``update`` for the worker; return False for a redelivery."""
+
+        update_id = update.get("update_id")
+        with self._cond:
+            if update_id is not None:
+                if update_id in self._seen_ids:
+                    self.stats["duplicates"] += 1
+                    return False
+                self._seen.append(update_id)
+                self._seen_ids.add(update_id)
+                if len(self._seen) > SEEN_UPDATES:
+                    self._seen_ids.discard(self._seen.popleft())
+            self.stats["received"] += 1
+            self._queue.append(update)
+            self._cond.notify_all()
+        return True
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """Wait until every received update was handled."""
+
+        with self._cond:
+            return self._cond.wait_for(lambda: not (self._queue or self._busy), timeout)
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Stop accepting updates and let the worker finish the queued ones."""
+
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if self._worker is not None:
+            self._worker.join(timeout)
+            self._worker = None
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or self._stopping)
+                if not self._queue:
+                    return
+                update = self._queue.popleft()
+                self._busy = True
+            try:
+                self.handle(update)
+            except Exception as exc:
+                self.stats["failed"] += 1
+                logger.error("Telegram update failed: %s", exc)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()